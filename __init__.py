@@ -1,5 +1,8 @@
 from .src.main import Main
 from .src.core.enums import RuleTypes, Actions
+from .src.core.commands import Command
+from .src.runner import CallContext
+from .src.core.case_variants import CASE_VARIANTS
 
 
 cakeslicer = Main()
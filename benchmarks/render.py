@@ -0,0 +1,99 @@
+"""
+Measures how long a starter tree takes to be generated with each number of
+worker processes, to check the render pool pays off on this machine.
+
+Usage: python benchmarks/render.py [FILES] [FILE_KBYTES] [WORKERS] [ROUNDS]
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import importlib
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(REPO_DIR))
+
+package = os.path.basename(REPO_DIR)
+enums = importlib.import_module(f"{package}.src.core.enums")
+runner = importlib.import_module(f"{package}.src.runner")
+
+# Measures the pool itself, whatever the size of the starter.
+importlib.import_module(f"{package}.src.runner.runner").POOL_MIN_BYTES = 0
+
+Actions = enums.Actions
+
+TEMPLATE_LINES = [
+    "# cakeslicer_if use_cache\n",
+    "import cakeslicer_project_slug.cache\n",
+    "# cakeslicer_endif\n",
+    "name = 'cakeslicer_project_slug'\n",
+    "value = 'cakeslicer_project_slug__upper'\n",
+]
+
+
+def create_starter(root_dir: str, count: int, kbytes: int) -> None:
+    content = "".join(TEMPLATE_LINES)
+    content = content * max(1, kbytes * 1024 // len(content))
+
+    for index in range(count):
+        directory = os.path.join(root_dir, "starter", f"package_{index % 20}")
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, f"module_{index}.py"), "w") as file:
+            file.write(content)
+
+
+def create_properties() -> dict:
+    variables = {"project_slug": "my_project", "use_cache": True}
+
+    return {
+        "COMMENT_DELIMITERS": ["#"],
+        "TOOL_PREFIX": "cakeslicer",
+        "VARIABLES": variables,
+        "TOKENS": {
+            "project_slug": "my_project",
+            "project_slug__upper": "MY_PROJECT",
+            "use_cache": "True",
+        },
+        "ACTIONS": {Actions.include: ["./starter"], Actions.cmd: [], Actions.call: []},
+    }
+
+
+def measure(root_dir: str, workers: int, rounds: int) -> float:
+    timings = []
+    output_dir = os.path.join(root_dir, "output")
+
+    for _ in range(rounds):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        start = time.perf_counter()
+        runner.Runner(create_properties(), root_dir, output_dir, workers=workers).run()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(
+    count: int = 2000, kbytes: int = 16, workers: int = os.cpu_count(), rounds: int = 3
+) -> None:
+    with tempfile.TemporaryDirectory() as root_dir:
+        create_starter(root_dir, count, kbytes)
+
+        # Starts the pool before measuring, as it's shared by every run.
+        runner.create_render_pool(workers)
+
+        serial_time = measure(root_dir, 1, rounds)
+        print(f"{count} files of {kbytes} KiB, {os.cpu_count()} CPUs")
+        print(f"workers=1:  {serial_time * 1000:8.1f} ms")
+
+        for worker_count in sorted({2, workers} - {1}):
+            pool_time = measure(root_dir, worker_count, rounds)
+            print(
+                f"workers={worker_count}: {pool_time * 1000:8.1f} ms "
+                f"({serial_time / pool_time:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(argument) for argument in sys.argv[1:]])
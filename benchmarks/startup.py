@@ -0,0 +1,79 @@
+"""
+Measures how long a large rule set, like one generated from a service
+catalogue, takes to be compiled and answered before any file is generated.
+
+Usage: python benchmarks/startup.py [RULES] [OPTIONS_PER_CHOICE] [ROUNDS]
+"""
+
+import os
+import sys
+import time
+import importlib
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(REPO_DIR))
+
+package = os.path.basename(REPO_DIR)
+enums = importlib.import_module(f"{package}.src.core.enums")
+setup = importlib.import_module(f"{package}.src.main.setup")
+interaction = importlib.import_module(f"{package}.src.interaction")
+
+RuleTypes, Actions = enums.RuleTypes, enums.Actions
+
+
+def create_rules(count: int, options_count: int) -> dict:
+    rules = {}
+
+    for index in range(count):
+        if index % 2:
+            rules[f"service_{index}"] = {
+                "type": RuleTypes.choice,
+                "options": [f"Option {option}" for option in range(options_count)],
+                "actions": {
+                    option: (Actions.cmd, f"echo {option}") for option in range(5)
+                },
+            }
+        else:
+            rules[f"feature_{index}"] = {
+                "type": RuleTypes.bool,
+                "message": f"Use feature {index}?",
+                "actions": [(Actions.include, f"./feature_{index}")],
+            }
+
+    return rules
+
+
+def measure(function, rounds: int) -> float:
+    timings = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(count: int = 20000, options_count: int = 30, rounds: int = 5) -> None:
+    rules = create_rules(count, options_count)
+    answers = interaction.Answers(
+        {
+            name: "Option 3" if rule["type"] == RuleTypes.choice else "y"
+            for (name, rule) in rules.items()
+        }
+    )
+
+    compile_time = measure(lambda: setup.compile_rules(rules), rounds)
+    compiled_rules = setup.compile_rules(rules)
+    setup_time = measure(
+        lambda: setup.setup_properties({}, answers, rules=compiled_rules), rounds
+    )
+
+    print(f"{count} rules, {options_count} options per choice rule")
+    print(f"compile_rules:    {compile_time * 1000:8.1f} ms")
+    print(f"setup_properties: {setup_time * 1000:8.1f} ms (rules already compiled)")
+    print(f"startup:          {(compile_time + setup_time) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(*[int(argument) for argument in sys.argv[1:]])
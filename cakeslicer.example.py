@@ -40,4 +40,4 @@ RULES = {
 }
 
 
-cakeslicer.run(attributes=ATTRIBUTES, rules=RULES)
+cakeslicer.run_cli(attributes=ATTRIBUTES, rules=RULES)
@@ -1,4 +1,12 @@
+import os
+
 TOOL_PREFIX = "cakeslicer"
 
 ATTRIBUTES = {}
 COMMENT_DELIMITERS = ["//", "#"]
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", TOOL_PREFIX)
+OUTPUT_DIR = "./output"
+WORKERS = 1
+SHELL_SESSION = os.name == "posix"
+PREFETCH = False
+BUNDLE_FILE = "./cakeslicer.bundle"
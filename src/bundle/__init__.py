@@ -0,0 +1,7 @@
+from .bundle_compiler import (
+    BundleCompiler,
+    get_bundle_fingerprint,
+    load_bundle,
+    write_bundle,
+)
+from .bundle_index import BundleIndex
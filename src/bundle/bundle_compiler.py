@@ -0,0 +1,238 @@
+import os
+import sys
+import stat
+import marshal
+import hashlib
+from typing import Iterable, List
+from ..core.errors import (
+    BundleErrorMessages as messages,
+    RunnerErrorMessages,
+    FileReadingError,
+    TemplateError,
+    ValueError,
+)
+from ..core.interfaces import PathEntry
+from ..renderer import PathRenderer, TemplateCompiler
+from ..renderer.template_compiler import COMPILER_VERSION
+from ..runner.runner import BINARY_EXTENSIONS
+from ..runner.subtrees import plan_subtrees
+from ..runner.tree_index import TreeIndex
+
+
+BUNDLE_VERSION = "1"
+
+
+def get_bundle_fingerprint(
+    tool_prefix: str,
+    comment_delimiters: List[str],
+    token_names: Iterable[str],
+    include_paths: Iterable[str],
+) -> str:
+    return hashlib.sha256(
+        repr(
+            (
+                BUNDLE_VERSION,
+                COMPILER_VERSION,
+                sys.implementation.cache_tag,
+                tool_prefix,
+                list(comment_delimiters),
+                sorted(set(token_names)),
+                sorted(set(include_paths)),
+            )
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class BundleCompiler:
+    """Snapshots the included subtrees, with their templates compiled, into one file."""
+
+    def __init__(
+        self,
+        tool_prefix: str,
+        comment_delimiters: List[str],
+        variable_names: Iterable[str],
+        token_names: Iterable[str],
+        cache_dir: str = None,
+        excluded_paths: Iterable[str] = (),
+    ):
+        self._tool_prefix = tool_prefix
+        self._excluded_paths = list(excluded_paths)
+        self._comment_delimiters = comment_delimiters
+        self._variable_names = set(variable_names)
+        self._token_names = list(token_names)
+        self._template_compiler = TemplateCompiler(
+            tool_prefix, comment_delimiters, self._token_names, cache_dir
+        )
+        self._path_renderer = PathRenderer(
+            tool_prefix, dict.fromkeys(self._token_names, "")
+        )
+
+    def compile(self, root_dir: str, include_paths: List[str]) -> dict:
+        self._root_dir = os.path.abspath(root_dir)
+        # Including the starters root must not snapshot the tool's own files.
+        self._excluded = {
+            os.path.normpath(os.path.join(self._root_dir, path))
+            for path in self._excluded_paths
+        }
+        self._tree_index = TreeIndex()
+        self._undefined = []
+        self._bundle = {
+            "version": BUNDLE_VERSION,
+            "cache_tag": sys.implementation.cache_tag,
+            "fingerprint": get_bundle_fingerprint(
+                self._tool_prefix,
+                self._comment_delimiters,
+                self._token_names,
+                include_paths,
+            ),
+            "entries": {},
+            "listings": {},
+            "contents": {},
+            "templates": {},
+        }
+
+        for include_path in plan_subtrees(self._root_dir, include_paths):
+            self._add_subtree(include_path)
+
+        if self._undefined:
+            raise TemplateError(
+                messages.undefined_references(
+                    sorted(self._undefined, key=lambda reference: reference[0])
+                )
+            )
+
+        return self._bundle
+
+    def _add_subtree(self, include_path: str) -> None:
+        source_path = os.path.normpath(os.path.join(self._root_dir, include_path))
+        root_entry = self._tree_index.lookup(source_path)
+
+        if root_entry is None:
+            raise ValueError(RunnerErrorMessages.included_path_not_found(include_path))
+
+        if source_path in self._excluded:
+            return
+
+        relative_path = os.path.relpath(source_path, self._root_dir)
+
+        for segment in relative_path.split(os.path.sep)[:-1]:
+            self._check_name(relative_path, segment)
+
+        pending_entries = [root_entry]
+
+        while pending_entries:
+            entry = pending_entries.pop()
+
+            self._add_entry(entry)
+
+            if entry.is_dir:
+                listing = [
+                    child
+                    for child in self._tree_index.list_dir(entry.path)
+                    if child.path not in self._excluded
+                ]
+
+                self._bundle["listings"][self._relative(entry.path)] = [
+                    child.name for child in listing
+                ]
+                pending_entries.extend(listing)
+
+    def _add_entry(self, entry: PathEntry) -> None:
+        relative_path = self._relative(entry.path)
+
+        if relative_path in self._bundle["entries"]:
+            return
+
+        self._check_name(relative_path, entry.name)
+
+        link_target = (
+            self._tree_index.readlink(entry.path) if entry.is_symlink else None
+        )
+        mode = stat.S_IMODE(os.lstat(entry.path).st_mode)
+
+        self._bundle["entries"][relative_path] = (
+            entry.is_dir,
+            entry.is_symlink,
+            entry.size,
+            mode,
+            link_target,
+        )
+
+        if not entry.is_dir and not entry.is_symlink:
+            self._add_content(relative_path, entry)
+
+    def _add_content(self, relative_path: str, entry: PathEntry) -> None:
+        try:
+            content = self._tree_index.read(entry.path)
+        except OSError:
+            raise FileReadingError(
+                RunnerErrorMessages.failed_to_process_file(entry.path)
+            ) from None
+
+        self._bundle["contents"][relative_path] = content
+
+        if os.path.splitext(entry.name)[1].lower() in BINARY_EXTENSIONS:
+            return
+
+        try:
+            text = content.decode("utf-8")
+        except UnicodeDecodeError:
+            return
+
+        if self._tool_prefix not in text:
+            return
+
+        for name in self._template_compiler.get_undefined_references(
+            text, entry.path, self._variable_names
+        ):
+            self._undefined.append((relative_path, name))
+
+        key, code = self._template_compiler.compile_code(text, entry.path)
+        self._bundle["templates"][key] = code
+
+    def _check_name(self, relative_path: str, name: str) -> None:
+        if self._tool_prefix not in name:
+            return
+
+        for reference in self._path_renderer.get_undefined_references(name):
+            self._undefined.append((relative_path, reference))
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self._root_dir)
+
+
+def write_bundle(bundle: dict, path: str) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        with open(temp_path, "wb") as file:
+            marshal.dump(bundle, file)
+
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise FileReadingError(messages.couldnt_write_bundle(path)) from None
+
+
+def load_bundle(path: str, fingerprint: str) -> dict:
+    try:
+        with open(path, "rb") as file:
+            bundle = marshal.load(file)
+    except OSError:
+        raise FileReadingError(messages.couldnt_read_bundle(path)) from None
+    except (EOFError, ValueError, TypeError):
+        bundle = None
+
+    if (
+        not isinstance(bundle, dict)
+        or bundle.get("version") != BUNDLE_VERSION
+        or bundle.get("cache_tag") != sys.implementation.cache_tag
+    ):
+        raise ValueError(messages.incompatible_bundle(path))
+
+    if bundle["fingerprint"] != fingerprint:
+        raise ValueError(messages.stale_bundle(path))
+
+    return bundle
@@ -0,0 +1,62 @@
+import os
+from typing import List, Optional
+from ..core.interfaces import FileHandler, PathEntry
+from ..runner.tree_index import TreeIndex
+
+
+class BundleIndex(TreeIndex):
+    """Serves the template tree from a compiled bundle."""
+
+    def __init__(self, bundle: dict, root_dir: str, file_handler: FileHandler = None):
+        super().__init__(file_handler)
+
+        self._root_dir = os.path.abspath(root_dir)
+        self._entries = bundle["entries"]
+        self._bundle_listings = bundle["listings"]
+        self._contents = bundle["contents"]
+
+    def list_dir(self, path: str) -> List[PathEntry]:
+        listing = self._listings.get(path)
+
+        if listing is None:
+            relative_path = self._relative(path)
+            listing = [
+                self._to_path_entry(os.path.join(path, name))
+                for name in self._bundle_listings[relative_path]
+            ]
+            self._listings[path] = listing
+
+        return listing
+
+    def lookup(self, path: str) -> Optional[PathEntry]:
+        if self._relative(path) not in self._entries:
+            return None
+
+        return self._to_path_entry(path)
+
+    def read(self, path: str) -> bytes:
+        return self._contents[self._relative(path)]
+
+    def warm(self, path: str) -> None:
+        # The bundle's contents are already in memory.
+        pass
+
+    def readlink(self, path: str) -> str:
+        return self._entries[self._relative(path)][4]
+
+    def copy_file(self, path: str, destination_path: str) -> None:
+        self._file_handler.write_bytes(destination_path, self.read(path))
+        self.copy_mode(path, destination_path)
+
+    def copy_mode(self, path: str, destination_path: str) -> None:
+        self._file_handler.set_mode(
+            destination_path, self._entries[self._relative(path)][3]
+        )
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(os.path.normpath(path), self._root_dir)
+
+    def _to_path_entry(self, path: str) -> PathEntry:
+        is_dir, is_symlink, size, _, _ = self._entries[self._relative(path)]
+
+        return PathEntry(os.path.basename(path), path, is_dir, is_symlink, size)
@@ -0,0 +1,21 @@
+import re
+from typing import List
+
+
+WORD_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def split_words(value: str) -> List[str]:
+    return WORD_PATTERN.findall(value)
+
+
+CASE_VARIANTS = {
+    "snake": lambda words: "_".join(word.lower() for word in words),
+    "camel": lambda words: "".join(
+        word.lower() if index == 0 else word.capitalize()
+        for index, word in enumerate(words)
+    ),
+    "pascal": lambda words: "".join(word.capitalize() for word in words),
+    "kebab": lambda words: "-".join(word.lower() for word in words),
+    "upper": lambda words: "_".join(word.upper() for word in words),
+}
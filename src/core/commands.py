@@ -0,0 +1,33 @@
+from typing import Iterable, Optional, Tuple
+
+
+class Command(str):
+    """A ``cmd`` action's command line along with its scheduling options."""
+
+    name: str
+    after: Optional[Tuple[str, ...]]
+    resources: Tuple[str, ...]
+    timeout: Optional[float]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+    def __new__(
+        cls,
+        command: str,
+        name: str = None,
+        after: Iterable[str] = None,
+        resources: Iterable[str] = (),
+        timeout: float = None,
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+    ):
+        instance = super().__new__(cls, command)
+
+        instance.name = name or str(command)
+        instance.after = tuple(after) if after is not None else None
+        instance.resources = tuple(resources)
+        instance.timeout = timeout
+        instance.inputs = tuple(inputs)
+        instance.outputs = tuple(outputs)
+
+        return instance
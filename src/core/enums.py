@@ -12,6 +12,14 @@ class RuleTypes(Enum):
 class Actions(Enum):
     include = "include"
     cmd = "cmd"
+    call = "call"
+
+
+class FileActions(Enum):
+    mkdir = "mkdir"
+    copy = "copy"
+    render = "render"
+    link = "link"
 
 
 BooleanStrValues = {
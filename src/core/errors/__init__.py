@@ -1,2 +1,2 @@
 from .messages import *
-from .exceptions import KeyError, ValueError, FileReadingError, CopyError
+from .exceptions import KeyError, ValueError, FileReadingError, CopyError, TemplateError
@@ -19,3 +19,7 @@ class FileReadingError(CustomException):
 
 class CopyError(CustomException):
     pass
+
+
+class TemplateError(CustomException):
+    pass
@@ -36,3 +36,99 @@ class SetupErrorMessages(AttributeDict):
     )
     invalid_type_for_action_definition = "Invalid type for action definition. Each action definition should be a tuple, that may be inside a list or a dict"
     invalid_type_for_options = "Choice rule's options must be set in a list"
+    call_action_must_be_callable = "The items of a call action must be callables"
+    invalid_type_for_condition = (
+        lambda rule_name: f'Condition of rule "{rule_name}" must be a string'
+    )
+    unknown_rule_in_condition = (
+        lambda name, rule_name: f'Condition of rule "{rule_name}" refers to "{name}", which is not a rule defined before it'
+    )
+    unknown_command_dependency = (
+        lambda command, names: f"Command \"{command}\" runs after unknown commands {', '.join(map(repr, names))}"
+    )
+
+
+class TemplateErrorMessages(AttributeDict):
+    missing_condition = (
+        lambda marker, line: f'Missing condition for "{marker}" marker on line {line}'
+    )
+    unexpected_marker = (
+        lambda marker, line: f'Unexpected "{marker}" marker on line {line}'
+    )
+    unclosed_conditional = (
+        lambda line: f"Conditional block opened on line {line} is never closed"
+    )
+    invalid_rendered_name = (
+        lambda name, rendered: f'Name "{name}" renders to "{rendered}", which is not a valid file or directory name'
+    )
+
+
+class ExpressionErrorMessages(AttributeDict):
+    invalid_expression = lambda expression: f'Invalid expression "{expression}"'
+    undefined_variable = lambda name: f'Undefined variable "{name}" in expression'
+    uncomparable_values = (
+        lambda left, right: f'Values "{left}" and "{right}" can\'t be compared'
+    )
+
+
+class RunnerErrorMessages(AttributeDict):
+    included_path_not_found = lambda path: f'Included path "{path}" not found'
+    conflicting_destination = (
+        lambda path, first, second: f'"{first}" and "{second}" are both generated as "{path}"'
+    )
+    destination_outside_output = (
+        lambda path: f'Destination "{path}" is outside the output directory'
+    )
+    included_path_outside_root = (
+        lambda path: f'Included path "{path}" is outside the starters directory'
+    )
+    failed_to_process_file = lambda path: f'Failed to process file "{path}"'
+    command_failed = (
+        lambda command, code: f'Command "{command}" failed with exit code {code}'
+    )
+    command_timed_out = (
+        lambda command, timeout: f'Command "{command}" timed out after {timeout}s'
+    )
+    call_failed = lambda name, error: f'Call "{name}" failed: {error}'
+    command_path_outside_output = (
+        lambda path: f'Command path "{path}" is outside the output directory'
+    )
+    command_dependency_cycle = (
+        lambda commands: f"Commands {', '.join(map(repr, commands))} depend on each other"
+    )
+
+
+class AnswersErrorMessages(AttributeDict):
+    unsupported_answers_file = (
+        lambda path: f'Unsupported answers file "{path}". It must be a .json, .yaml, .toml, .jsonl or .csv file'
+    )
+    invalid_answers_file = (
+        lambda path: f'Answers file "{path}" must contain an object of answers'
+    )
+    missing_dependency = (
+        lambda package, path: f'Reading "{path}" requires the "{package}" package'
+    )
+    invalid_assignment = (
+        lambda assignment: f'Invalid assignment "{assignment}". It must be like name=value'
+    )
+    couldnt_read_answers = lambda path: f'Couldn\'t read answers file "{path}"'
+    invalid_answer_set = (
+        lambda path, line: f'Line {line} of "{path}" is not a JSON object'
+    )
+    plan_for_answer_batch = (
+        lambda path: f'A plan can\'t be made for the batch of answers "{path}"'
+    )
+
+
+class BundleErrorMessages(AttributeDict):
+    undefined_references = lambda references: "Undefined references:" + "".join(
+        f'\n  {path}: "{name}"' for (path, name) in references
+    )
+    couldnt_read_bundle = lambda path: f'Couldn\'t read bundle "{path}"'
+    couldnt_write_bundle = lambda path: f'Couldn\'t write bundle "{path}"'
+    incompatible_bundle = (
+        lambda path: f'Bundle "{path}" was compiled by another version and must be recompiled'
+    )
+    stale_bundle = (
+        lambda path: f'Bundle "{path}" doesn\'t match the current rules and must be recompiled'
+    )
@@ -1,2 +1,2 @@
 from .interaction import Interaction
-from .file_handler import FileHandler
+from .file_handler import FileHandler, PathEntry
@@ -1,5 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, NamedTuple, Optional
+
+
+class PathEntry(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    is_symlink: bool
+    size: int
+    modified: int = 0
 
 
 class FileHandler(ABC):
@@ -29,6 +38,52 @@ class FileHandler(ABC):
     def createDirectory(self, directory_path: str) -> None:
         raise NotImplemented
 
+    # The methods below are used by the generation, always with absolute paths.
+
+    @abstractmethod
+    def lookup(self, path: str) -> Optional[PathEntry]:
+        raise NotImplemented
+
+    @abstractmethod
+    def list_directory(self, directory_path: str) -> List[PathEntry]:
+        raise NotImplemented
+
+    @abstractmethod
+    def read_bytes(self, file_path: str) -> bytes:
+        raise NotImplemented
+
+    @abstractmethod
+    def write_bytes(self, file_path: str, content: bytes) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def read_link(self, link_path: str) -> str:
+        raise NotImplemented
+
+    @abstractmethod
+    def create_link(self, target: str, link_path: str) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def copy_contents(self, original_path: str, destination_path: str) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def copy_mode(self, original_path: str, destination_path: str) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def set_mode(self, path: str, mode: int) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def remove(self, path: str) -> None:
+        raise NotImplemented
+
+    @abstractmethod
+    def warm(self, file_path: str) -> None:
+        raise NotImplemented
+
     @abstractmethod
     def _validate_existing_path(self, path: str) -> None:
         raise NotImplemented
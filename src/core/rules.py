@@ -0,0 +1,130 @@
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from .enums import Actions, RuleTypes, BooleanStrValues
+from ..expressions import expression_compiler
+
+
+POSITIVE_VALUES = frozenset(BooleanStrValues["positive"])
+BOOLEAN_VALUES = POSITIVE_VALUES | frozenset(BooleanStrValues["negative"])
+
+
+class ChoiceOptions(list):
+    """A choice rule's options, indexed by their lowercase text."""
+
+    __slots__ = ("indexes",)
+
+    def __init__(self, options: Iterable):
+        super().__init__(options)
+
+        self.indexes = {}
+
+        for (index, option) in enumerate(self):
+            self.indexes.setdefault(str(option).lower(), index)
+
+    def index_of(self, value: str) -> Optional[int]:
+        if value.isnumeric() and 0 < int(value) <= len(self):
+            return int(value) - 1
+
+        return self.indexes.get(value.lower())
+
+
+def get_choice_options(options: Iterable) -> ChoiceOptions:
+    return options if isinstance(options, ChoiceOptions) else ChoiceOptions(options)
+
+
+def _is_number(number_type: type) -> Callable[[str, ChoiceOptions], bool]:
+    def validate(value: str, options: ChoiceOptions = None) -> bool:
+        number_type(value)
+        return True
+
+    return validate
+
+
+TYPE_VALIDATORS: Dict[RuleTypes, Callable[[str, ChoiceOptions], bool]] = {
+    RuleTypes.string: lambda value, options=None: True,
+    RuleTypes.bool: lambda value, options=None: value.lower() in BOOLEAN_VALUES,
+    RuleTypes.choice: lambda value, options=None: (
+        get_choice_options(options).index_of(value) is not None
+    ),
+    RuleTypes.integer: _is_number(int),
+    RuleTypes.float: _is_number(float),
+}
+
+
+class CompiledRule:
+    """An immutable rule, validated and compiled once."""
+
+    __slots__ = (
+        "name",
+        "type",
+        "message",
+        "options",
+        "action_table",
+        "condition",
+        "_validator",
+        "_check",
+        "_condition_names",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        type: RuleTypes,
+        message: str = None,
+        options: Iterable = None,
+        action_table: Dict[any, Tuple[Tuple[Actions, any], ...]] = None,
+        condition: str = None,
+    ):
+        set_attribute = super().__setattr__
+
+        set_attribute("name", name)
+        set_attribute("type", type)
+        set_attribute("message", message)
+        set_attribute(
+            "options", ChoiceOptions(options) if options is not None else None
+        )
+        set_attribute("action_table", action_table or {})
+        set_attribute("condition", condition)
+        set_attribute("_validator", TYPE_VALIDATORS[type])
+        set_attribute(
+            "_check",
+            expression_compiler.compile(condition) if condition is not None else None,
+        )
+        set_attribute(
+            "_condition_names",
+            tuple(expression_compiler.get_names(condition)) if condition else (),
+        )
+
+    def __setattr__(self, name: str, value: any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def is_enabled(self, variables: dict) -> bool:
+        if self._check is None:
+            return True
+
+        # A skipped rule has no value, so conditions on it are never satisfied.
+        if any(variables.get(name) is None for name in self._condition_names):
+            return False
+
+        return bool(self._check(variables))
+
+    def validate(self, value: str) -> bool:
+        try:
+            return bool(self._validator(value, self.options))
+        except Exception:
+            return False
+
+    def get_actions(self, value: any) -> Tuple[Tuple[Actions, any], ...]:
+        return self.action_table.get(value, ())
+
+    def parse(self, value: str) -> any:
+        if self.type == RuleTypes.bool:
+            return value.lower() in POSITIVE_VALUES
+
+        if self.type == RuleTypes.choice:
+            return self.options.index_of(value)
+
+        return value
+
+
+class CompiledRules(dict):
+    """The compiled rules, by name."""
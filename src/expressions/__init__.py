@@ -0,0 +1,3 @@
+from .expression_compiler import ExpressionCompiler
+
+expression_compiler = ExpressionCompiler()
@@ -0,0 +1,330 @@
+import re
+import ast
+import builtins
+import operator
+from typing import Callable, List, Tuple
+from ..core.errors import ExpressionErrorMessages as messages, KeyError, ValueError
+
+
+TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+        (?P<number>-?(?:\d+\.\d*|\.\d+|\d+))
+        |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+        |(?P<operator>==|!=|<=|>=|<|>|\(|\)|\[|\]|,)
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""",
+    re.VERBOSE,
+)
+
+CONSTANTS = {"true": True, "false": False, "none": None}
+KEYWORDS = {"and", "or", "not", "in"}
+
+COMPARISONS = {
+    "==": lambda left, right: _key(left) == _key(right),
+    "!=": lambda left, right: _key(left) != _key(right),
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda left, right: _contains(right, left),
+    "not in": lambda left, right: not _contains(right, left),
+}
+
+MEMBERSHIPS = {"in", "not in"}
+ORDERINGS = {"<", "<=", ">", ">="}
+
+_missing = object()
+
+
+class ExpressionCompiler:
+    """Compiles conditions into closures that receive the variables."""
+
+    def __init__(self):
+        self._compiled = {}
+
+    def compile(self, expression: str) -> Callable[[dict], any]:
+        compiled = self._compiled.get(expression)
+
+        if compiled is None:
+            compiled = _Parser(expression).parse()
+            self._compiled[expression] = compiled
+
+        return compiled
+
+    def evaluate(self, expression: str, variables: dict) -> any:
+        return self.compile(expression)(variables)
+
+    def get_names(self, expression: str) -> List[str]:
+        names = []
+
+        for kind, value in _tokenize(expression):
+            if kind == "name" and value not in names:
+                names.append(value)
+
+        return names
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+
+        if match is None or match.end() == position:
+            raise ValueError(messages.invalid_expression(expression))
+
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        if kind == "name" and value.lower() in CONSTANTS:
+            kind = "constant"
+        elif kind == "name" and value in KEYWORDS:
+            kind = "operator"
+
+        tokens.append((kind, value))
+        position = match.end()
+
+    return tokens
+
+
+def _coerce(left: any, right: any) -> Tuple[any, any]:
+    if isinstance(left, str) and _is_number(right):
+        return _to_number(left, type(right)), right
+
+    if isinstance(right, str) and _is_number(left):
+        return left, _to_number(right, type(left))
+
+    return left, right
+
+
+def _key(value: any) -> any:
+    # Booleans never equal numbers, so a bool rule doesn't match choice indexes.
+    if isinstance(value, bool):
+        return (bool, value)
+
+    if isinstance(value, tuple):
+        return tuple(_key(item) for item in value)
+
+    return value
+
+
+def _contains(container: any, value: any) -> bool:
+    if isinstance(container, tuple):
+        return any(
+            _key(left) == _key(right)
+            for (left, right) in (_coerce(value, item) for item in container)
+        )
+
+    return value in container
+
+
+def _is_number(value: any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_number(value: str, number_type: type) -> any:
+    try:
+        return number_type(value)
+    except (TypeError, builtins.ValueError):
+        try:
+            return float(value)
+        except (TypeError, builtins.ValueError):
+            return value
+
+
+class _Parser:
+    def __init__(self, expression: str):
+        self._expression = expression
+        self._tokens = _tokenize(expression)
+        self._position = 0
+
+    def parse(self) -> Callable[[dict], any]:
+        if not self._tokens:
+            raise ValueError(messages.invalid_expression(self._expression))
+
+        compiled, _ = self._parse_or()
+
+        if self._position != len(self._tokens):
+            raise ValueError(messages.invalid_expression(self._expression))
+
+        return compiled
+
+    def _peek(self) -> Tuple[str, str]:
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+
+        return (None, None)
+
+    def _accept(self, *values: str) -> bool:
+        kind, value = self._peek()
+
+        if kind == "operator" and value in values:
+            self._position += 1
+            return True
+
+        return False
+
+    def _expect(self, value: str) -> None:
+        if not self._accept(value):
+            raise ValueError(messages.invalid_expression(self._expression))
+
+    def _parse_or(self) -> tuple:
+        left, left_constant = self._parse_and()
+
+        while self._accept("or"):
+            right, _ = self._parse_and()
+            left, left_constant = self._or(left, right), _missing
+
+        return left, left_constant
+
+    def _parse_and(self) -> tuple:
+        left, left_constant = self._parse_not()
+
+        while self._accept("and"):
+            right, _ = self._parse_not()
+            left, left_constant = self._and(left, right), _missing
+
+        return left, left_constant
+
+    def _parse_not(self) -> tuple:
+        if self._accept("not"):
+            operand, _ = self._parse_not()
+
+            return (lambda variables: not operand(variables)), _missing
+
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> tuple:
+        left, left_constant = self._parse_operand()
+
+        if self._accept("not"):
+            self._expect("in")
+            comparison = "not in"
+        elif self._accept(*COMPARISONS.keys()):
+            comparison = self._tokens[self._position - 1][1]
+        else:
+            return left, left_constant
+
+        right, right_constant = self._parse_operand()
+
+        return self._compare(comparison, left, right, right_constant)
+
+    def _parse_operand(self) -> tuple:
+        kind, value = self._peek()
+        self._position += 1
+
+        if kind == "number":
+            constant = float(value) if "." in value else int(value)
+        elif kind == "string":
+            constant = ast.literal_eval(value)
+        elif kind == "constant":
+            constant = CONSTANTS[value.lower()]
+        elif kind == "name":
+            return self._lookup(value), _missing
+        elif kind == "operator" and value == "(":
+            operand = self._parse_or()
+            self._expect(")")
+            return operand
+        elif kind == "operator" and value == "[":
+            return self._parse_list()
+        else:
+            raise ValueError(messages.invalid_expression(self._expression))
+
+        return (lambda variables: constant), constant
+
+    def _parse_list(self) -> tuple:
+        items = []
+
+        while not self._accept("]"):
+            if items:
+                self._expect(",")
+
+            if self._accept("]"):
+                break
+
+            items.append(self._parse_operand())
+
+        if all(constant is not _missing for _, constant in items):
+            constant = tuple(constant for _, constant in items)
+
+            return (lambda variables: constant), constant
+
+        compiled_items = [compiled for compiled, _ in items]
+
+        return (
+            lambda variables: tuple(item(variables) for item in compiled_items)
+        ), _missing
+
+    def _lookup(self, name: str) -> Callable[[dict], any]:
+        def lookup(variables: dict) -> any:
+            value = variables.get(name, _missing)
+
+            if value is _missing:
+                raise KeyError(messages.undefined_variable(name))
+
+            return value
+
+        return lookup
+
+    def _compare(
+        self, operator_name: str, left: Callable, right: Callable, right_constant
+    ) -> tuple:
+        comparison = COMPARISONS[operator_name]
+
+        if operator_name in MEMBERSHIPS and isinstance(right_constant, tuple):
+            return (
+                self._compare_with_constant_items(
+                    operator_name == "in", left, right_constant
+                ),
+                _missing,
+            )
+
+        def compare(variables: dict) -> bool:
+            left_value, right_value = _coerce(left(variables), right(variables))
+
+            # A skipped rule's value can't be ordered, so it never satisfies.
+            if operator_name in ORDERINGS and (
+                left_value is None or right_value is None
+            ):
+                return False
+
+            try:
+                return comparison(left_value, right_value)
+            except TypeError:
+                raise ValueError(
+                    messages.uncomparable_values(left_value, right_value)
+                ) from None
+
+        return compare, _missing
+
+    def _compare_with_constant_items(
+        self, is_in: bool, left: Callable, items: tuple
+    ) -> Callable[[dict], bool]:
+        number_items = [item for item in items if _is_number(item)]
+        keys = [_key(item) for item in items]
+
+        try:
+            keys = frozenset(keys)
+        except TypeError:
+            pass
+
+        def compare(variables: dict) -> bool:
+            value = left(variables)
+
+            if isinstance(value, str) and number_items:
+                value = next(
+                    (item for item in number_items if _coerce(value, item)[0] == item),
+                    value,
+                )
+
+            return (_key(value) in keys) == is_in
+
+        return compare
+
+    def _and(self, left: Callable, right: Callable) -> Callable[[dict], any]:
+        return lambda variables: left(variables) and right(variables)
+
+    def _or(self, left: Callable, right: Callable) -> Callable[[dict], any]:
+        return lambda variables: left(variables) or right(variables)
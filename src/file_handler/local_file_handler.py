@@ -1,9 +1,10 @@
 import re
 import os
+import stat
 import inspect
 import shutil
-from typing import List
-from ..core.interfaces import FileHandler
+from typing import List, Optional
+from ..core.interfaces import FileHandler, PathEntry
 from ..core.errors import (
     LocalFileHandlerErrorMessages as messages,
     ValueError,
@@ -12,6 +13,9 @@ from ..core.errors import (
 )
 
 
+CHUNK_SIZE = 1024 * 1024
+
+
 class LocalFileHandler(FileHandler):
     def is_path(self, path: str) -> bool:
         if not isinstance(path, str):
@@ -91,8 +95,88 @@ class LocalFileHandler(FileHandler):
             self._copy_directory(full_original_path, full_destination_path)
 
     def createDirectory(self, directory_path: str) -> None:
-        # TODO
-        raise NotImplemented
+        os.makedirs(self._get_full_path(directory_path), exist_ok=True)
+
+    def lookup(self, path: str) -> Optional[PathEntry]:
+        try:
+            path_stat = os.lstat(path)
+        except OSError:
+            return None
+
+        is_dir = stat.S_ISDIR(path_stat.st_mode)
+
+        return PathEntry(
+            os.path.basename(path),
+            path,
+            is_dir,
+            stat.S_ISLNK(path_stat.st_mode),
+            0 if is_dir else path_stat.st_size,
+            path_stat.st_mtime_ns,
+        )
+
+    def list_directory(self, directory_path: str) -> List[PathEntry]:
+        listing = []
+
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                is_symlink = entry.is_symlink()
+                is_dir = not is_symlink and entry.is_dir()
+                entry_stat = entry.stat(follow_symlinks=False)
+
+                listing.append(
+                    PathEntry(
+                        entry.name,
+                        entry.path,
+                        is_dir,
+                        is_symlink,
+                        0 if is_dir else entry_stat.st_size,
+                        entry_stat.st_mtime_ns,
+                    )
+                )
+
+        return listing
+
+    def read_bytes(self, file_path: str) -> bytes:
+        with open(file_path, "rb") as file:
+            return file.read()
+
+    def write_bytes(self, file_path: str, content: bytes) -> None:
+        with open(file_path, "wb") as file:
+            file.write(content)
+
+    def read_link(self, link_path: str) -> str:
+        return os.readlink(link_path)
+
+    def create_link(self, target: str, link_path: str) -> None:
+        if os.path.lexists(link_path):
+            os.remove(link_path)
+
+        os.symlink(target, link_path)
+
+    def copy_contents(self, original_path: str, destination_path: str) -> None:
+        shutil.copyfile(original_path, destination_path)
+        shutil.copymode(original_path, destination_path)
+
+    def copy_mode(self, original_path: str, destination_path: str) -> None:
+        shutil.copymode(original_path, destination_path)
+
+    def set_mode(self, path: str, mode: int) -> None:
+        os.chmod(path, mode)
+
+    def remove(self, path: str) -> None:
+        if os.path.isdir(path) and not os.path.islink(path):
+            os.rmdir(path)
+        else:
+            os.remove(path)
+
+    def warm(self, file_path: str) -> None:
+        # Brings the file into the page cache, without keeping its contents.
+        with open(file_path, "rb") as file:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            else:
+                while file.read(CHUNK_SIZE):
+                    pass
 
     def _validate_existing_path(self, path: str) -> None:
         if not self.is_path(path):
@@ -119,6 +203,9 @@ class LocalFileHandler(FileHandler):
                 return dirname
 
     def _get_full_path(self, path: str) -> str:
+        if os.path.isabs(path):
+            return path
+
         path_separator = os.path.sep
         base_path = self._get_caller_base_dir() + path_separator
 
@@ -170,7 +257,9 @@ class LocalFileHandler(FileHandler):
         self, full_original_path: str, full_destination_path: str
     ) -> None:
         try:
-            shutil.copytree(full_original_path, full_destination_path)
+            shutil.copytree(
+                full_original_path, full_destination_path, dirs_exist_ok=True
+            )
         except Exception as error:
             print(error)
             raise CopyError(messages.failed_to_copy("directory"))
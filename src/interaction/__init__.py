@@ -1,3 +1,11 @@
 from .cli import Cli
 
 cli = Cli()
+from .answers import (
+    Answers,
+    get_environment_answers,
+    is_answer_batch,
+    load_answer_sets,
+    load_answers,
+    parse_assignments,
+)
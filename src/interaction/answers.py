@@ -0,0 +1,194 @@
+import os
+import csv
+import json
+from typing import List
+from .cli import Cli
+from ..core.interfaces import Interaction
+from ..core.enums import RuleTypes, BooleanStrValues
+from ..core.errors import (
+    AnswersErrorMessages,
+    CliErrorMessages as messages,
+    FileReadingError,
+    ValueError,
+)
+
+
+BATCH_EXTENSIONS = [".jsonl", ".csv"]
+ANSWERS_EXTENSIONS = [".json", ".yaml", ".yml", ".toml"]
+PACKAGE_NAMES = {"yaml": "PyYAML"}
+
+
+class Answers(Cli):
+    """Answers the questions from a dict, asking the missing ones to ``fallback``."""
+
+    def __init__(self, answers: dict, fallback: Interaction = None):
+        self._answers = answers
+        self._fallback = fallback
+
+    def ask_for(
+        self,
+        attribute: str,
+        default_value: any,
+        type: RuleTypes = RuleTypes.string,
+        options: list = None,
+        message: str = None,
+    ) -> str:
+        if attribute not in self._answers and self._fallback is not None:
+            return self._fallback.ask_for(
+                attribute, default_value, type, options, message
+            )
+
+        if type == RuleTypes.choice:
+            self._validate_choice_params(default_value, options)
+
+        value = self._to_input(self._answers.get(attribute))
+
+        if value == "" and not default_value:
+            raise ValueError(messages.no_value_for_attribute(attribute))
+
+        return self._validate_input(default_value, value, type, options)
+
+    def show(self, *args) -> None:
+        if self._fallback is not None:
+            self._fallback.show(*args)
+
+    def _to_input(self, value: any) -> str:
+        if value is None:
+            return ""
+
+        if isinstance(value, bool):
+            positive, negative = (
+                BooleanStrValues["positive"],
+                BooleanStrValues["negative"],
+            )
+            return positive[0] if value else negative[0]
+
+        return str(value)
+
+
+def is_answer_batch(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in BATCH_EXTENSIONS
+
+
+def load_answers(path: str) -> dict:
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension not in ANSWERS_EXTENSIONS:
+        raise ValueError(AnswersErrorMessages.unsupported_answers_file(path))
+
+    parse = {
+        ".json": _parse_json,
+        ".yaml": _parse_yaml,
+        ".yml": _parse_yaml,
+        ".toml": _parse_toml,
+    }[extension]
+
+    try:
+        with open(path, "rb") as file:
+            content = file.read()
+    except OSError:
+        raise FileReadingError(
+            AnswersErrorMessages.couldnt_read_answers(path)
+        ) from None
+
+    try:
+        answers = parse(content)
+    except ImportError as error:
+        raise ValueError(
+            AnswersErrorMessages.missing_dependency(
+                PACKAGE_NAMES.get(error.name, error.name), path
+            )
+        ) from None
+    except Exception:
+        answers = None
+
+    if not isinstance(answers, dict):
+        raise ValueError(AnswersErrorMessages.invalid_answers_file(path))
+
+    return answers
+
+
+def get_environment_answers(
+    names: List[str], tool_prefix: str, environ: dict = os.environ
+) -> dict:
+    prefix = f"{tool_prefix.upper()}_"
+
+    return {
+        name: environ[prefix + name.upper()]
+        for name in names
+        if prefix + name.upper() in environ
+    }
+
+
+def parse_assignments(assignments: List[str]) -> dict:
+    answers = {}
+
+    for assignment in assignments:
+        name, separator, value = assignment.partition("=")
+
+        if not separator or not name.strip():
+            raise ValueError(AnswersErrorMessages.invalid_assignment(assignment))
+
+        answers[name.strip()] = value
+
+    return answers
+
+
+def load_answer_sets(path: str) -> List[dict]:
+    if not is_answer_batch(path):
+        raise ValueError(AnswersErrorMessages.unsupported_answers_file(path))
+
+    extension = os.path.splitext(path)[1].lower()
+
+    try:
+        with open(path, newline="") as file:
+            if extension == ".csv":
+                return [
+                    {name: value for (name, value) in row.items() if value != ""}
+                    for row in csv.DictReader(file)
+                ]
+
+            return _parse_json_lines(file, path)
+    except OSError:
+        raise FileReadingError(
+            AnswersErrorMessages.couldnt_read_answers(path)
+        ) from None
+
+
+def _parse_json(content: bytes) -> any:
+    return json.loads(content)
+
+
+def _parse_yaml(content: bytes) -> any:
+    import yaml
+
+    return yaml.safe_load(content)
+
+
+def _parse_toml(content: bytes) -> any:
+    try:
+        import tomllib
+    except ImportError:
+        import tomli as tomllib
+
+    return tomllib.loads(content.decode("utf-8"))
+
+
+def _parse_json_lines(lines: list, path: str) -> List[dict]:
+    answer_sets = []
+
+    for (number, line) in enumerate(lines, 1):
+        if line.strip() == "":
+            continue
+
+        try:
+            answer_set = json.loads(line)
+        except json.JSONDecodeError:
+            answer_set = None
+
+        if not isinstance(answer_set, dict):
+            raise ValueError(AnswersErrorMessages.invalid_answer_set(path, number))
+
+        answer_sets.append(answer_set)
+
+    return answer_sets
@@ -1,9 +1,14 @@
+from typing import TextIO
 from ..core.interfaces import Interaction
-from ..core.enums import RuleTypes, BooleanStrValues
+from ..core.enums import RuleTypes
+from ..core.rules import TYPE_VALIDATORS
 from ..core.errors import CliErrorMessages as messages, ValueError
 
 
 class Cli(Interaction):
+    def __init__(self, output: TextIO = None):
+        self._output = output
+
     def ask_for(
         self,
         attribute: str,
@@ -16,7 +21,12 @@ class Cli(Interaction):
             attribute, default_value, type, options, message
         )
 
-        value = input(input_message)
+        if self._output is None:
+            value = input(input_message)
+        else:
+            self._output.write(input_message)
+            self._output.flush()
+            value = input()
 
         if value == "" and not default_value:
             raise ValueError(messages.no_value_for_attribute(attribute))
@@ -74,27 +84,8 @@ class Cli(Interaction):
         if value == "":
             value = default_value
 
-        if type == RuleTypes.string:
-            return value
-
-        validations = {
-            RuleTypes.bool: lambda val: (
-                val.lower()
-                in [
-                    *BooleanStrValues["positive"],
-                    *BooleanStrValues["negative"],
-                ]
-            ),
-            RuleTypes.choice: lambda val: (
-                val.lower() in [option.lower() for option in options]
-                or (int(val) > 0 and int(val) <= len(options))
-            ),
-            RuleTypes.integer: lambda val: int(val),
-            RuleTypes.float: lambda val: float(val),
-        }
-
         try:
-            if not validations[type](value):
+            if not TYPE_VALIDATORS[type](value, options):
                 raise Exception
         except Exception:
             desired_type = str(type).replace("RuleTypes.", "")
@@ -105,4 +96,4 @@ class Cli(Interaction):
         return value
 
     def show(self, *args) -> None:
-        print(*args)
+        print(*args, file=self._output)
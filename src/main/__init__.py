@@ -1 +1,2 @@
 from .main import Main
+from .run_context import RunContext
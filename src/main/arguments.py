@@ -0,0 +1,68 @@
+import argparse
+from typing import List
+from ..interaction import is_answer_batch
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="cakeslicer")
+
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["compile"],
+        help="compile: validate the rules and templates and write them to a bundle",
+    )
+
+    parser.add_argument(
+        "--bundle",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Bundle to write when compiling, or to generate the project from",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only render again the files affected by the answers changed since the last generation",
+    )
+
+    parser.add_argument(
+        "--plan",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="PATH",
+        help="Print (or write to PATH) the execution plan as JSON, without generating the project",
+    )
+
+    parser.add_argument(
+        "--answers",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Take the answers from a .json, .yaml or .toml file, or generate one "
+            "project for each answer set of a .jsonl or .csv file"
+        ),
+    )
+
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        dest="assignments",
+        metavar="NAME=VALUE",
+        help="Answer an attribute or rule, overriding the answers file",
+    )
+
+    arguments, _ = parser.parse_known_args(argv)
+
+    if (
+        arguments.plan is not None
+        and arguments.answers
+        and is_answer_batch(arguments.answers)
+    ):
+        parser.error("--plan can't be used with a batch of answers")
+
+    return arguments
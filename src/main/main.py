@@ -1,10 +1,76 @@
-from .setup import setup_properties
-from ..interaction import cli
-from ...settings import COMMENT_DELIMITERS, TOOL_PREFIX, ATTRIBUTES
+import os
+import sys
+import json
+import asyncio
+import inspect
+from time import perf_counter
+from typing import Callable, Coroutine, List, Optional, Tuple
+from .arguments import parse_arguments
+from .run_context import RunContext
+from .setup import setup_properties, compile_rules, get_all_actions, get_token_names
+from ..bundle import (
+    BundleCompiler,
+    BundleIndex,
+    get_bundle_fingerprint,
+    load_bundle,
+    write_bundle,
+)
+from ..core.case_variants import CASE_VARIANTS
+from ..core.enums import Actions
+from ..core.errors import AnswersErrorMessages as answers_messages, ValueError
+from ..core.interfaces import Interaction
+from ..interaction import (
+    Cli,
+    cli,
+    Answers,
+    get_environment_answers,
+    is_answer_batch,
+    load_answer_sets,
+    load_answers,
+    parse_assignments,
+)
+from ..runner import Runner, TreePreloader, create_render_pool
+from ...settings import (
+    COMMENT_DELIMITERS,
+    TOOL_PREFIX,
+    ATTRIBUTES,
+    CACHE_DIR,
+    OUTPUT_DIR,
+    WORKERS,
+    SHELL_SESSION,
+    PREFETCH,
+    BUNDLE_FILE,
+)
+
+
+BATCH_OUTPUT_DIR_KEY = "_output_dir"
 
 
 class Main:
-    _properties = {}
+    def run_cli(self, *args, root_dir: str = None, **kwargs) -> Optional[RunContext]:
+        """Runs with the options given on the command line."""
+
+        if root_dir is None:
+            root_dir = self._get_caller_dir()
+
+        arguments = parse_arguments(sys.argv[1:])
+
+        return self.run(root_dir=root_dir, **vars(arguments), **kwargs)
+
+    def run_async(
+        self, *args, root_dir: str = None, **kwargs
+    ) -> Coroutine[None, None, Optional[RunContext]]:
+        """Runs on a worker thread, so generations can be gathered on a loop."""
+
+        # Resolved here, as the coroutine's frame won't have the caller's.
+        if root_dir is None:
+            root_dir = self._get_caller_dir()
+
+        # Started here, since the generations' threads would keep it from
+        # being forked once several of them are running.
+        create_render_pool(kwargs.get("workers", WORKERS))
+
+        return asyncio.to_thread(self.run, root_dir=root_dir, **kwargs)
 
     def run(
         self,
@@ -13,29 +79,330 @@ class Main:
         attributes: dict = ATTRIBUTES,
         comment_delimiters: list = COMMENT_DELIMITERS,
         tool_prefix: str = TOOL_PREFIX,
+        output_dir: str = OUTPUT_DIR,
+        root_dir: str = None,
+        case_variants: dict = CASE_VARIANTS,
+        workers: int = WORKERS,
+        concurrency: dict = None,
+        shell_session: bool = SHELL_SESSION,
+        prefetch: bool = PREFETCH,
+        cache_dir: str = CACHE_DIR,
+        command: str = None,
+        bundle: str = None,
+        incremental: bool = False,
+        plan: str = None,
+        answers: str = None,
+        assignments: List[str] = (),
+    ) -> Optional[RunContext]:
+        if root_dir is None:
+            root_dir = self._get_caller_dir()
+
+        is_batch = answers is not None and is_answer_batch(answers)
+
+        if plan is not None and is_batch:
+            raise ValueError(answers_messages.plan_for_answer_batch(answers))
+
+        rules = compile_rules(rules)
+
+        bundle_path = os.path.normpath(os.path.join(root_dir, bundle or BUNDLE_FILE))
+        excluded_paths = [bundle_path, *self._get_script_paths()]
+
+        if command == "compile":
+            self._compile(
+                bundle_path,
+                [*excluded_paths, output_dir, cache_dir],
+                rules=rules,
+                attributes=attributes,
+                comment_delimiters=comment_delimiters,
+                tool_prefix=tool_prefix,
+                root_dir=root_dir,
+                case_variants=case_variants,
+                cache_dir=cache_dir,
+            )
+            # Compiling generates nothing, so there's no context to return.
+            return None
+
+        context = RunContext(root_dir, output_dir)
+        context.excluded_paths = excluded_paths
+
+        if bundle is not None:
+            context.tree_index, context.compiled_templates = self._load_bundle(
+                bundle_path,
+                rules=rules,
+                attributes=attributes,
+                comment_delimiters=comment_delimiters,
+                tool_prefix=tool_prefix,
+                root_dir=root_dir,
+                case_variants=case_variants,
+            )
+
+        overrides = {
+            **get_environment_answers([*attributes, *rules], tool_prefix),
+            **parse_assignments(assignments),
+        }
+
+        if is_batch:
+            return self._run_batch(
+                context,
+                load_answer_sets(answers),
+                overrides,
+                rules=rules,
+                attributes=attributes,
+                comment_delimiters=comment_delimiters,
+                tool_prefix=tool_prefix,
+                case_variants=case_variants,
+                workers=workers,
+                concurrency=concurrency,
+                shell_session=shell_session,
+                cache_dir=cache_dir,
+                incremental=incremental,
+            )
+
+        # The plan written to stdout must be the only thing there.
+        interaction = Cli(sys.stderr) if plan == "-" else cli
+
+        # Reads the included starters while the remaining rules are asked for,
+        # unless they're already in memory or won't be read as a whole.
+        preloader = (
+            TreePreloader(context.tree_index, root_dir)
+            if bundle is None and plan is None and not incremental
+            else None
+        )
+
+        if preloader and prefetch:
+            for include_path in get_all_actions(rules)[Actions.include]:
+                preloader.prefetch(include_path)
+
+        try:
+            self._prepare(
+                context,
+                {
+                    **(load_answers(answers) if answers else {}),
+                    **overrides,
+                },
+                rules=rules,
+                attributes=attributes,
+                comment_delimiters=comment_delimiters,
+                tool_prefix=tool_prefix,
+                case_variants=case_variants,
+                interaction=interaction,
+                on_include=preloader.add if preloader else None,
+            )
+        except BaseException:
+            if preloader:
+                preloader.cancel()
+            raise
+
+        if preloader:
+            preloader.stop()
+
+        runner = self._create_runner(
+            context,
+            workers=workers,
+            concurrency=concurrency,
+            shell_session=shell_session,
+            cache_dir=cache_dir,
+            incremental=incremental,
+        )
+
+        if plan is not None:
+            self._write_plan(runner.plan(), plan)
+            return context
+
+        cli.show(context.properties)
+
+        runner.run()
+        context.metrics = runner.metrics
+
+        for stage_metrics in context.metrics:
+            cli.show(str(stage_metrics))
+
+        return context
+
+    def _create_runner(
+        self,
+        context: RunContext,
+        *args,
+        workers: int,
+        concurrency: dict,
+        shell_session: bool,
+        cache_dir: str,
+        incremental: bool,
+    ) -> Runner:
+        return Runner(
+            context.properties,
+            context.root_dir,
+            context.output_dir,
+            cache_dir,
+            workers,
+            concurrency,
+            tree_index=context.tree_index,
+            template_compiler=context.template_compiler,
+            compiled_templates=context.compiled_templates,
+            incremental=incremental,
+            shell_session=shell_session,
+            excluded_paths=context.excluded_paths,
+        )
+
+    def _run_batch(
+        self,
+        context: RunContext,
+        answer_sets: List[dict],
+        overrides: dict,
+        *args,
+        rules: dict,
+        attributes: dict,
+        comment_delimiters: list,
+        tool_prefix: str,
+        case_variants: dict,
+        workers: int,
+        concurrency: dict,
+        shell_session: bool,
+        cache_dir: str,
+        incremental: bool,
+    ) -> RunContext:
+        start = perf_counter()
+
+        for (index, answers) in enumerate(answer_sets, 1):
+            # Each project gets its own context, sharing the caches.
+            project_context = RunContext(
+                context.root_dir,
+                os.path.join(
+                    context.output_dir,
+                    str(answers.get(BATCH_OUTPUT_DIR_KEY, index)),
+                ),
+                context.tree_index,
+                context.compiled_templates,
+                context.template_compiler,
+            )
+            project_context.excluded_paths = [
+                *context.excluded_paths,
+                context.output_dir,
+            ]
+            project_context.properties = setup_properties(
+                {},
+                Answers({**answers, **overrides}),
+                rules=rules,
+                comment_delimiters=comment_delimiters,
+                tool_prefix=tool_prefix,
+                attributes=attributes,
+                case_variants=case_variants,
+            )
+
+            runner = self._create_runner(
+                project_context,
+                workers=workers,
+                concurrency=concurrency,
+                shell_session=shell_session,
+                cache_dir=cache_dir,
+                incremental=incremental,
+            )
+            runner.run()
+
+            context.template_compiler = runner.template_compiler
+            context.metrics.extend(runner.metrics)
+
+        elapsed = perf_counter() - start
+
+        cli.show(
+            f"Generated {len(answer_sets)} project(s) in {elapsed:.3f}s "
+            f"({len(answer_sets) / max(elapsed, 1e-9):.1f} projects/s)"
+        )
+
+        return context
+
+    def _compile(
+        self,
+        bundle_path: str,
+        excluded_paths: List[str],
+        *args,
+        rules: dict,
+        attributes: dict,
+        comment_delimiters: list,
+        tool_prefix: str,
+        root_dir: str,
+        case_variants: dict,
+        cache_dir: str,
     ):
-        self._prepare(
-            rules=rules,
-            attributes=attributes,
-            comment_delimiters=comment_delimiters,
-            tool_prefix=tool_prefix,
+        bundle_compiler = BundleCompiler(
+            tool_prefix,
+            comment_delimiters,
+            [*attributes, *rules],
+            get_token_names(rules, attributes, case_variants),
+            cache_dir,
+            excluded_paths,
+        )
+        bundle = bundle_compiler.compile(
+            root_dir, get_all_actions(rules)[Actions.include]
+        )
+
+        write_bundle(bundle, bundle_path)
+
+        cli.show(
+            f"Compiled {len(bundle['entries'])} paths and "
+            f"{len(bundle['templates'])} templates into {bundle_path}"
         )
 
+    def _load_bundle(
+        self,
+        bundle_path: str,
+        *args,
+        rules: dict,
+        attributes: dict,
+        comment_delimiters: list,
+        tool_prefix: str,
+        root_dir: str,
+        case_variants: dict,
+    ) -> Tuple[BundleIndex, dict]:
+        fingerprint = get_bundle_fingerprint(
+            tool_prefix,
+            comment_delimiters,
+            get_token_names(rules, attributes, case_variants),
+            get_all_actions(rules)[Actions.include],
+        )
+        bundle = load_bundle(bundle_path, fingerprint)
+
+        return BundleIndex(bundle, root_dir), bundle["templates"]
+
     def _prepare(
         self,
+        context: RunContext,
+        answers: dict,
         *args,
         rules: dict,
         attributes: dict,
         comment_delimiters: list,
         tool_prefix: str,
+        case_variants: dict,
+        interaction: Interaction = cli,
+        on_include: Callable[[str], None] = None,
     ):
-        self._properties = setup_properties(
-            self._properties,
-            cli,
+        context.properties = setup_properties(
+            {},
+            Answers(answers, interaction) if answers else interaction,
             rules=rules,
             comment_delimiters=comment_delimiters,
             tool_prefix=tool_prefix,
             attributes=attributes,
+            case_variants=case_variants,
+            on_include=on_include,
         )
 
-        cli.show(self._properties)
+    def _write_plan(self, plan: dict, path: str):
+        if path == "-":
+            json.dump(plan, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return
+
+        with open(path, "w") as file:
+            json.dump(plan, file, indent=2)
+
+    def _get_script_paths(self) -> List[str]:
+        script_path = getattr(sys.modules.get("__main__"), "__file__", None)
+
+        return [os.path.abspath(script_path)] if script_path else []
+
+    def _get_caller_dir(self) -> str:
+        caller_frame = inspect.currentframe().f_back.f_back
+
+        return os.path.dirname(os.path.abspath(caller_frame.f_code.co_filename))
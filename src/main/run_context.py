@@ -0,0 +1,25 @@
+from typing import List
+from ..renderer import TemplateCompiler
+from ..runner import TreeIndex
+from ..runner.pipeline import StageMetrics
+
+
+class RunContext:
+    """The state of a single generation."""
+
+    def __init__(
+        self,
+        root_dir: str,
+        output_dir: str,
+        tree_index: TreeIndex = None,
+        compiled_templates: dict = None,
+        template_compiler: TemplateCompiler = None,
+    ):
+        self.root_dir = root_dir
+        self.output_dir = output_dir
+        self.properties = {}
+        self.tree_index = tree_index or TreeIndex()
+        self.compiled_templates = compiled_templates
+        self.template_compiler = template_compiler
+        self.metrics: List[StageMetrics] = []
+        self.excluded_paths: List[str] = []
@@ -1,6 +1,11 @@
+from itertools import repeat
+from typing import Callable, List, Tuple
 from ...src.core.interfaces import Interaction
-from ...src.core.enums import RuleTypes, Actions, BooleanStrValues
+from ...src.core.enums import RuleTypes, Actions
+from ...src.core.case_variants import CASE_VARIANTS, split_words
+from ...src.core.rules import CompiledRule, CompiledRules
 from ...src.core.errors import SetupErrorMessages as messages, KeyError, ValueError
+from ...src.expressions import expression_compiler
 
 
 def setup_properties(
@@ -11,18 +16,36 @@ def setup_properties(
     comment_delimiters: list = [],
     tool_prefix: str = "",
     attributes: dict = {},
+    case_variants: dict = CASE_VARIANTS,
+    on_include: Callable[[str], None] = None,
 ) -> dict:
     attr_variables = _get_attributes(interaction, attributes)
-    rules_variables, actions_to_perform = _parse_rules(interaction, rules)
+    rules_variables, actions_to_perform = _parse_rules(interaction, rules, on_include)
+    variables = {**attr_variables, **rules_variables}
 
     properties["COMMENT_DELIMITERS"] = comment_delimiters
     properties["TOOL_PREFIX"] = tool_prefix
-    properties["VARIABLES"] = {**attr_variables, **rules_variables}
+    properties["VARIABLES"] = variables
+    properties["TOKENS"] = _build_tokens(variables, attr_variables, case_variants)
     properties["ACTIONS"] = actions_to_perform
 
     return properties
 
 
+def _build_tokens(variables: dict, attributes: dict, case_variants: dict) -> dict:
+    tokens = {
+        name: "" if value is None else str(value) for (name, value) in variables.items()
+    }
+
+    for (attr, value) in attributes.items():
+        words = split_words(str(value))
+
+        for (variant, convert) in case_variants.items():
+            tokens[f"{attr}__{variant}"] = convert(words)
+
+    return tokens
+
+
 def _get_attributes(interaction: Interaction, default_attributes: dict) -> dict:
     attributes = {}
 
@@ -35,119 +58,178 @@ def _get_attributes(interaction: Interaction, default_attributes: dict) -> dict:
     return attributes
 
 
-def _parse_rules(interaction: Interaction, rules: dict) -> dict:
+def _parse_rules(
+    interaction: Interaction,
+    rules: dict,
+    on_include: Callable[[str], None] = None,
+) -> dict:
     rules_vars = {}
-    actions_to_perform = {Actions.include: [], Actions.cmd: []}
+    actions_to_perform = {action: [] for action in Actions}
 
     interaction.show("\nPROJECT SETTINGS:")
 
-    for (var_name, properties) in rules.items():
-        if not "type" in properties:
-            raise KeyError(messages.required_key_not_present_on_rule("type", var_name))
-
-        elif not isinstance(properties["type"], RuleTypes):
-            raise ValueError(messages.type_of_rule_must_be_rule_types(var_name))
+    for rule in compile_rules(rules).values():
+        if not rule.is_enabled(rules_vars):
+            rules_vars[rule.name] = None
+            continue
 
-        prop_type = properties["type"]
-        options = (
-            properties["options"]
-            if prop_type == RuleTypes.choice and "options" in properties
-            else None
+        rule_value = rule.parse(
+            interaction.ask_for(rule.name, None, rule.type, rule.options, rule.message)
         )
 
-        if options and not isinstance(options, list):
-            raise ValueError(messages.invalid_type_for_options)
+        rules_vars[rule.name] = rule_value
 
-        rule_value = _process_rule_value(
-            interaction.ask_for(
-                var_name,
-                None,
-                prop_type,
-                options,
-                properties["message"] if "message" in properties else None,
+        for (action, item) in rule.get_actions(rule_value):
+            actions_to_perform[action].append(item)
+
+            if action == Actions.include and on_include is not None:
+                on_include(item)
+
+    return (rules_vars, actions_to_perform)
+
+
+def compile_rules(rules: dict) -> CompiledRules:
+    if isinstance(rules, CompiledRules):
+        return rules
+
+    compiled_rules = CompiledRules()
+
+    for (var_name, properties) in rules.items():
+        _validate_rule(var_name, properties)
+
+        if "when" in properties:
+            _validate_condition(var_name, properties["when"], compiled_rules)
+
+        compiled_rules[var_name] = CompiledRule(
+            var_name,
+            properties["type"],
+            properties.get("message"),
+            (
+                properties.get("options") or None
+                if properties["type"] == RuleTypes.choice
+                else None
             ),
-            prop_type,
-            options,
+            (
+                _compile_action_table(properties["type"], properties["actions"])
+                if "actions" in properties
+                else {}
+            ),
+            properties.get("when"),
         )
 
-        rules_vars[var_name] = rule_value
+    _validate_command_dependencies(get_all_actions(compiled_rules)[Actions.cmd])
 
-        if "actions" in properties:
-            actions_to_perform = _process_actions(
-                actions_to_perform, properties["actions"], prop_type, rule_value
-            )
+    return compiled_rules
 
-    return (rules_vars, actions_to_perform)
 
+def validate_rules(rules: dict) -> None:
+    compile_rules(rules)
 
-def _process_rule_value(rule_value: str, type: RuleTypes, options: list = None) -> any:
-    if type == RuleTypes.bool:
-        rule_value = True if rule_value in BooleanStrValues["positive"] else False
 
-    elif type == RuleTypes.choice:
-        lowercase_options = [option.lower() for option in options]
+def get_token_names(
+    rules: dict, attributes: dict, case_variants: dict = CASE_VARIANTS
+) -> List[str]:
+    return [
+        *attributes,
+        *rules,
+        *[f"{attr}__{variant}" for attr in attributes for variant in case_variants],
+    ]
 
-        rule_value = (
-            int(rule_value) - 1
-            if rule_value.isnumeric()
-            else lowercase_options.index(rule_value)
-        )
 
-    return rule_value
+def get_all_actions(rules: dict) -> dict:
+    all_actions = {action: [] for action in Actions}
 
+    for rule in compile_rules(rules).values():
+        for actions in rule.action_table.values():
+            for (action, item) in actions:
+                all_actions[action].append(item)
 
-def _process_actions(
-    actions_to_perform: dict,
-    property_actions: any,
-    rule_type: RuleTypes,
-    rule_value: any,
-) -> dict:
-    error = ValueError(messages.invalid_type_for_action_definition)
+    return all_actions
 
-    if isinstance(property_actions, dict):
-        for value, action in property_actions.items():
-            if not (isinstance(action, tuple) or isinstance(action, list)):
-                raise error
 
-            if value == rule_value:
-                if isinstance(action, list):
-                    actions = action
-                    for action in actions:
-                        if not isinstance(action, tuple):
-                            raise error
+def _validate_rule(var_name: str, properties: dict) -> None:
+    if not "type" in properties:
+        raise KeyError(messages.required_key_not_present_on_rule("type", var_name))
+
+    elif not isinstance(properties["type"], RuleTypes):
+        raise ValueError(messages.type_of_rule_must_be_rule_types(var_name))
 
-                        actions_to_perform = _handle_action(actions_to_perform, action)
-                else:
-                    actions_to_perform = _handle_action(actions_to_perform, action)
+    if (
+        properties["type"] == RuleTypes.choice
+        and "options" in properties
+        and properties["options"]
+        and not isinstance(properties["options"], list)
+    ):
+        raise ValueError(messages.invalid_type_for_options)
 
-    elif isinstance(property_actions, tuple):
-        if rule_type == RuleTypes.bool and rule_value == True:
-            action = property_actions
 
-            actions_to_perform = _handle_action(actions_to_perform, action)
+def _validate_condition(var_name: str, condition: any, previous_rules: dict) -> None:
+    if not isinstance(condition, str):
+        raise ValueError(messages.invalid_type_for_condition(var_name))
 
-    elif isinstance(property_actions, list):
-        if rule_type == RuleTypes.bool and rule_value == True:
-            for action in property_actions:
-                if not isinstance(action, tuple):
-                    raise error
+    for name in expression_compiler.get_names(condition):
+        if name not in previous_rules:
+            raise ValueError(messages.unknown_rule_in_condition(name, var_name))
 
-                actions_to_perform = _handle_action(actions_to_perform, action)
 
-    else:
-        raise error
+def _validate_command_dependencies(commands: list) -> None:
+    names = {
+        name
+        for command in commands
+        for name in [str(command), getattr(command, "name", str(command))]
+    }
 
-    return actions_to_perform
+    for command in commands:
+        unknown_names = [
+            name for name in getattr(command, "after", None) or [] if name not in names
+        ]
 
+        if unknown_names:
+            raise ValueError(
+                messages.unknown_command_dependency(str(command), unknown_names)
+            )
 
-def _handle_action(actions_to_perform: dict, action: tuple):
-    if not isinstance(action[0], Actions):
-        raise ValueError(messages.first_tuple_value_must_be_an_action)
 
-    for index, item in enumerate(action):
-        if index == 0:
-            continue
+def _compile_action_table(rule_type: RuleTypes, property_actions: any) -> dict:
+    """Maps each rule value to the ``(action, item)`` pairs it triggers."""
+
+    if isinstance(property_actions, dict):
+        return {
+            value: _compile_actions(actions)
+            for (value, actions) in property_actions.items()
+        }
+
+    if not isinstance(property_actions, (tuple, list)):
+        raise ValueError(messages.invalid_type_for_action_definition)
+
+    if rule_type != RuleTypes.bool:
+        return {}
+
+    return {True: _compile_actions(property_actions)}
+
+
+def _compile_actions(actions: any) -> Tuple[Tuple[Actions, any], ...]:
+    if isinstance(actions, tuple):
+        actions = [actions]
+
+    elif not isinstance(actions, list):
+        raise ValueError(messages.invalid_type_for_action_definition)
+
+    compiled_actions = []
+
+    for action in actions:
+        if not isinstance(action, tuple):
+            raise ValueError(messages.invalid_type_for_action_definition)
+
+        if not isinstance(action[0], Actions):
+            raise ValueError(messages.first_tuple_value_must_be_an_action)
+
+        if action[0] == Actions.call and not all(map(callable, action[1:])):
+            raise ValueError(messages.call_action_must_be_callable)
 
-        actions_to_perform[action[0]].append(item)
+        if len(action) == 2:
+            compiled_actions.append(action)
+        else:
+            compiled_actions.extend(zip(repeat(action[0]), action[1:]))
 
-    return actions_to_perform
+    return tuple(compiled_actions)
@@ -0,0 +1,2 @@
+from .template_compiler import TemplateCompiler
+from .path_renderer import PathRenderer
@@ -0,0 +1,106 @@
+import os
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class CommentSyntax(NamedTuple):
+    line_delimiters: Tuple[str, ...] = ()
+    block_delimiters: Tuple[Tuple[str, str], ...] = ()
+
+
+HASH = CommentSyntax(("#",))
+SLASHES = CommentSyntax(("//",), (("/*", "*/"),))
+BLOCK = CommentSyntax((), (("/*", "*/"),))
+MARKUP = CommentSyntax((), (("<!--", "-->"),))
+DASHES = CommentSyntax(("--",), (("/*", "*/"),))
+NO_COMMENTS = CommentSyntax()
+
+COMMENT_SYNTAXES: Dict[str, CommentSyntax] = {
+    **dict.fromkeys(
+        [".py", ".pyi", ".pyx", ".sh", ".bash", ".zsh", ".fish", ".rb", ".pl"],
+        HASH,
+    ),
+    **dict.fromkeys(
+        [".r", ".yml", ".yaml", ".toml", ".cfg", ".conf", ".env", ".mk", ".cmake"],
+        HASH,
+    ),
+    **dict.fromkeys(
+        [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".java", ".kt", ".kts"],
+        SLASHES,
+    ),
+    **dict.fromkeys(
+        [".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".go", ".rs", ".swift", ".dart"],
+        SLASHES,
+    ),
+    **dict.fromkeys(
+        [".scala", ".groovy", ".gradle", ".proto", ".jsonc", ".json5", ".scss"],
+        SLASHES,
+    ),
+    ".less": SLASHES,
+    ".php": CommentSyntax(("//", "#"), (("/*", "*/"),)),
+    ".tf": CommentSyntax(("#", "//"), (("/*", "*/"),)),
+    ".css": BLOCK,
+    **dict.fromkeys([".html", ".htm", ".xhtml", ".xml", ".svg", ".md"], MARKUP),
+    ".vue": CommentSyntax(("//",), (("<!--", "-->"), ("/*", "*/"))),
+    ".svelte": CommentSyntax(("//",), (("<!--", "-->"), ("/*", "*/"))),
+    ".sql": DASHES,
+    ".lua": CommentSyntax(("--",)),
+    ".hs": CommentSyntax(("--",), (("{-", "-}"),)),
+    ".ini": CommentSyntax((";", "#")),
+    **dict.fromkeys([".bat", ".cmd"], CommentSyntax(("::", "REM"))),
+    **dict.fromkeys([".tex", ".erl"], CommentSyntax(("%",))),
+    **dict.fromkeys([".j2", ".jinja", ".jinja2"], CommentSyntax((), (("{#", "#}"),))),
+    ".json": NO_COMMENTS,
+    **dict.fromkeys(
+        ["dockerfile", "makefile", "gemfile", "rakefile", "procfile", "vagrantfile"],
+        HASH,
+    ),
+    **dict.fromkeys(
+        [".gitignore", ".dockerignore", ".gitattributes", ".editorconfig"], HASH
+    ),
+    "cmakelists.txt": HASH,
+}
+
+SHEBANG_SYNTAXES: Dict[str, CommentSyntax] = {
+    **dict.fromkeys(["python", "sh", "bash", "zsh", "fish", "ruby", "perl"], HASH),
+    **dict.fromkeys(["node", "deno", "ts-node"], SLASHES),
+    "lua": CommentSyntax(("--",)),
+}
+
+SHEBANG_PATTERN = re.compile(r"#!\s*(\S+)(?:[ \t]+(\S+))?")
+
+
+def get_comment_syntax(
+    file_name: str,
+    content: str,
+    default: CommentSyntax,
+    syntaxes: Dict[str, CommentSyntax] = COMMENT_SYNTAXES,
+) -> CommentSyntax:
+    base_name = os.path.basename(file_name).lower()
+
+    if base_name in syntaxes:
+        return syntaxes[base_name]
+
+    extension = os.path.splitext(base_name)[1]
+
+    if extension in syntaxes:
+        return syntaxes[extension]
+
+    return _get_shebang_syntax(content) or default
+
+
+def _get_shebang_syntax(content: str) -> Optional[CommentSyntax]:
+    if not content.startswith("#!"):
+        return None
+
+    shebang_match = SHEBANG_PATTERN.match(content)
+
+    if shebang_match is None:
+        return None
+
+    interpreter = os.path.basename(shebang_match.group(1))
+
+    if interpreter == "env" and shebang_match.group(2):
+        interpreter = shebang_match.group(2)
+
+    return SHEBANG_SYNTAXES.get(interpreter.rstrip("0123456789."))
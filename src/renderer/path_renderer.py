@@ -0,0 +1,109 @@
+import os
+import re
+from typing import Callable, List, Optional
+from .template_compiler import build_token_pattern
+from ..core.errors import TemplateErrorMessages as messages, ValueError
+from ..expressions import expression_compiler
+
+
+INVALID_NAMES = {"", ".", ".."}
+
+
+class PathRenderer:
+    """Renders the variables and conditions of file and directory names."""
+
+    def __init__(self, tool_prefix: str, variables: dict, check: Callable = None):
+        self._variables = variables
+        self._check = check or (
+            lambda condition: expression_compiler.evaluate(condition, variables)
+        )
+        self._token_pattern = build_token_pattern(tool_prefix, variables.keys())
+        self._condition_pattern = re.compile(
+            rf"^\{{{re.escape(tool_prefix)}_if\s+([^}}]+)\}}(.*)$", re.DOTALL
+        )
+        self._reference_pattern = re.compile(rf"{re.escape(tool_prefix)}_\w+")
+        self._prefix = tool_prefix
+        self._segments = {}
+
+    def render_segment(self, segment: str) -> Optional[str]:
+        try:
+            return self._segments[segment]
+        except KeyError:
+            pass
+
+        rendered = segment
+
+        if segment and "{" in segment:
+            condition_match = self._condition_pattern.match(segment)
+
+            if condition_match is not None:
+                condition, rendered = condition_match.groups()
+                rendered = rendered if self._check(condition.strip()) else None
+
+        if rendered and self._token_pattern is not None and self._prefix in rendered:
+            rendered = self._token_pattern.sub(
+                lambda match: str(self._variables[match.group(1)]), rendered
+            )
+            self._validate_name(segment, rendered)
+
+        if segment and not rendered:
+            rendered = None
+
+        self._segments[segment] = rendered
+
+        return self._segments[segment]
+
+    def get_references(self, segment: str) -> List[str]:
+        names = []
+        condition_match = self._condition_pattern.match(segment)
+
+        if condition_match is not None:
+            condition, segment = condition_match.groups()
+            expression_compiler.compile(condition.strip())
+            names.extend(expression_compiler.get_names(condition))
+
+        if self._token_pattern is not None:
+            names.extend(
+                match.group(1) for match in self._token_pattern.finditer(segment)
+            )
+
+        return names
+
+    def get_undefined_references(self, segment: str) -> List[str]:
+        undefined = [
+            name for name in self.get_references(segment) if name not in self._variables
+        ]
+        condition_match = self._condition_pattern.match(segment)
+
+        if condition_match is not None:
+            segment = condition_match.group(2)
+
+        if self._token_pattern is not None:
+            segment = self._token_pattern.sub("", segment)
+
+        undefined.extend(self._reference_pattern.findall(segment))
+
+        return undefined
+
+    def _validate_name(self, segment: str, rendered: str) -> None:
+        # An answer must never turn a name into a path leaving its directory.
+        if (
+            rendered in INVALID_NAMES
+            or os.path.sep in rendered
+            or (os.path.altsep and os.path.altsep in rendered)
+            or os.path.splitdrive(rendered)[0]
+        ):
+            raise ValueError(messages.invalid_rendered_name(segment, rendered))
+
+    def render_path(self, relative_path: str) -> Optional[str]:
+        rendered_segments = []
+
+        for segment in relative_path.split(os.path.sep):
+            rendered = self.render_segment(segment)
+
+            if rendered is None:
+                return None
+
+            rendered_segments.append(rendered)
+
+        return os.path.sep.join(rendered_segments)
@@ -0,0 +1,367 @@
+import os
+import re
+import sys
+import marshal
+import hashlib
+from typing import Callable, Dict, Iterable, List, Tuple
+from ..core.errors import TemplateErrorMessages as messages, TemplateError
+from ..expressions import expression_compiler
+from .comment_syntax import COMMENT_SYNTAXES, CommentSyntax, get_comment_syntax
+
+
+COMPILER_VERSION = "2"
+RENDER_FUNCTION_NAME = "render"
+
+
+def build_token_pattern(tool_prefix: str, variable_names: Iterable[str]) -> re.Pattern:
+    names = sorted(set(variable_names), key=lambda name: (-len(name), name))
+
+    if not names:
+        return None
+
+    alternatives = "|".join(re.escape(name) for name in names)
+
+    return re.compile(f"{re.escape(tool_prefix)}_({alternatives})")
+
+
+class TemplateCompiler:
+    """Compiles templates into functions, cached under ``cache_dir``."""
+
+    def __init__(
+        self,
+        tool_prefix: str,
+        comment_delimiters: List[str],
+        variable_names: Iterable[str],
+        cache_dir: str = None,
+        comment_syntaxes: Dict[str, CommentSyntax] = COMMENT_SYNTAXES,
+        compiled_templates: Dict[str, bytes] = None,
+    ):
+        self._tool_prefix = tool_prefix
+        self._default_syntax = CommentSyntax(tuple(comment_delimiters))
+        self._comment_syntaxes = comment_syntaxes
+        self._marker_patterns = {}
+        self._variable_names = sorted(set(variable_names), key=lambda n: (-len(n), n))
+        self._cache_dir = cache_dir
+        self._functions = {}
+        self._compiled_templates = compiled_templates or {}
+
+        self._token_pattern = build_token_pattern(tool_prefix, self._variable_names)
+        self._marker_prefix = f"{tool_prefix}_"
+        self._reference_pattern = re.compile(rf"{re.escape(tool_prefix)}_\w+")
+        self._fingerprint = self._hash(
+            repr(
+                (
+                    COMPILER_VERSION,
+                    sys.implementation.cache_tag,
+                    tool_prefix,
+                    self._variable_names,
+                )
+            )
+        )
+
+    def render(
+        self,
+        content: str,
+        variables: dict,
+        check: Callable = None,
+        file_name: str = None,
+    ) -> str:
+        if check is None:
+            check = lambda condition: expression_compiler.evaluate(condition, variables)
+
+        return self.compile(content, file_name)(variables, check)
+
+    def compile(self, content: str, file_name: str = None) -> Callable:
+        syntax = self.get_comment_syntax(content, file_name)
+        key = self.get_cache_key(content, syntax)
+
+        if key in self._functions:
+            return self._functions[key]
+
+        namespace = {}
+        exec(self._get_code(content, syntax, key), namespace)
+
+        render_function = namespace[RENDER_FUNCTION_NAME]
+        self._functions[key] = render_function
+
+        return render_function
+
+    def compile_code(self, content: str, file_name: str = None) -> Tuple[str, bytes]:
+        """Returns the template's cache key along with its marshalled code."""
+
+        syntax = self.get_comment_syntax(content, file_name)
+        key = self.get_cache_key(content, syntax)
+
+        return key, marshal.dumps(self._get_code(content, syntax, key))
+
+    def get_undefined_references(
+        self, content: str, file_name: str, variable_names: Iterable[str]
+    ) -> List[str]:
+        """Lists the unknown tokens and condition names used by the template."""
+
+        nodes = self._parse(content, self.get_comment_syntax(content, file_name))
+        undefined = []
+
+        self._collect_undefined(nodes, set(variable_names), undefined)
+
+        return list(dict.fromkeys(undefined))
+
+    def get_references(
+        self, content: str, file_name: str = None
+    ) -> Dict[str, List[Tuple[int, int]]]:
+        """Maps each variable to the byte ranges of ``content`` that use it."""
+
+        marker_pattern = self._get_marker_pattern(
+            self.get_comment_syntax(content, file_name)
+        )
+        references = {}
+        offset = 0
+
+        for line in content.splitlines(keepends=True):
+            size = len(line.encode("utf-8", "surrogatepass"))
+            marker_match = self._match_marker(marker_pattern, line)
+
+            if marker_match is not None:
+                for name in expression_compiler.get_names(marker_match[1]):
+                    references.setdefault(name, []).append((offset, offset + size))
+
+            elif self._token_pattern is not None and self._marker_prefix in line:
+                for match in self._token_pattern.finditer(line):
+                    start = offset + len(
+                        line[: match.start()].encode("utf-8", "surrogatepass")
+                    )
+                    end = start + len(match.group(0).encode("utf-8", "surrogatepass"))
+                    references.setdefault(match.group(1), []).append((start, end))
+
+            offset += size
+
+        return references
+
+    def get_comment_syntax(self, content: str, file_name: str = None) -> CommentSyntax:
+        if not file_name:
+            return self._default_syntax
+
+        return get_comment_syntax(
+            file_name, content, self._default_syntax, self._comment_syntaxes
+        )
+
+    def get_cache_key(self, content: str, syntax: CommentSyntax = None) -> str:
+        syntax = syntax or self._default_syntax
+
+        return self._hash(self._fingerprint + repr(tuple(syntax)) + content)
+
+    def _get_code(self, content: str, syntax: CommentSyntax, key: str):
+        code = self._load_cached_code(key)
+
+        if code is None:
+            source = self._generate_source(self._parse(content, syntax))
+            code = compile(source, f"<{self._tool_prefix} template {key}>", "exec")
+            self._store_cached_code(key, code)
+
+        return code
+
+    def _collect_undefined(
+        self, nodes: list, variable_names: set, undefined: List[str]
+    ) -> None:
+        for node in nodes:
+            if isinstance(node, str):
+                undefined.extend(self._reference_pattern.findall(node))
+
+            elif node[0] == "if":
+                for (condition, branch_nodes) in node[1]:
+                    if condition is not None:
+                        expression_compiler.compile(condition)
+                        undefined.extend(
+                            name
+                            for name in expression_compiler.get_names(condition)
+                            if name not in variable_names
+                        )
+
+                    self._collect_undefined(branch_nodes, variable_names, undefined)
+
+    def _hash(self, value: str) -> str:
+        return hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _get_marker_pattern(self, syntax: CommentSyntax) -> re.Pattern:
+        if syntax not in self._marker_patterns:
+            self._marker_patterns[syntax] = self._build_marker_pattern(syntax)
+
+        return self._marker_patterns[syntax]
+
+    def _build_marker_pattern(self, syntax: CommentSyntax) -> re.Pattern:
+        keyword = rf"{re.escape(self._tool_prefix)}_(if|elif|else|endif)\b"
+        alternatives = []
+
+        if syntax.line_delimiters:
+            delimiters = "|".join(
+                re.escape(delimiter)
+                for delimiter in sorted(syntax.line_delimiters, key=len, reverse=True)
+            )
+            alternatives.append(rf"(?:{delimiters})[ \t]*{keyword}(.*?)")
+
+        for (opening, closing) in syntax.block_delimiters:
+            alternatives.append(
+                rf"{re.escape(opening)}[ \t]*{keyword}(.*?)[ \t]*{re.escape(closing)}"
+            )
+
+        if not alternatives:
+            return None
+
+        return re.compile(rf"^[ \t]*(?:{'|'.join(alternatives)})[ \t]*$")
+
+    def _match_marker(self, marker_pattern: re.Pattern, line: str) -> tuple:
+        if marker_pattern is None or self._marker_prefix not in line:
+            return None
+
+        marker_match = marker_pattern.match(line.rstrip("\r\n"))
+
+        if marker_match is None:
+            return None
+
+        groups = marker_match.groups()
+
+        for index in range(0, len(groups), 2):
+            if groups[index] is not None:
+                return groups[index], groups[index + 1].strip()
+
+    def _parse(self, content: str, syntax: CommentSyntax) -> list:
+        root = []
+        stack = []
+        current = root
+        marker_pattern = self._get_marker_pattern(syntax)
+
+        for line_number, line in enumerate(content.splitlines(keepends=True), 1):
+            marker_match = self._match_marker(marker_pattern, line)
+
+            if marker_match is None:
+                self._parse_text(line, current)
+                continue
+
+            marker, condition = marker_match
+            marker_name = f"{self._tool_prefix}_{marker}"
+
+            if marker in ("if", "elif") and not condition:
+                raise TemplateError(
+                    messages.missing_condition(marker_name, line_number)
+                )
+
+            if marker == "if":
+                node = ("if", [[condition, []]], line_number)
+                current.append(node)
+                stack.append((node, current))
+                current = node[1][-1][1]
+                continue
+
+            if not stack:
+                raise TemplateError(
+                    messages.unexpected_marker(marker_name, line_number)
+                )
+
+            node, parent = stack[-1]
+            has_else_branch = node[1][-1][0] is None
+
+            if marker != "endif" and has_else_branch:
+                raise TemplateError(
+                    messages.unexpected_marker(marker_name, line_number)
+                )
+
+            if marker == "endif":
+                stack.pop()
+                current = parent
+            else:
+                node[1].append([condition if marker == "elif" else None, []])
+                current = node[1][-1][1]
+
+        if stack:
+            raise TemplateError(messages.unclosed_conditional(stack[-1][0][2]))
+
+        return root
+
+    def _parse_text(self, text: str, nodes: list) -> None:
+        position = 0
+
+        if self._token_pattern is not None:
+            for match in self._token_pattern.finditer(text):
+                self._append_literal(text[position : match.start()], nodes)
+                nodes.append(("var", match.group(1)))
+                position = match.end()
+
+        self._append_literal(text[position:], nodes)
+
+    def _append_literal(self, text: str, nodes: list) -> None:
+        if not text:
+            return
+
+        if nodes and isinstance(nodes[-1], str):
+            nodes[-1] += text
+        else:
+            nodes.append(text)
+
+    def _generate_source(self, nodes: list) -> str:
+        lines = [
+            f"def {RENDER_FUNCTION_NAME}(VARIABLES, check):",
+            "    _parts = []",
+            "    _append = _parts.append",
+        ]
+
+        self._generate_nodes(nodes, lines, 1)
+        lines.append("    return ''.join(_parts)")
+
+        return "\n".join(lines) + "\n"
+
+    def _generate_nodes(self, nodes: list, lines: list, level: int) -> None:
+        indent = " " * 4 * level
+
+        if not nodes:
+            lines.append(f"{indent}pass")
+
+        for node in nodes:
+            if isinstance(node, str):
+                lines.append(f"{indent}_append({node!r})")
+
+            elif node[0] == "var":
+                lines.append(f"{indent}_append(str(VARIABLES[{node[1]!r}]))")
+
+            else:
+                for index, (condition, branch_nodes) in enumerate(node[1]):
+                    if condition is None:
+                        lines.append(f"{indent}else:")
+                    else:
+                        keyword = "if" if index == 0 else "elif"
+                        lines.append(f"{indent}{keyword} check({condition!r}):")
+
+                    self._generate_nodes(branch_nodes, lines, level + 1)
+
+    def _get_cache_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, "templates", key[:2], f"{key}.marshal")
+
+    def _load_cached_code(self, key: str):
+        if key in self._compiled_templates:
+            return marshal.loads(self._compiled_templates[key])
+
+        if not self._cache_dir:
+            return None
+
+        try:
+            with open(self._get_cache_path(key), "rb") as file:
+                return marshal.load(file)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def _store_cached_code(self, key: str, code) -> None:
+        if not self._cache_dir:
+            return
+
+        cache_path = self._get_cache_path(key)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+            with open(temp_path, "wb") as file:
+                marshal.dump(code, file)
+
+            os.replace(temp_path, cache_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,5 @@
+from .calls import CallContext
+from .parallel import create_render_pool
+from .preloader import TreePreloader
+from .runner import Runner
+from .tree_index import TreeIndex
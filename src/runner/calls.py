@@ -0,0 +1,30 @@
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple
+from ..core.errors import RunnerErrorMessages as messages, ValueError
+from ..interaction import cli
+
+
+class CallContext(NamedTuple):
+    root_dir: str
+    output_dir: str
+    tokens: Dict[str, str]
+
+
+def get_call_name(function: Callable) -> str:
+    module = getattr(function, "__module__", None)
+    name = getattr(function, "__qualname__", None) or repr(function)
+
+    return f"{module}.{name}" if module else name
+
+
+def run_calls(functions: List[Callable], context: CallContext, variables: dict) -> None:
+    for function in functions:
+        name = get_call_name(function)
+        start = perf_counter()
+
+        try:
+            function(context, dict(variables))
+        except Exception as error:
+            raise ValueError(messages.call_failed(name, error)) from error
+
+        cli.show(f"> {name} ({(perf_counter() - start) * 1000:.1f}ms)")
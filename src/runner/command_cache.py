@@ -0,0 +1,128 @@
+import os
+import shutil
+import hashlib
+from typing import List, Optional
+from ..core.errors import RunnerErrorMessages as messages, ValueError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+COMMAND_CACHE_VERSION = "1"
+
+# The Linux ioctl that makes a file share the blocks of another one.
+FICLONE = 0x40049409
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class CommandCache:
+    """A content-addressed store of the commands' outputs."""
+
+    def __init__(self, cache_dir: str):
+        self._commands_dir = os.path.join(cache_dir, "commands")
+
+    def get_key(self, command: str, cwd: str) -> Optional[str]:
+        if not getattr(command, "outputs", ()):
+            return None
+
+        key = hashlib.sha256(repr((COMMAND_CACHE_VERSION, str(command))).encode())
+
+        for input_path in sorted(command.inputs):
+            key.update(b"\0" + input_path.encode("utf-8") + b"\0")
+            key.update(_hash_file(_resolve(cwd, input_path)))
+
+        return key.hexdigest()
+
+    def restore(self, key: str, command: str, cwd: str) -> bool:
+        entry_dir = os.path.join(self._commands_dir, key)
+
+        if not os.path.isdir(entry_dir):
+            return False
+
+        try:
+            for (index, output_path) in enumerate(command.outputs):
+                _replace(
+                    os.path.join(entry_dir, str(index)), _resolve(cwd, output_path)
+                )
+        except OSError:
+            return False
+
+        return True
+
+    def store(self, key: str, command: str, cwd: str) -> None:
+        output_paths = [_resolve(cwd, path) for path in command.outputs]
+
+        if not all(os.path.lexists(path) for path in output_paths):
+            return
+
+        entry_dir = os.path.join(self._commands_dir, key)
+        temp_dir = f"{entry_dir}.{os.getpid()}.tmp"
+
+        try:
+            for (index, output_path) in enumerate(output_paths):
+                _replace(output_path, os.path.join(temp_dir, str(index)))
+
+            os.rename(temp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def clone_file(source_path: str, destination_path: str) -> None:
+    """Copies a file, sharing its blocks with the original one when possible."""
+
+    if fcntl is not None:
+        try:
+            with open(source_path, "rb") as source, open(
+                destination_path, "wb"
+            ) as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+
+            shutil.copymode(source_path, destination_path)
+            return
+        except OSError:
+            pass
+
+    shutil.copy(source_path, destination_path)
+
+
+def _replace(source_path: str, destination_path: str) -> None:
+    if os.path.isdir(destination_path) and not os.path.islink(destination_path):
+        shutil.rmtree(destination_path)
+    elif os.path.lexists(destination_path):
+        os.remove(destination_path)
+
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+
+    if os.path.islink(source_path):
+        os.symlink(os.readlink(source_path), destination_path)
+    elif os.path.isdir(source_path):
+        shutil.copytree(
+            source_path, destination_path, symlinks=True, copy_function=clone_file
+        )
+    else:
+        clone_file(source_path, destination_path)
+
+
+def _resolve(cwd: str, path: str) -> str:
+    full_path = os.path.normpath(os.path.join(cwd, path))
+
+    if not full_path.startswith(os.path.normpath(cwd) + os.path.sep):
+        raise ValueError(messages.command_path_outside_output(path))
+
+    return full_path
+
+
+def _hash_file(path: str) -> bytes:
+    file_hash = hashlib.sha256()
+
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+    except FileNotFoundError:
+        return b"missing"
+
+    return file_hash.digest()
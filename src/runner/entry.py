@@ -0,0 +1,32 @@
+class Entry:
+    __slots__ = (
+        "source_path",
+        "name",
+        "destination_dir",
+        "destination_path",
+        "size",
+        "is_dir",
+        "is_symlink",
+        "action",
+        "content",
+    )
+
+    def __init__(
+        self,
+        source_path: str,
+        name: str,
+        destination_dir: str,
+        size: int = 0,
+        is_dir: bool = False,
+        is_symlink: bool = False,
+        destination_path: str = None,
+    ):
+        self.source_path = source_path
+        self.name = name
+        self.destination_dir = destination_dir
+        self.destination_path = destination_path
+        self.size = size
+        self.is_dir = is_dir
+        self.is_symlink = is_symlink
+        self.action = None
+        self.content = None
@@ -0,0 +1,105 @@
+import hashlib
+from ..expressions import expression_compiler
+from ..renderer import TemplateCompiler
+
+
+class FileRenderer:
+    def __init__(
+        self,
+        tool_prefix: str,
+        comment_delimiters: list,
+        tokens: dict,
+        variables: dict,
+        cache_dir: str = None,
+        compiler: TemplateCompiler = None,
+        compiled_templates: dict = None,
+    ):
+        self._settings = (
+            tool_prefix,
+            tuple(comment_delimiters),
+            tuple(sorted(tokens)),
+            cache_dir,
+        )
+        self._compiled_templates = compiled_templates
+        self._templates_key = (
+            hashlib.sha256("".join(sorted(compiled_templates)).encode()).hexdigest()
+            if compiled_templates
+            else None
+        )
+
+        self._tool_prefix = tool_prefix
+        self._tokens = tokens
+        self._variables = variables
+        self._check = lambda condition: expression_compiler.evaluate(
+            condition, variables
+        )
+        self._compiler = compiler or self.create_compiler(
+            self._settings, compiled_templates
+        )
+
+    @staticmethod
+    def create_compiler(
+        settings: tuple, compiled_templates: dict = None
+    ) -> TemplateCompiler:
+        (tool_prefix, comment_delimiters, token_names, cache_dir) = settings
+
+        return TemplateCompiler(
+            tool_prefix,
+            comment_delimiters,
+            token_names,
+            cache_dir,
+            compiled_templates=compiled_templates,
+        )
+
+    @classmethod
+    def from_task_state(
+        cls, settings: tuple, tokens: dict, variables: dict, compiler: TemplateCompiler
+    ) -> "FileRenderer":
+        (tool_prefix, comment_delimiters, _, cache_dir) = settings
+
+        return cls(
+            tool_prefix, comment_delimiters, tokens, variables, cache_dir, compiler
+        )
+
+    @property
+    def check(self):
+        return self._check
+
+    @property
+    def compiler(self) -> TemplateCompiler:
+        return self._compiler
+
+    def get_task_state(self, with_templates: bool = False) -> tuple:
+        """What a worker needs to render this run's files with its own compiler."""
+
+        return (
+            self._settings,
+            self._templates_key,
+            self._compiled_templates if with_templates else None,
+            self._tokens,
+            self._variables,
+        )
+
+    def needs_rendering(self, content: bytes) -> bool:
+        return self._tool_prefix.encode("utf-8") in content
+
+    def get_references(self, content: bytes, file_name: str) -> dict:
+        try:
+            text = content.decode("utf-8")
+        except UnicodeDecodeError:
+            return {}
+
+        return self._compiler.get_references(text, file_name)
+
+    def render_content(self, content: bytes, file_name: str) -> bytes:
+        try:
+            text = content.decode("utf-8")
+        except UnicodeDecodeError:
+            return content
+
+        if self._tool_prefix not in text:
+            return content
+
+        rendered = self._compiler.render(text, self._tokens, self._check, file_name)
+
+        return rendered.encode("utf-8")
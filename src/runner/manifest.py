@@ -0,0 +1,160 @@
+import os
+import json
+import hashlib
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from ..core.enums import Actions
+from .calls import get_call_name
+
+
+MANIFEST_VERSION = "3"
+
+
+def get_manifest_path(cache_dir: str, output_dir: str) -> str:
+    key = hashlib.sha256(os.path.abspath(output_dir).encode("utf-8")).hexdigest()
+
+    return os.path.join(cache_dir, "manifests", f"{key}.json")
+
+
+class Manifest:
+    """What a generation was made of, to regenerate it incrementally."""
+
+    __slots__ = ("tokens", "actions", "path_names", "references", "sources", "outputs")
+
+    def __init__(
+        self,
+        tokens: Dict[str, str],
+        actions: Dict[str, List[str]],
+        path_names: List[str],
+        references: Dict[str, Dict[str, List[Tuple[int, int]]]],
+        sources: Dict[str, List[int]],
+        outputs: List[str],
+    ):
+        self.tokens = tokens
+        self.actions = actions
+        self.path_names = path_names
+        self.references = references
+        self.sources = sources
+        self.outputs = outputs
+
+    @classmethod
+    def from_run(
+        cls,
+        properties: dict,
+        path_names: Set[str],
+        source_references: Dict[str, Dict[str, List[Tuple[int, int]]]],
+        sources: Dict[str, List[int]],
+        outputs: Set[str],
+    ) -> "Manifest":
+        references = {}
+
+        for (source, names) in sorted(source_references.items()):
+            for (name, ranges) in names.items():
+                references.setdefault(name, {})[source] = [
+                    list(byte_range) for byte_range in ranges
+                ]
+
+        return cls(
+            dict(properties["TOKENS"]),
+            _serialize_actions(properties["ACTIONS"]),
+            sorted(path_names),
+            references,
+            dict(sorted(sources.items())),
+            sorted(outputs),
+        )
+
+    def get_changed_names(self, tokens: Dict[str, str]) -> Set[str]:
+        return {
+            name
+            for name in {*self.tokens, *tokens}
+            if self.tokens.get(name) != tokens.get(name)
+        }
+
+    def get_sources_to_update(
+        self,
+        properties: dict,
+        get_fingerprint: Callable[[str], Optional[List[int]]],
+    ) -> Optional[Set[str]]:
+        """Returns the templates using the changed tokens, or ``None`` for all."""
+
+        if _serialize_actions(properties["ACTIONS"]) != self.actions:
+            return None
+
+        changed_names = self.get_changed_names(properties["TOKENS"])
+
+        if changed_names.intersection(self.path_names):
+            return None
+
+        if any(
+            get_fingerprint(source) != fingerprint
+            for (source, fingerprint) in self.sources.items()
+        ):
+            return None
+
+        sources = {
+            source for name in changed_names for source in self.references.get(name, {})
+        }
+
+        # Calls and commands may have changed the rendered files, and re-rendering
+        # only some of them would undo their changes.
+        if sources and (
+            self.actions[Actions.call.value] or self.actions[Actions.cmd.value]
+        ):
+            return None
+
+        return sources
+
+    def as_dict(self) -> dict:
+        return {
+            "version": MANIFEST_VERSION,
+            "tokens": self.tokens,
+            "actions": self.actions,
+            "path_names": self.path_names,
+            "references": self.references,
+            "sources": self.sources,
+            "outputs": self.outputs,
+        }
+
+
+def load_manifest(path: str) -> Optional[Manifest]:
+    try:
+        with open(path) as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return None
+
+    return Manifest(
+        data["tokens"],
+        data["actions"],
+        data["path_names"],
+        data["references"],
+        data["sources"],
+        data["outputs"],
+    )
+
+
+def write_manifest(manifest: Manifest, path: str) -> None:
+    temp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(temp_path, "w") as file:
+            json.dump(manifest.as_dict(), file)
+
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _serialize_actions(actions: dict) -> Dict[str, List[str]]:
+    return {
+        action.value: [
+            get_call_name(item) if action == Actions.call else str(item)
+            for item in actions.get(action, [])
+        ]
+        for action in Actions
+    }
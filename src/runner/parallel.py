@@ -0,0 +1,126 @@
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..renderer import TemplateCompiler
+from .file_renderer import FileRenderer
+
+
+BATCH_MAX_BYTES = 1024 * 1024
+BATCH_MAX_FILES = 64
+
+# Below it, sending the files to the workers and back costs about as much as
+# rendering them in-process (see benchmarks/render.py).
+POOL_MIN_BYTES = 16 * 1024 * 1024
+
+# How many template compilers each worker keeps, one per set of settings.
+WORKER_COMPILERS = 16
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+# How many generations each thread is running.
+_generations: Dict[int, int] = {}
+
+_worker_compilers: Dict[tuple, TemplateCompiler] = {}
+
+
+def create_render_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Returns the process's pool with that many workers, shared by every run."""
+
+    if workers <= 1:
+        return None
+
+    with _pools_lock:
+        pool = _pools.get(workers)
+
+        # Forking while another generation's threads run could leave the
+        # workers with locks held by them, so it's rendered in-process instead.
+        if pool is None and set(_generations) <= {threading.get_ident()}:
+            pool = _start_pool(workers)
+            _pools[workers] = pool
+
+    return pool
+
+
+@contextmanager
+def running_generation() -> Iterator[None]:
+    thread_id = threading.get_ident()
+
+    with _pools_lock:
+        _generations[thread_id] = _generations.get(thread_id, 0) + 1
+
+    try:
+        yield
+    finally:
+        with _pools_lock:
+            _generations[thread_id] -= 1
+
+            if not _generations[thread_id]:
+                del _generations[thread_id]
+
+
+def render_contents(
+    pool: ProcessPoolExecutor,
+    file_renderer: FileRenderer,
+    contents: List[Tuple[bytes, str]],
+) -> List[bytes]:
+    if pool is None:
+        return _render_with(file_renderer, contents)
+
+    rendered = pool.submit(
+        _render_contents, file_renderer.get_task_state(), contents
+    ).result()
+
+    # The worker doesn't have the compiled templates yet, so they're sent along.
+    if rendered is None:
+        rendered = pool.submit(
+            _render_contents, file_renderer.get_task_state(True), contents
+        ).result()
+
+    return rendered
+
+
+def _start_pool(workers: int) -> ProcessPoolExecutor:
+    start_methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in start_methods else None)
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+    # Forks every worker right away, while no other generation is running,
+    # instead of when the first batch is rendered.
+    pool.submit(int).result()
+
+    return pool
+
+
+def _render_contents(
+    state: tuple, contents: List[Tuple[bytes, str]]
+) -> Optional[List[bytes]]:
+    (settings, templates_key, compiled_templates, tokens, variables) = state
+    compiler_key = (settings, templates_key)
+    compiler = _worker_compilers.get(compiler_key)
+
+    if compiler is None:
+        if templates_key is not None and compiled_templates is None:
+            return None
+
+        if len(_worker_compilers) >= WORKER_COMPILERS:
+            _worker_compilers.pop(next(iter(_worker_compilers)))
+
+        compiler = FileRenderer.create_compiler(settings, compiled_templates)
+        _worker_compilers[compiler_key] = compiler
+
+    return _render_with(
+        FileRenderer.from_task_state(settings, tokens, variables, compiler), contents
+    )
+
+
+def _render_with(
+    file_renderer: FileRenderer, contents: List[Tuple[bytes, str]]
+) -> List[bytes]:
+    return [
+        file_renderer.render_content(content, file_name)
+        for (content, file_name) in contents
+    ]
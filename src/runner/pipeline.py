@@ -0,0 +1,226 @@
+import queue
+import threading
+from time import perf_counter
+from typing import Callable, Iterable, List
+
+
+QUEUE_SIZE = 256
+
+_end = object()
+
+
+class Stage:
+    """A pipeline step, yielding any number of items to the next stage."""
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[[any], Iterable],
+        concurrency: int = 1,
+        batch_size: int = 1,
+        batch_weight: Callable[[any], int] = None,
+        batch_max_weight: int = None,
+    ):
+        self.name = name
+        self.function = function
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.batch_weight = batch_weight
+        self.batch_max_weight = batch_max_weight
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_size > 1
+
+
+class StageMetrics:
+    __slots__ = (
+        "name",
+        "concurrency",
+        "items",
+        "busy_time",
+        "max_queue_depth",
+        "_queue_depth_sum",
+        "_queue_samples",
+    )
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.items = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+        self._queue_depth_sum = 0
+        self._queue_samples = 0
+
+    @property
+    def average_queue_depth(self) -> float:
+        if not self._queue_samples:
+            return 0.0
+
+        return self._queue_depth_sum / self._queue_samples
+
+    def merge(self, other: "StageMetrics") -> None:
+        self.items += other.items
+        self.busy_time += other.busy_time
+        self.max_queue_depth = max(self.max_queue_depth, other.max_queue_depth)
+        self._queue_depth_sum += other._queue_depth_sum
+        self._queue_samples += other._queue_samples
+
+    def sample_queue_depth(self, depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        self._queue_depth_sum += depth
+        self._queue_samples += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "concurrency": self.concurrency,
+            "items": self.items,
+            "busy_time": round(self.busy_time, 6),
+            "average_queue_depth": round(self.average_queue_depth, 2),
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.items} items, {self.busy_time:.3f}s busy "
+            f"on {self.concurrency} worker(s), queue depth "
+            f"{self.average_queue_depth:.1f} avg / {self.max_queue_depth} max"
+        )
+
+
+class Pipeline:
+    """Runs the stages on their own threads, connected by bounded queues."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE):
+        self._stages = stages
+        self._queue_size = queue_size
+        self.metrics = [StageMetrics(stage.name, stage.concurrency) for stage in stages]
+
+    def run(self, items: Iterable) -> list:
+        self._queues = [queue.Queue(self._queue_size) for _ in self._stages]
+        self._remaining_workers = [stage.concurrency for stage in self._stages]
+        self._lock = threading.Lock()
+        self._failed = threading.Event()
+        self._errors = []
+        self._results = []
+
+        threads = [threading.Thread(target=self._feed, args=(items,), daemon=True)]
+
+        for (index, stage) in enumerate(self._stages):
+            for _ in range(stage.concurrency):
+                threads.append(
+                    threading.Thread(target=self._work, args=(index,), daemon=True)
+                )
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        return self._results
+
+    def _feed(self, items: Iterable) -> None:
+        try:
+            for item in items:
+                if self._failed.is_set():
+                    break
+
+                self._queues[0].put(item)
+        except Exception as error:
+            self._fail(error)
+        finally:
+            for _ in range(self._stages[0].concurrency):
+                self._queues[0].put(_end)
+
+    def _work(self, index: int) -> None:
+        stage = self._stages[index]
+        metrics = StageMetrics(stage.name, stage.concurrency)
+        finished = False
+
+        while not finished:
+            batch, finished = self._take(stage, self._queues[index], metrics)
+
+            if not batch or self._failed.is_set():
+                continue
+
+            try:
+                self._process(index, stage, batch, metrics)
+            except Exception as error:
+                self._fail(error)
+
+        with self._lock:
+            self.metrics[index].merge(metrics)
+            self._remaining_workers[index] -= 1
+            is_last_worker = self._remaining_workers[index] == 0
+
+        if is_last_worker and index + 1 < len(self._stages):
+            for _ in range(self._stages[index + 1].concurrency):
+                self._queues[index + 1].put(_end)
+
+    def _take(self, stage: Stage, inbox: queue.Queue, metrics: StageMetrics) -> tuple:
+        metrics.sample_queue_depth(inbox.qsize())
+
+        item = inbox.get()
+
+        if item is _end:
+            return [], True
+
+        batch = [item]
+
+        if not stage.batched:
+            return batch, False
+
+        weight = stage.batch_weight(item) if stage.batch_weight else 0
+
+        while len(batch) < stage.batch_size and (
+            stage.batch_max_weight is None or weight < stage.batch_max_weight
+        ):
+            try:
+                item = inbox.get_nowait()
+            except queue.Empty:
+                break
+
+            if item is _end:
+                return batch, True
+
+            batch.append(item)
+            weight += stage.batch_weight(item) if stage.batch_weight else 0
+
+        return batch, False
+
+    def _process(
+        self, index: int, stage: Stage, batch: list, metrics: StageMetrics
+    ) -> None:
+        outbox = self._queues[index + 1] if index + 1 < len(self._stages) else None
+        metrics.items += len(batch)
+
+        start = perf_counter()
+        results = iter(stage.function(batch if stage.batched else batch[0]))
+
+        while True:
+            try:
+                result = next(results)
+            except StopIteration:
+                metrics.busy_time += perf_counter() - start
+                return
+
+            metrics.busy_time += perf_counter() - start
+
+            if outbox is None:
+                self._results.append(result)
+            else:
+                outbox.put(result)
+
+            start = perf_counter()
+
+    def _fail(self, error: Exception) -> None:
+        with self._lock:
+            self._errors.append(error)
+
+        self._failed.set()
@@ -0,0 +1,64 @@
+import os
+from typing import List, Tuple
+from ..core.enums import FileActions
+from .entry import Entry
+
+
+def build_plan(
+    entries: List[Entry],
+    skipped: List[Tuple[str, bool]],
+    commands: list,
+    calls: List[str],
+    root_dir: str,
+    output_dir: str,
+) -> dict:
+    directories = []
+    files = []
+    totals = {
+        action.value: {"files": 0, "bytes": 0}
+        for action in FileActions
+        if action != FileActions.mkdir
+    }
+
+    for entry in entries:
+        destination = os.path.relpath(entry.destination_path, output_dir)
+
+        if entry.action == FileActions.mkdir:
+            directories.append(destination)
+            continue
+
+        files.append(
+            {
+                "source": os.path.relpath(entry.source_path, root_dir),
+                "destination": destination,
+                "action": entry.action.value,
+                "bytes": entry.size,
+            }
+        )
+
+        totals[entry.action.value]["files"] += 1
+        totals[entry.action.value]["bytes"] += entry.size
+
+    return {
+        "output_dir": output_dir,
+        "directories": directories,
+        "files": files,
+        "skipped": [
+            {
+                "source": os.path.relpath(source_path, root_dir),
+                "type": "directory" if is_dir else "file",
+            }
+            for (source_path, is_dir) in skipped
+        ],
+        "commands": [str(command) for command in commands],
+        "calls": calls,
+        "totals": {
+            "directories": len(directories),
+            "files": len(files),
+            "bytes": sum(file["bytes"] for file in files),
+            "skipped": len(skipped),
+            "commands": len(commands),
+            "calls": len(calls),
+            **totals,
+        },
+    }
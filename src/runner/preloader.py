@@ -0,0 +1,109 @@
+import os
+import queue
+import threading
+from itertools import count
+from ..core.interfaces import PathEntry
+from .parallel import running_generation
+from .tree_index import TreeIndex
+
+
+PRELOAD_MAX_BYTES = 64 * 1024 * 1024
+PREFETCH_MAX_BYTES = 256 * 1024 * 1024
+
+# Included paths go before the speculative ones, and the end of the work last.
+_INCLUDED, _SPECULATIVE, _END = range(3)
+
+
+class TreePreloader:
+    """Reads the included subtrees in the background while the rules are asked."""
+
+    def __init__(
+        self,
+        tree_index: TreeIndex,
+        root_dir: str,
+        max_bytes: int = PRELOAD_MAX_BYTES,
+        prefetch_max_bytes: int = PREFETCH_MAX_BYTES,
+    ):
+        self._tree_index = tree_index
+        self._root_dir = os.path.abspath(root_dir)
+        self._max_bytes = max_bytes
+        self._prefetch_max_bytes = prefetch_max_bytes
+        self._queue = queue.PriorityQueue()
+        self._order = count()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._work, daemon=True)
+        self.preloaded_bytes = 0
+        self.prefetched_bytes = 0
+
+        self._thread.start()
+
+    def add(self, include_path: str) -> None:
+        self._queue.put((_INCLUDED, next(self._order), include_path))
+
+    def prefetch(self, include_path: str) -> None:
+        self._queue.put((_SPECULATIVE, next(self._order), include_path))
+
+    def finish(self) -> None:
+        """Waits for every added include to be preloaded."""
+
+        self._queue.put((_END, next(self._order), None))
+        self._thread.join()
+
+    def stop(self) -> None:
+        """Stops preloading, keeping what was already preloaded."""
+
+        self._stopped.set()
+        self.finish()
+
+    def cancel(self) -> None:
+        self.stop()
+        self._tree_index.discard_preloaded()
+
+    def _work(self) -> None:
+        with running_generation():
+            self._process_queue()
+
+    def _process_queue(self) -> None:
+        while True:
+            (kind, _, include_path) = self._queue.get()
+
+            if kind == _END:
+                return
+
+            if self._stopped.is_set():
+                continue
+
+            path = os.path.normpath(os.path.join(self._root_dir, include_path))
+
+            try:
+                for entry in self._walk(path):
+                    if kind == _INCLUDED:
+                        self._preload(entry)
+                    else:
+                        self._prefetch(entry)
+            except OSError:
+                # The generation reports the paths it can't read by itself.
+                continue
+
+    def _walk(self, path: str):
+        root_entry = self._tree_index.lookup(path)
+        pending = [root_entry] if root_entry is not None else []
+
+        while pending and not self._stopped.is_set():
+            entry = pending.pop()
+
+            if entry.is_dir:
+                pending.extend(self._tree_index.list_dir(entry.path))
+            elif not entry.is_symlink:
+                yield entry
+
+    def _preload(self, entry: PathEntry) -> None:
+        if self.preloaded_bytes + entry.size <= self._max_bytes:
+            self.preloaded_bytes += self._tree_index.preload(entry.path)
+
+    def _prefetch(self, entry: PathEntry) -> None:
+        if self.prefetched_bytes + entry.size > self._prefetch_max_bytes:
+            return
+
+        self._tree_index.warm(entry.path)
+        self.prefetched_bytes += entry.size
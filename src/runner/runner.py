@@ -0,0 +1,519 @@
+import os
+import threading
+from typing import Iterable, Iterator, List, Optional
+from ..core.enums import Actions, FileActions
+from ..core.errors import RunnerErrorMessages as messages, ValueError, CopyError
+from ..core.interfaces import FileHandler, PathEntry
+from ..file_handler import local_file_handler
+from ..renderer import PathRenderer, TemplateCompiler
+from .calls import CallContext, get_call_name, run_calls
+from .entry import Entry
+from .file_renderer import FileRenderer
+from .manifest import Manifest, get_manifest_path, load_manifest, write_manifest
+from .parallel import (
+    BATCH_MAX_BYTES,
+    BATCH_MAX_FILES,
+    POOL_MIN_BYTES,
+    create_render_pool,
+    render_contents,
+    running_generation,
+)
+from .pipeline import Pipeline, Stage, StageMetrics, QUEUE_SIZE
+from .scheduler import CommandScheduler
+from .subtrees import plan_subtrees
+from .tree_index import TreeIndex
+from .plan import build_plan
+
+
+BINARY_EXTENSIONS = {
+    *[".png", ".jpg", ".jpeg", ".gif", ".ico", ".webp", ".bmp", ".pdf"],
+    *[".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".tar", ".jar", ".whl"],
+    *[".woff", ".woff2", ".ttf", ".otf", ".eot", ".mp3", ".mp4", ".wav"],
+    *[".so", ".dll", ".dylib", ".exe", ".pyc", ".class", ".bin", ".sqlite"],
+}
+
+DEFAULT_CONCURRENCY = {
+    "walk": 1,
+    "filter": 1,
+    "classify": 1,
+    "read": 4,
+    "render": 1,
+    "write": 4,
+    "cmd": 4,
+}
+
+
+class Runner:
+    def __init__(
+        self,
+        properties: dict,
+        root_dir: str,
+        output_dir: str,
+        cache_dir: str = None,
+        workers: int = 1,
+        concurrency: dict = None,
+        queue_size: int = QUEUE_SIZE,
+        tree_index: TreeIndex = None,
+        template_compiler: TemplateCompiler = None,
+        compiled_templates: dict = None,
+        incremental: bool = False,
+        shell_session: bool = False,
+        file_handler: FileHandler = None,
+        excluded_paths: Iterable[str] = (),
+    ):
+        self._properties = properties
+        self._root_dir = os.path.abspath(root_dir)
+        self._output_dir = os.path.normpath(os.path.join(self._root_dir, output_dir))
+        self._workers = workers
+        self._concurrency = {
+            **DEFAULT_CONCURRENCY,
+            "render": max(1, workers),
+            **(concurrency or {}),
+        }
+        self._queue_size = queue_size
+        # Including the starters root must not copy the tool's own files.
+        self._excluded_paths = {
+            os.path.normpath(os.path.join(self._root_dir, path))
+            for path in [self._output_dir, *([cache_dir] if cache_dir else [])]
+            + list(excluded_paths)
+        }
+        self._shell_session = shell_session
+        self._cache_dir = cache_dir
+        self._render_pool = None
+        self._created_dirs = set()
+        self._skipped = []
+        self._file_handler = file_handler or local_file_handler
+        self._tree_index = tree_index or TreeIndex(self._file_handler)
+        self._manifest_path = (
+            get_manifest_path(cache_dir, self._output_dir)
+            if incremental and cache_dir
+            else None
+        )
+        self._sources_to_update = None
+        self._path_names = set()
+        self._references = {}
+        self._sources = {}
+        self._outputs = set()
+        self._destinations = {}
+        self._lock = threading.Lock()
+        self.metrics: List[StageMetrics] = []
+
+        self._file_renderer = FileRenderer(
+            properties["TOOL_PREFIX"],
+            properties["COMMENT_DELIMITERS"],
+            properties["TOKENS"],
+            properties["VARIABLES"],
+            cache_dir,
+            template_compiler,
+            compiled_templates,
+        )
+        self._path_renderer = PathRenderer(
+            properties["TOOL_PREFIX"],
+            properties["TOKENS"],
+            self._file_renderer.check,
+        )
+
+    @property
+    def template_compiler(self) -> TemplateCompiler:
+        return self._file_renderer.compiler
+
+    def plan(self) -> dict:
+        entries = []
+
+        for include_path in self._get_subtrees():
+            for walked_entry in self._walk(include_path):
+                for filtered_entry in self._filter(walked_entry):
+                    entries.extend(self._classify(filtered_entry))
+
+        return build_plan(
+            entries,
+            self._skipped,
+            self._properties["ACTIONS"][Actions.cmd],
+            [
+                get_call_name(function)
+                for function in self._properties["ACTIONS"][Actions.call]
+            ],
+            self._root_dir,
+            self._output_dir,
+        )
+
+    def run(self) -> None:
+        with running_generation():
+            previous_manifest = (
+                load_manifest(self._manifest_path) if self._manifest_path else None
+            )
+
+            if previous_manifest is not None and os.path.isdir(self._output_dir):
+                self._sources_to_update = previous_manifest.get_sources_to_update(
+                    self._properties, self._get_fingerprint
+                )
+
+            if self._sources_to_update != set():
+                self._generate()
+
+            if self._sources_to_update is None and previous_manifest is not None:
+                self._remove_stale_outputs(previous_manifest.outputs)
+
+            self._file_handler.createDirectory(self._output_dir)
+
+            if self._sources_to_update is None:
+                run_calls(
+                    self._properties["ACTIONS"][Actions.call],
+                    CallContext(
+                        self._root_dir,
+                        self._output_dir,
+                        dict(self._properties["TOKENS"]),
+                    ),
+                    self._properties["VARIABLES"],
+                )
+                CommandScheduler(
+                    self._properties["ACTIONS"][Actions.cmd],
+                    self._output_dir,
+                    self._concurrency["cmd"],
+                    self._shell_session,
+                    self._cache_dir,
+                ).run()
+
+            if self._manifest_path:
+                self._write_manifest(previous_manifest)
+
+    def _generate(self) -> None:
+        if self._workers > 1 and self._is_worth_a_pool():
+            self._render_pool = create_render_pool(self._workers)
+
+        pipeline = self._create_pipeline()
+        pipeline.run(self._get_subtrees())
+        self.metrics = pipeline.metrics
+
+    def _is_worth_a_pool(self) -> bool:
+        if self._sources_to_update is not None:
+            entries = [
+                self._tree_index.lookup(os.path.join(self._root_dir, source))
+                for source in self._sources_to_update
+            ]
+
+            return sum(entry.size for entry in entries if entry) > POOL_MIN_BYTES
+
+        # The listings are cached, so the pipeline doesn't scan them again.
+        pending = [
+            self._tree_index.lookup(
+                os.path.normpath(os.path.join(self._root_dir, include_path))
+            )
+            for include_path in self._get_subtrees()
+        ]
+        files_size = 0
+
+        while pending:
+            entry = pending.pop()
+
+            if entry is None or entry.path in self._excluded_paths:
+                continue
+
+            if entry.is_dir:
+                pending.extend(self._tree_index.list_dir(entry.path))
+                continue
+
+            files_size += entry.size
+
+            if files_size > POOL_MIN_BYTES:
+                return True
+
+        return False
+
+    def _get_subtrees(self) -> List[str]:
+        return plan_subtrees(
+            self._root_dir, self._properties["ACTIONS"][Actions.include]
+        )
+
+    def _create_pipeline(self) -> Pipeline:
+        concurrency = self._concurrency
+
+        return Pipeline(
+            [
+                Stage("walk", self._walk, concurrency["walk"]),
+                Stage("filter", self._filter, concurrency["filter"]),
+                Stage("classify", self._classify, concurrency["classify"]),
+                Stage("read", self._read, concurrency["read"]),
+                Stage(
+                    "render",
+                    self._render,
+                    concurrency["render"],
+                    batch_size=BATCH_MAX_FILES,
+                    batch_weight=lambda entry: entry.size,
+                    batch_max_weight=BATCH_MAX_BYTES,
+                ),
+                Stage("write", self._write, concurrency["write"]),
+            ],
+            self._queue_size,
+        )
+
+    def _walk(self, include_path: str) -> Iterator[Entry]:
+        source_path = os.path.normpath(os.path.join(self._root_dir, include_path))
+
+        root_entry = self._tree_index.lookup(source_path)
+
+        if root_entry is None:
+            raise ValueError(messages.included_path_not_found(include_path))
+
+        if source_path in self._excluded_paths:
+            return
+
+        relative_path = os.path.relpath(source_path, self._root_dir)
+        destination = self._path_renderer.render_path(relative_path)
+        self._index_source(root_entry)
+
+        for segment in relative_path.split(os.path.sep):
+            self._index_path_names(segment)
+
+        if destination is None:
+            self._skip(source_path, root_entry.is_dir)
+            return
+
+        destination = self._check_destination(
+            os.path.join(self._output_dir, destination)
+        )
+
+        if not root_entry.is_dir:
+            yield Entry(
+                source_path,
+                os.path.basename(destination),
+                os.path.dirname(destination),
+                root_entry.size,
+                is_symlink=root_entry.is_symlink,
+                destination_path=destination,
+            )
+            return
+
+        pending_dirs = [(source_path, destination)]
+
+        while pending_dirs:
+            current_source, current_destination = pending_dirs.pop()
+
+            yield Entry(
+                current_source,
+                os.path.basename(current_destination),
+                os.path.dirname(current_destination),
+                is_dir=True,
+                destination_path=current_destination,
+            )
+
+            for entry in self._tree_index.list_dir(current_source):
+                if entry.path in self._excluded_paths:
+                    continue
+
+                self._index_source(entry)
+
+                if entry.is_dir:
+                    rendered = self._path_renderer.render_segment(entry.name)
+                    self._index_path_names(entry.name)
+
+                    if rendered is None:
+                        self._skip(entry.path, True)
+                    else:
+                        pending_dirs.append(
+                            (
+                                entry.path,
+                                self._check_destination(
+                                    os.path.join(current_destination, rendered)
+                                ),
+                            )
+                        )
+                    continue
+
+                yield Entry(
+                    entry.path,
+                    entry.name,
+                    current_destination,
+                    entry.size,
+                    is_symlink=entry.is_symlink,
+                )
+
+    def _filter(self, entry: Entry) -> Iterator[Entry]:
+        if self._sources_to_update is not None and (
+            entry.is_dir
+            or os.path.relpath(entry.source_path, self._root_dir)
+            not in self._sources_to_update
+        ):
+            return
+
+        if entry.destination_path is None:
+            rendered = self._path_renderer.render_segment(entry.name)
+            self._index_path_names(entry.name)
+
+            if rendered is None:
+                self._skip(entry.source_path, False)
+                return
+
+            entry.destination_path = self._check_destination(
+                os.path.join(entry.destination_dir, rendered)
+            )
+
+        self._check_conflicts(entry)
+
+        yield entry
+
+    def _classify(self, entry: Entry) -> Iterator[Entry]:
+        if entry.is_dir:
+            entry.action = FileActions.mkdir
+        elif entry.is_symlink:
+            entry.action = FileActions.link
+        elif os.path.splitext(entry.name)[1].lower() in BINARY_EXTENSIONS:
+            entry.action = FileActions.copy
+        else:
+            entry.action = FileActions.render
+
+        yield entry
+
+    def _read(self, entry: Entry) -> Iterator[Entry]:
+        if entry.action == FileActions.render:
+            try:
+                entry.content = self._tree_index.read(entry.source_path)
+            except OSError:
+                raise CopyError(
+                    messages.failed_to_process_file(entry.source_path)
+                ) from None
+
+            if not self._file_renderer.needs_rendering(entry.content):
+                entry.action = FileActions.copy
+
+            elif self._manifest_path:
+                self._references[
+                    os.path.relpath(entry.source_path, self._root_dir)
+                ] = self._file_renderer.get_references(entry.content, entry.source_path)
+
+        yield entry
+
+    def _render(self, entries: List[Entry]) -> Iterator[Entry]:
+        to_render = [entry for entry in entries if entry.action == FileActions.render]
+
+        if to_render:
+            rendered_contents = render_contents(
+                self._render_pool,
+                self._file_renderer,
+                [(entry.content, entry.source_path) for entry in to_render],
+            )
+
+            for (entry, content) in zip(to_render, rendered_contents):
+                entry.content = content
+
+        yield from entries
+
+    def _write(self, entry: Entry) -> Iterator[Entry]:
+        destination_path = entry.destination_path
+
+        if self._manifest_path:
+            self._index_output(destination_path)
+
+        try:
+            if entry.action == FileActions.mkdir:
+                self._create_dir(destination_path)
+                yield entry
+                return
+
+            self._create_dir(entry.destination_dir)
+
+            if entry.action == FileActions.link:
+                self._file_handler.create_link(
+                    self._tree_index.readlink(entry.source_path), destination_path
+                )
+
+            elif entry.content is None:
+                self._tree_index.copy_file(entry.source_path, destination_path)
+
+            else:
+                self._file_handler.write_bytes(destination_path, entry.content)
+                self._tree_index.copy_mode(entry.source_path, destination_path)
+        except OSError:
+            raise CopyError(
+                messages.failed_to_process_file(entry.source_path)
+            ) from None
+
+        entry.content = None
+
+        yield entry
+
+    def _index_path_names(self, segment: str) -> None:
+        if self._manifest_path and self._properties["TOOL_PREFIX"] in segment:
+            names = self._path_renderer.get_references(segment)
+
+            with self._lock:
+                self._path_names.update(names)
+
+    def _index_source(self, entry: PathEntry) -> None:
+        if self._manifest_path:
+            self._sources[os.path.relpath(entry.path, self._root_dir)] = [
+                entry.size,
+                entry.modified,
+            ]
+
+    def _index_output(self, destination_path: str) -> None:
+        output = os.path.relpath(destination_path, self._output_dir)
+
+        if output != os.curdir:
+            with self._lock:
+                self._outputs.add(output)
+
+    def _get_fingerprint(self, source: str) -> Optional[List[int]]:
+        entry = self._tree_index.lookup(os.path.join(self._root_dir, source))
+
+        return None if entry is None else [entry.size, entry.modified]
+
+    def _write_manifest(self, previous_manifest: Manifest) -> None:
+        if self._sources_to_update is None:
+            manifest = Manifest.from_run(
+                self._properties,
+                self._path_names,
+                self._references,
+                self._sources,
+                self._outputs,
+            )
+        else:
+            manifest = previous_manifest
+            manifest.tokens = dict(self._properties["TOKENS"])
+
+        write_manifest(manifest, self._manifest_path)
+
+    def _remove_stale_outputs(self, previous_outputs: List[str]) -> None:
+        # Children sort after their parents, so they're removed first.
+        for output in sorted(set(previous_outputs) - self._outputs, reverse=True):
+            try:
+                self._file_handler.remove(os.path.join(self._output_dir, output))
+            except OSError:
+                # Already gone, or a directory still holding other files.
+                pass
+
+    def _check_destination(self, path: str) -> str:
+        normalized_path = os.path.normpath(path)
+
+        if normalized_path != self._output_dir and not normalized_path.startswith(
+            self._output_dir + os.path.sep
+        ):
+            raise ValueError(messages.destination_outside_output(path))
+
+        return path
+
+    def _check_conflicts(self, entry: Entry) -> None:
+        destination_path = os.path.normpath(entry.destination_path)
+
+        with self._lock:
+            (other_source, other_is_dir) = self._destinations.setdefault(
+                destination_path, (entry.source_path, entry.is_dir)
+            )
+
+        # Directories are merged, but anything else would overwrite the other.
+        if other_source != entry.source_path and not (other_is_dir and entry.is_dir):
+            raise ValueError(
+                messages.conflicting_destination(
+                    os.path.relpath(destination_path, self._output_dir),
+                    os.path.relpath(other_source, self._root_dir),
+                    os.path.relpath(entry.source_path, self._root_dir),
+                )
+            )
+
+    def _skip(self, source_path: str, is_dir: bool) -> None:
+        self._skipped.append((source_path, is_dir))
+
+    def _create_dir(self, path: str) -> None:
+        if path not in self._created_dirs:
+            self._file_handler.createDirectory(path)
+            self._created_dirs.add(path)
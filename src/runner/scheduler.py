@@ -0,0 +1,261 @@
+import os
+import signal
+import threading
+import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from ..core.errors import RunnerErrorMessages as messages, ValueError
+from ..interaction import cli
+from .command_cache import CommandCache
+from .shell_session import ShellSession
+
+
+class CommandResult(NamedTuple):
+    command: str
+    return_code: Optional[int]
+    output: str
+    duration: float
+    cached: bool = False
+
+    @property
+    def timed_out(self) -> bool:
+        return self.return_code is None
+
+
+class CommandScheduler:
+    """Runs the commands as a DAG of their dependencies."""
+
+    def __init__(
+        self,
+        commands: List[str],
+        cwd: str,
+        concurrency: int = 1,
+        shell_session: bool = False,
+        cache_dir: str = None,
+    ):
+        self._commands = list(commands)
+        self._cwd = cwd
+        self._concurrency = max(1, concurrency)
+        self._shell_session = shell_session
+        self._cache = CommandCache(cache_dir) if cache_dir else None
+        self._local = threading.local()
+        self._sessions: List[ShellSession] = []
+        self._lock = threading.Lock()
+        self._dependencies = self._resolve_dependencies()
+        self._dependents = self._get_dependents()
+        self._resources = [
+            frozenset(getattr(command, "resources", ())) for command in self._commands
+        ]
+        self.results: List[CommandResult] = []
+
+    def run(self) -> None:
+        try:
+            self._schedule()
+        finally:
+            for session in self._sessions:
+                session.close()
+
+    def _schedule(self) -> None:
+        pending = list(range(len(self._commands)))
+        succeeded = set()
+        running = {}
+        failures = []
+
+        with ThreadPoolExecutor(self._concurrency) as executor:
+            while pending or running:
+                for index in self._get_ready(pending, succeeded, running):
+                    pending.remove(index)
+                    future = executor.submit(self._execute, self._commands[index])
+                    running[future] = index
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = running.pop(future)
+                    result = future.result()
+                    self.results.append(result)
+                    self._show(result)
+
+                    if result.return_code == 0:
+                        succeeded.add(index)
+                    else:
+                        failures.append(result)
+                        self._skip_dependents(index, pending)
+
+        if failures:
+            raise ValueError(_get_failure_message(failures[0]))
+
+    def _resolve_dependencies(self) -> List[Set[int]]:
+        indexes_by_name: Dict[str, List[int]] = {}
+
+        for (index, command) in enumerate(self._commands):
+            for name in {str(command), getattr(command, "name", str(command))}:
+                indexes_by_name.setdefault(name, []).append(index)
+
+        dependencies = []
+
+        for (index, command) in enumerate(self._commands):
+            after = getattr(command, "after", None)
+
+            if after is None:
+                dependencies.append({index - 1} if index else set())
+                continue
+
+            # The commands of the rules that weren't selected never run, so
+            # the ones depending on them don't wait for them.
+            dependencies.append(
+                {
+                    dependency
+                    for name in after
+                    for dependency in indexes_by_name.get(name, ())
+                    if dependency != index
+                }
+            )
+
+        self._check_cycles(dependencies)
+
+        return dependencies
+
+    def _check_cycles(self, dependencies: List[Set[int]]) -> None:
+        remaining = {
+            index: set(indexes) for (index, indexes) in enumerate(dependencies)
+        }
+
+        while remaining:
+            free = [index for (index, indexes) in remaining.items() if not indexes]
+
+            if not free:
+                commands = [str(self._commands[index]) for index in sorted(remaining)]
+                raise ValueError(messages.command_dependency_cycle(commands))
+
+            for index in free:
+                del remaining[index]
+
+            for indexes in remaining.values():
+                indexes.difference_update(free)
+
+    def _get_dependents(self) -> List[Set[int]]:
+        dependents = [set() for _ in self._commands]
+
+        for (index, dependencies) in enumerate(self._dependencies):
+            for dependency in dependencies:
+                dependents[dependency].add(index)
+
+        return dependents
+
+    def _get_ready(self, pending: List[int], succeeded: set, running: dict) -> list:
+        held_resources = set()
+
+        for index in running.values():
+            held_resources.update(self._resources[index])
+
+        ready = []
+
+        for index in pending:
+            if len(running) + len(ready) >= self._concurrency:
+                break
+
+            if self._dependencies[index] <= succeeded and not (
+                self._resources[index] & held_resources
+            ):
+                ready.append(index)
+                held_resources.update(self._resources[index])
+
+        return ready
+
+    def _skip_dependents(self, failed_index: int, pending: List[int]) -> None:
+        to_skip = list(self._dependents[failed_index])
+
+        while to_skip:
+            index = to_skip.pop()
+
+            if index in pending:
+                pending.remove(index)
+                cli.show(f"$ {self._commands[index]} (skipped)")
+                to_skip.extend(self._dependents[index])
+
+    def _execute(self, command: str) -> CommandResult:
+        start = perf_counter()
+        key = self._cache.get_key(command, self._cwd) if self._cache else None
+
+        if key is not None and self._cache.restore(key, command, self._cwd):
+            return CommandResult(command, 0, "", perf_counter() - start, cached=True)
+
+        if self._shell_session and getattr(command, "timeout", None) is None:
+            return_code, output = self._get_session().run(command)
+        else:
+            return_code, output = self._run_process(command)
+
+        if key is not None and return_code == 0:
+            self._cache.store(key, command, self._cwd)
+
+        return CommandResult(
+            command,
+            return_code,
+            output.decode("utf-8", errors="replace"),
+            perf_counter() - start,
+        )
+
+    def _get_session(self) -> ShellSession:
+        session = getattr(self._local, "session", None)
+
+        if session is None or not session.alive:
+            session = ShellSession(self._cwd)
+            self._local.session = session
+
+            with self._lock:
+                self._sessions.append(session)
+
+        return session
+
+    def _run_process(self, command: str) -> Tuple[Optional[int], bytes]:
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=self._cwd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+        try:
+            output, _ = process.communicate(timeout=getattr(command, "timeout", None))
+            return_code = process.returncode
+        except subprocess.TimeoutExpired:
+            _kill(process)
+            output, _ = process.communicate()
+            return_code = None
+
+        return return_code, output
+
+    def _show(self, result: CommandResult) -> None:
+        status = "cached" if result.cached else f"{result.duration:.1f}s"
+
+        cli.show(f"$ {result.command} ({status})")
+
+        if result.output:
+            cli.show(result.output.rstrip("\n"))
+
+
+def _kill(process: subprocess.Popen) -> None:
+    # The whole process group, so the shell's children are killed as well.
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+
+    process.kill()
+
+
+def _get_failure_message(result: CommandResult) -> str:
+    if result.timed_out:
+        return messages.command_timed_out(result.command, result.command.timeout)
+
+    return messages.command_failed(result.command, result.return_code)
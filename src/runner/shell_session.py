@@ -0,0 +1,60 @@
+import shlex
+import secrets
+import subprocess
+from typing import Tuple
+
+
+class ShellSession:
+    """A persistent ``sh`` process that runs one command at a time."""
+
+    def __init__(self, cwd: str):
+        self._marker = f"__cakeslicer_{secrets.token_hex(8)}__".encode("ascii")
+        self._process = subprocess.Popen(
+            ["/bin/sh"],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._process.poll() is None
+
+    def run(self, command: str) -> Tuple[int, bytes]:
+        """Returns the command's exit status and output."""
+
+        marker = self._marker.decode("ascii")
+        script = (
+            f"(eval {shlex.quote(str(command))}) </dev/null 2>&1\n"
+            f"printf '\\n{marker} %d\\n' $?\n"
+        )
+
+        try:
+            self._process.stdin.write(script.encode("utf-8"))
+            self._process.stdin.flush()
+        except OSError:
+            return self._get_exit_status(), b""
+
+        output = bytearray()
+
+        for line in self._process.stdout:
+            if line.startswith(self._marker):
+                # Drops the line break printed before the marker.
+                return int(line.split()[1]), bytes(output[:-1])
+
+            output += line
+
+        return self._get_exit_status(), bytes(output)
+
+    def _get_exit_status(self) -> int:
+        return self._process.wait() or 1
+
+    def close(self) -> None:
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+
+        self._process.wait()
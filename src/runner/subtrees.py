@@ -0,0 +1,38 @@
+import os
+from typing import List
+from ..core.errors import RunnerErrorMessages as messages, ValueError
+
+
+def plan_subtrees(root_dir: str, include_paths: List[str]) -> List[str]:
+    root_dir = os.path.normpath(root_dir)
+    planned = {}
+
+    for include_path in include_paths:
+        full_path = os.path.normpath(os.path.join(root_dir, include_path))
+
+        # Its files would be written outside the output directory.
+        if full_path != root_dir and not _is_inside(full_path, root_dir):
+            raise ValueError(messages.included_path_outside_root(include_path))
+
+        planned.setdefault(full_path, include_path)
+
+    sorted_paths = sorted(planned, key=lambda path: path.split(os.path.sep))
+    kept_paths = set()
+    last_kept = None
+
+    for full_path in sorted_paths:
+        if last_kept is not None and _is_inside(full_path, last_kept):
+            continue
+
+        kept_paths.add(full_path)
+        last_kept = full_path
+
+    return [
+        include_path
+        for (full_path, include_path) in planned.items()
+        if full_path in kept_paths
+    ]
+
+
+def _is_inside(path: str, parent: str) -> bool:
+    return path.startswith(parent.rstrip(os.path.sep) + os.path.sep)
@@ -0,0 +1,62 @@
+from typing import List, Optional
+from ..core.interfaces import FileHandler, PathEntry
+from ..file_handler import local_file_handler
+
+
+class TreeIndex:
+    """Caches the listings and preloaded files of the template tree."""
+
+    def __init__(self, file_handler: FileHandler = None):
+        self._file_handler = file_handler or local_file_handler
+        self._listings = {}
+        self._preloaded = {}
+
+    def list_dir(self, path: str) -> List[PathEntry]:
+        listing = self._listings.get(path)
+
+        if listing is None:
+            listing = self._file_handler.list_directory(path)
+            self._listings[path] = listing
+
+        return listing
+
+    def lookup(self, path: str) -> Optional[PathEntry]:
+        return self._file_handler.lookup(path)
+
+    def read(self, path: str) -> bytes:
+        content = self._preloaded.pop(path, None)
+
+        if content is not None:
+            return content
+
+        return self._file_handler.read_bytes(path)
+
+    def preload(self, path: str) -> int:
+        if path in self._preloaded:
+            return 0
+
+        content = self._file_handler.read_bytes(path)
+        self._preloaded[path] = content
+
+        return len(content)
+
+    def warm(self, path: str) -> None:
+        self._file_handler.warm(path)
+
+    def discard_preloaded(self) -> None:
+        self._preloaded.clear()
+
+    def readlink(self, path: str) -> str:
+        return self._file_handler.read_link(path)
+
+    def copy_file(self, path: str, destination_path: str) -> None:
+        content = self._preloaded.pop(path, None)
+
+        if content is None:
+            self._file_handler.copy_contents(path, destination_path)
+        else:
+            self._file_handler.write_bytes(destination_path, content)
+            self._file_handler.copy_mode(path, destination_path)
+
+    def copy_mode(self, path: str, destination_path: str) -> None:
+        self._file_handler.copy_mode(path, destination_path)
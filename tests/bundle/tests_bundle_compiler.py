@@ -0,0 +1,155 @@
+import os
+import shutil
+import pytest
+from cakeslicer.src.bundle import (
+    BundleCompiler,
+    BundleIndex,
+    get_bundle_fingerprint,
+    load_bundle,
+    write_bundle,
+)
+from cakeslicer.src.core.enums import Actions
+from cakeslicer.src.core.errors import (
+    BundleErrorMessages as messages,
+    TemplateError,
+    ValueError,
+)
+from cakeslicer.src.runner import Runner
+from cakeslicer.tests.conftest import create_file
+
+
+TOKEN_NAMES = ["project_slug", "use_cache"]
+
+
+def compile_bundle(root_dir: str, include_paths: list) -> dict:
+    return BundleCompiler("cakeslicer", ["#"], TOKEN_NAMES, TOKEN_NAMES).compile(
+        root_dir, include_paths
+    )
+
+
+def test_compile_snapshots_the_included_subtrees(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "main.py"), "cakeslicer_project_slug\n"
+    )
+    create_file(os.path.join(root_dir, "starter", "static", "style.css"), "body {}\n")
+    create_file(os.path.join(root_dir, "other", "ignored.py"))
+
+    bundle = compile_bundle(root_dir, ["./starter"])
+
+    assert sorted(bundle["entries"]) == [
+        "starter",
+        os.path.join("starter", "main.py"),
+        os.path.join("starter", "static"),
+        os.path.join("starter", "static", "style.css"),
+    ]
+    assert bundle["contents"][os.path.join("starter", "main.py")] == (
+        b"cakeslicer_project_slug\n"
+    )
+    assert len(bundle["templates"]) == 1
+
+
+def test_compile_reports_every_undefined_reference(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "main.py"),
+        "cakeslicer_project_name\n"
+        "# cakeslicer_if use_redis\n"
+        "import redis\n"
+        "# cakeslicer_endif\n",
+    )
+    create_file(os.path.join(root_dir, "starter", "{cakeslicer_if use_db}db", "a"))
+
+    with pytest.raises(TemplateError) as error:
+        compile_bundle(root_dir, ["./starter"])
+
+    assert error.value.message == messages.undefined_references(
+        [
+            (os.path.join("starter", "main.py"), "cakeslicer_project_name"),
+            (os.path.join("starter", "main.py"), "use_redis"),
+            (os.path.join("starter", "{cakeslicer_if use_db}db"), "use_db"),
+        ]
+    )
+
+
+def test_compile_leaves_the_excluded_paths_out_of_a_root_include(tmp_path):
+    root_dir = str(tmp_path)
+
+    for name in ["output/a.py", "cache/b.py", "cakeslicer.py", "cakeslicer.bundle"]:
+        create_file(os.path.join(root_dir, name))
+
+    create_file(os.path.join(root_dir, "starter", "main.py"))
+
+    bundle = BundleCompiler(
+        "cakeslicer",
+        ["#"],
+        TOKEN_NAMES,
+        TOKEN_NAMES,
+        excluded_paths=["output", "cache", "cakeslicer.py", "cakeslicer.bundle"],
+    ).compile(root_dir, ["./"])
+
+    assert sorted(bundle["entries"]) == [
+        ".",
+        "starter",
+        os.path.join("starter", "main.py"),
+    ]
+    assert bundle["listings"]["."] == ["starter"]
+
+
+def test_runner_generates_from_the_bundle_without_the_starters(tmp_path):
+    root_dir = str(tmp_path)
+    bundle_path = os.path.join(root_dir, "cakeslicer.bundle")
+
+    create_file(
+        os.path.join(root_dir, "starter", "main.py"), "cakeslicer_project_slug\n"
+    )
+    os.symlink("main.py", os.path.join(root_dir, "starter", "link.py"))
+
+    fingerprint = get_bundle_fingerprint(
+        "cakeslicer", ["#"], TOKEN_NAMES, ["./starter"]
+    )
+    write_bundle(compile_bundle(root_dir, ["./starter"]), bundle_path)
+    shutil.rmtree(os.path.join(root_dir, "starter"))
+
+    bundle = load_bundle(bundle_path, fingerprint)
+    properties = {
+        "COMMENT_DELIMITERS": ["#"],
+        "TOOL_PREFIX": "cakeslicer",
+        "VARIABLES": {"project_slug": "my_project", "use_cache": False},
+        "TOKENS": {"project_slug": "my_project", "use_cache": "False"},
+        "ACTIONS": {Actions.include: ["./starter"], Actions.cmd: [], Actions.call: []},
+    }
+
+    Runner(
+        properties,
+        root_dir,
+        "./output",
+        tree_index=BundleIndex(bundle, root_dir),
+        compiled_templates=bundle["templates"],
+    ).run()
+
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    with open(os.path.join(output_dir, "main.py")) as file:
+        assert file.read() == "my_project\n"
+
+    assert os.readlink(os.path.join(output_dir, "link.py")) == "main.py"
+
+
+def test_load_bundle_fails_when_the_rules_changed(tmp_path):
+    root_dir = str(tmp_path)
+    bundle_path = os.path.join(root_dir, "cakeslicer.bundle")
+
+    create_file(os.path.join(root_dir, "starter", "main.py"))
+    write_bundle(compile_bundle(root_dir, ["./starter"]), bundle_path)
+
+    fingerprint = get_bundle_fingerprint(
+        "cakeslicer", ["#"], [*TOKEN_NAMES, "license"], ["./starter"]
+    )
+
+    with pytest.raises(ValueError) as error:
+        load_bundle(bundle_path, fingerprint)
+
+    assert error.value.message == messages.stale_bundle(bundle_path)
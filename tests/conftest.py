@@ -0,0 +1,22 @@
+import os
+import pytest
+from typing import Union
+from cakeslicer.src.runner import parallel
+
+
+def create_file(path: str, content: Union[str, bytes] = "") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "wb" if isinstance(content, bytes) else "w") as file:
+        file.write(content)
+
+
+@pytest.fixture
+def render_pools(monkeypatch):
+    pools = {}
+    monkeypatch.setattr(parallel, "_pools", pools)
+
+    yield pools
+
+    for pool in pools.values():
+        pool.shutdown()
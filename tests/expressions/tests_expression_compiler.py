@@ -0,0 +1,116 @@
+import pytest
+from cakeslicer.src.core.errors import (
+    ExpressionErrorMessages as messages,
+    KeyError,
+    ValueError,
+)
+from cakeslicer.src.expressions import ExpressionCompiler, expression_compiler
+
+
+variables = {
+    "python_project": True,
+    "node_project": False,
+    "license": 2,
+    "children_count": "3",
+    "pi_value": "3.1415",
+    "country": "brazil",
+    "skipped": None,
+}
+
+
+@pytest.mark.parametrize(
+    "expression, expected_result",
+    [
+        ("python_project", True),
+        ("not python_project", False),
+        ("python_project and node_project", False),
+        ("python_project or node_project", True),
+        ("not (python_project and node_project)", True),
+        ("python_project and not node_project", True),
+        ("license == 2", True),
+        ("license != 2", False),
+        ("license in [0, 2]", True),
+        ("license not in [0, 2]", False),
+        ("children_count > 2", True),
+        ("children_count <= 2", False),
+        ("children_count in [1, 3]", True),
+        ("pi_value > 3.14", True),
+        ("pi_value == 3.1415", True),
+        ('country == "brazil"', True),
+        ("country in ['usa', 'germany']", False),
+        ("node_project == False and license >= 1", True),
+        ("python_project == true", True),
+        ("license == [2]", False),
+        ("[1,] == [1]", True),
+        ("[license] != [2]", False),
+        ("python_project in [1, 2]", False),
+        ("python_project in [true, 2]", True),
+        ("python_project in [license, 1]", False),
+        ("python_project == 1", False),
+        ("[python_project] == [1]", False),
+        ("skipped > 0", False),
+        ("skipped <= 0", False),
+        ("skipped == none", True),
+        ("children_count in [3, license]", True),
+        ("children_count not in [2, license]", True),
+        ("license in [children_count, 5]", False),
+        ("license in ['2', children_count]", True),
+        ("python_project in [license, '1']", False),
+        ("children_count > -1", True),
+        ("license == -2", False),
+        ("-0.5 < license", True),
+        ("license in [-2, 2]", True),
+    ],
+)
+def test_evaluate_successfully_for_valid_expressions(expression, expected_result):
+    assert expression_compiler.evaluate(expression, variables) == expected_result
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "",
+        "python_project and",
+        "license ==",
+        "(license == 2",
+        "license in [0 2]",
+        "#",
+        "license > - 1",
+    ],
+)
+def test_compile_fails_for_invalid_expressions(expression):
+    with pytest.raises(ValueError) as error:
+        expression_compiler.compile(expression)
+
+    assert str(error.value) == messages.invalid_expression(expression.rstrip())
+
+
+def test_evaluate_fails_when_the_expression_references_an_undefined_variable():
+    with pytest.raises(KeyError) as error:
+        expression_compiler.evaluate("python_project and use_cache", variables)
+
+    assert str(error.value) == messages.undefined_variable("use_cache")
+
+
+def test_evaluate_fails_when_the_values_cant_be_compared():
+    with pytest.raises(ValueError) as error:
+        expression_compiler.evaluate("country > 2", variables)
+
+    assert str(error.value) == messages.uncomparable_values("brazil", 2)
+
+
+def test_compile_parses_each_expression_only_once():
+    compiler = ExpressionCompiler()
+
+    compiled = compiler.compile("license in [0, 2]")
+
+    assert compiler.compile("license in [0, 2]") is compiled
+    assert compiler.compile("license in [0, 1]") is not compiled
+
+
+def test_get_names_returns_the_referenced_variables_without_repetition():
+    names = expression_compiler.get_names(
+        "python_project and (license == 2 or not python_project) and true"
+    )
+
+    assert names == ["python_project", "license"]
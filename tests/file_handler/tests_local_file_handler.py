@@ -433,6 +433,29 @@ def test_copy_copies_a_whole_directory_with_its_contents():
     remove_directory(copied_dir_name)
 
 
+def test_copy_copies_a_directory_again_into_an_existing_destination():
+    dirname = "somedir"
+    copied_dir_name = "copieddir"
+
+    new_dir_path = create_directory(dirname)
+    create_file(new_dir_path, "somefile.txt")
+
+    dir_path = f"./{temp_dir_path}/{dirname}"
+    copy_dir_path = f"./{temp_dir_path}/{copied_dir_name}"
+    full_copy_dir_path = (
+        os.path.dirname(__file__) + f"/{temp_dir_path}/{copied_dir_name}"
+    )
+
+    file_handler.copy(dir_path, copy_dir_path)
+    create_file(new_dir_path, "otherfile.txt")
+    file_handler.copy(dir_path, copy_dir_path)
+
+    assert sorted(os.listdir(full_copy_dir_path)) == ["otherfile.txt", "somefile.txt"]
+
+    remove_directory(dirname)
+    remove_directory(copied_dir_name)
+
+
 def test_copy_raises_a_value_error_if_the_original_path_is_invalid():
     dirname = "somedir"
     remove_directory(dirname)
@@ -592,3 +615,85 @@ def test_copy_raises_a_copy_error_if_the_directory_copy_process_goes_wrong(monke
     assert str(error.value) == messages.failed_to_copy("directory")
 
     remove_directory(dirname)
+
+
+def test_create_directory_creates_the_missing_parents(tmp_path):
+    directory_path = str(tmp_path / "parent" / "child")
+
+    file_handler.createDirectory(directory_path)
+    file_handler.createDirectory(directory_path)
+
+    assert os.path.isdir(directory_path)
+
+
+def test_list_directory_describes_each_entry(tmp_path):
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "file.txt").write_bytes(b"12345")
+    os.symlink("file.txt", tmp_path / "link")
+
+    entries = sorted(file_handler.list_directory(str(tmp_path)))
+
+    assert [(entry.name, entry.is_dir, entry.is_symlink) for entry in entries] == [
+        ("dir", True, False),
+        ("file.txt", False, False),
+        ("link", False, True),
+    ]
+    assert entries[1].size == 5
+    assert file_handler.lookup(str(tmp_path / "file.txt")) == entries[1]
+    assert file_handler.lookup(str(tmp_path / "missing")) is None
+
+
+def test_write_bytes_and_read_bytes_round_trip_the_contents(tmp_path):
+    file_path = str(tmp_path / "file.bin")
+
+    file_handler.write_bytes(file_path, b"\x00\xff")
+
+    assert file_handler.read_bytes(file_path) == b"\x00\xff"
+
+
+def test_create_link_replaces_an_existing_link(tmp_path):
+    link_path = str(tmp_path / "link")
+
+    file_handler.create_link("first", link_path)
+    file_handler.create_link("second", link_path)
+
+    assert file_handler.read_link(link_path) == "second"
+
+
+def test_copy_contents_copies_the_contents_and_the_mode(tmp_path):
+    original_path = tmp_path / "run.sh"
+    original_path.write_bytes(b"echo run")
+    os.chmod(original_path, 0o755)
+
+    file_handler.copy_contents(str(original_path), str(tmp_path / "copy.sh"))
+
+    assert (tmp_path / "copy.sh").read_bytes() == b"echo run"
+    assert os.stat(tmp_path / "copy.sh").st_mode & 0o777 == 0o755
+
+
+def test_remove_removes_files_links_and_empty_directories_only(tmp_path):
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "file.txt").write_text("file")
+    os.symlink("dir", tmp_path / "link")
+
+    file_handler.remove(str(tmp_path / "link"))
+
+    with pytest.raises(OSError):
+        file_handler.remove(str(tmp_path / "dir"))
+
+    file_handler.remove(str(tmp_path / "dir" / "file.txt"))
+    file_handler.remove(str(tmp_path / "dir"))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_warm_reads_the_file_without_changing_it(tmp_path):
+    file_path = tmp_path / "file.txt"
+    file_path.write_text("file")
+
+    file_handler.warm(str(file_path))
+
+    assert file_path.read_text() == "file"
+
+    with pytest.raises(OSError):
+        file_handler.warm(str(tmp_path / "missing.txt"))
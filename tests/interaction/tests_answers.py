@@ -0,0 +1,162 @@
+from cakeslicer.src.core.enums import RuleTypes
+from cakeslicer.src.core.errors import (
+    AnswersErrorMessages,
+    CliErrorMessages as messages,
+    ValueError,
+)
+from cakeslicer.src.interaction import (
+    Answers,
+    cli,
+    get_environment_answers,
+    load_answer_sets,
+    load_answers,
+    parse_assignments,
+)
+import pytest
+
+
+def test_ask_for_returns_the_answer_of_the_attribute():
+    answers = Answers({"project_name": "My Project"})
+
+    assert answers.ask_for("project_name", "Default") == "My Project"
+
+
+def test_ask_for_falls_back_to_the_default_value():
+    answers = Answers({})
+
+    assert answers.ask_for("project_name", "Default") == "Default"
+
+
+def test_ask_for_fails_when_there_is_no_answer_nor_default_value():
+    answers = Answers({})
+
+    with pytest.raises(ValueError) as error:
+        answers.ask_for("project_name", None)
+
+    assert error.value.message == messages.no_value_for_attribute("project_name")
+
+
+@pytest.mark.parametrize("value,expected", [(True, "true"), (False, "false")])
+def test_ask_for_converts_json_booleans(value, expected):
+    answers = Answers({"use_docker": value})
+
+    assert answers.ask_for("use_docker", None, RuleTypes.bool) == expected
+
+
+def test_ask_for_validates_the_answers_like_the_cli():
+    answers = Answers({"python_version": "latest"})
+
+    with pytest.raises(ValueError) as error:
+        answers.ask_for("python_version", None, RuleTypes.integer)
+
+    assert error.value.message == messages.inappropriate_value_for_type("integer")
+
+
+def test_ask_for_accepts_the_option_of_a_choice():
+    answers = Answers({"framework": "django"})
+
+    assert (
+        answers.ask_for("framework", None, RuleTypes.choice, ["django", "flask"])
+        == "django"
+    )
+
+
+def test_show_prints_nothing(capsys):
+    Answers({}).show("ATTRIBUTES:")
+
+    assert capsys.readouterr().out == ""
+
+
+def test_load_answer_sets_reads_json_lines(tmp_path):
+    path = tmp_path / "answers.jsonl"
+    path.write_text('{"name": "a", "use_docker": true}\n\n{"name": "b"}\n')
+
+    assert load_answer_sets(str(path)) == [
+        {"name": "a", "use_docker": True},
+        {"name": "b"},
+    ]
+
+
+def test_load_answer_sets_reads_csv_skipping_empty_cells(tmp_path):
+    path = tmp_path / "answers.csv"
+    path.write_text("name,use_docker\na,y\nb,\n")
+
+    assert load_answer_sets(str(path)) == [
+        {"name": "a", "use_docker": "y"},
+        {"name": "b"},
+    ]
+
+
+def test_load_answer_sets_fails_on_a_line_that_is_not_an_object(tmp_path):
+    path = tmp_path / "answers.jsonl"
+    path.write_text('{"name": "a"}\n["b"]\n')
+
+    with pytest.raises(ValueError) as error:
+        load_answer_sets(str(path))
+
+    assert error.value.message == AnswersErrorMessages.invalid_answer_set(str(path), 2)
+
+
+def test_load_answer_sets_fails_on_unsupported_files(tmp_path):
+    path = str(tmp_path / "answers.txt")
+
+    with pytest.raises(ValueError) as error:
+        load_answer_sets(path)
+
+    assert error.value.message == AnswersErrorMessages.unsupported_answers_file(path)
+
+
+def test_ask_for_prompts_the_missing_answers_through_the_fallback(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "typed")
+
+    answers = Answers({"project_name": "answered"}, cli)
+
+    assert answers.ask_for("project_name", None) == "answered"
+    assert answers.ask_for("author", None) == "typed"
+
+
+@pytest.mark.parametrize(
+    "file_name,content",
+    [
+        ("answers.json", '{"name": "a", "use_docker": true}'),
+        ("answers.toml", 'name = "a"\nuse_docker = true\n'),
+        ("answers.yaml", "name: a\nuse_docker: yes\n"),
+    ],
+)
+def test_load_answers_reads_the_supported_formats(tmp_path, file_name, content):
+    if file_name.endswith(".yaml"):
+        pytest.importorskip("yaml")
+
+    path = tmp_path / file_name
+    path.write_text(content)
+
+    assert load_answers(str(path)) == {"name": "a", "use_docker": True}
+
+
+def test_load_answers_fails_when_the_file_isnt_an_object(tmp_path):
+    path = tmp_path / "answers.json"
+    path.write_text('["a"]')
+
+    with pytest.raises(ValueError) as error:
+        load_answers(str(path))
+
+    assert error.value.message == AnswersErrorMessages.invalid_answers_file(str(path))
+
+
+def test_get_environment_answers_reads_the_prefixed_variables():
+    environ = {"CAKESLICER_PROJECT_SLUG": "from_env", "PROJECT_SLUG": "ignored"}
+
+    assert get_environment_answers(
+        ["project_slug", "use_docker"], "cakeslicer", environ
+    ) == {"project_slug": "from_env"}
+
+
+def test_parse_assignments_splits_on_the_first_equals_sign():
+    assert parse_assignments(["name=a=b", "empty="]) == {"name": "a=b", "empty": ""}
+
+
+def test_parse_assignments_fails_without_an_equals_sign():
+    with pytest.raises(ValueError) as error:
+        parse_assignments(["name"])
+
+    assert error.value.message == AnswersErrorMessages.invalid_assignment("name")
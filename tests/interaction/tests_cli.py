@@ -1,6 +1,7 @@
+import io
 from cakeslicer.src.core.enums import RuleTypes
 from cakeslicer.src.core.errors import CliErrorMessages as messages, ValueError
-from cakeslicer.src.interaction import cli
+from cakeslicer.src.interaction import Cli, cli
 import pytest
 
 
@@ -706,3 +707,16 @@ def test_generate_choice_message_with_a_default_value():
         + "    4 - option D\n"
         + "  Type your choice's number or value"
     )
+
+
+def test_ask_for_writes_the_prompt_and_shows_to_the_given_output(monkeypatch, capsys):
+    monkeypatch.setattr("builtins.input", lambda: "some value")
+    output = io.StringIO()
+    output_cli = Cli(output)
+
+    value = output_cli.ask_for("project_slug", "default")
+    output_cli.show("shown")
+
+    assert value == "some value"
+    assert output.getvalue() == "- project_slug [default]: shown\n"
+    assert capsys.readouterr().out == ""
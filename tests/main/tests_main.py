@@ -0,0 +1,256 @@
+import os
+import sys
+import json
+import asyncio
+import pytest
+from cakeslicer.src.core.enums import Actions, RuleTypes
+from cakeslicer.src.core.errors import AnswersErrorMessages as messages, ValueError
+from cakeslicer.src.main import Main
+
+
+@pytest.fixture(autouse=True)
+def answer_with_defaults(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda message: "y" if "?" in message else "")
+
+
+def create_starter(root_dir) -> None:
+    starter_dir = root_dir / "starter"
+    starter_dir.mkdir()
+    (starter_dir / "name.txt").write_text("cakeslicer_project_slug")
+
+
+def starter_rules(*actions: tuple) -> dict:
+    return {
+        "starter": {
+            "message": "Include the starter?",
+            "type": RuleTypes.bool,
+            "actions": [(Actions.include, "./starter"), *actions],
+        }
+    }
+
+
+def test_run_returns_the_context_of_the_generation(tmp_path):
+    create_starter(tmp_path)
+
+    context = Main().run(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    assert context.properties["VARIABLES"]["project_slug"] == "cake"
+    assert [metrics.name for metrics in context.metrics][0] == "walk"
+    assert (tmp_path / "output" / "starter" / "name.txt").read_text() == "cake"
+
+
+def test_a_generation_started_from_a_call_keeps_the_outer_one_untouched(tmp_path):
+    main = Main()
+    create_starter(tmp_path)
+
+    def generate_inner(context, variables):
+        main.run(
+            rules=starter_rules((Actions.cmd, "touch inner_done")),
+            attributes={"project_slug": "inner"},
+            root_dir=context.root_dir,
+            output_dir=os.path.join(context.output_dir, "inner"),
+            workers=1,
+            cache_dir=os.path.join(context.root_dir, "cache"),
+        )
+
+    context = main.run(
+        rules=starter_rules(
+            (Actions.call, generate_inner), (Actions.cmd, "touch outer_done")
+        ),
+        attributes={"project_slug": "outer"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    output_dir = tmp_path / "output"
+
+    assert context.properties["VARIABLES"]["project_slug"] == "outer"
+    assert (output_dir / "starter" / "name.txt").read_text() == "outer"
+    assert (output_dir / "inner" / "starter" / "name.txt").read_text() == "inner"
+    assert (output_dir / "outer_done").exists()
+    assert (output_dir / "inner" / "inner_done").exists()
+    assert not (output_dir / "inner_done").exists()
+    assert not (output_dir / "inner" / "outer_done").exists()
+
+
+def test_run_async_runs_concurrent_generations_with_their_own_answers(tmp_path):
+    main = Main()
+    create_starter(tmp_path)
+
+    async def generate_all():
+        return await asyncio.gather(
+            *(
+                main.run_async(
+                    rules=starter_rules(),
+                    attributes={"project_slug": slug},
+                    root_dir=str(tmp_path),
+                    output_dir=f"./{slug}",
+                    workers=1,
+                    cache_dir=str(tmp_path / "cache"),
+                )
+                for slug in ["first", "second", "third"]
+            )
+        )
+
+    contexts = asyncio.run(generate_all())
+
+    for (context, slug) in zip(contexts, ["first", "second", "third"]):
+        assert context.properties["VARIABLES"]["project_slug"] == slug
+        assert (tmp_path / slug / "starter" / "name.txt").read_text() == slug
+
+
+def test_run_async_renders_concurrent_generations_on_worker_processes(
+    tmp_path, monkeypatch, render_pools
+):
+    monkeypatch.setattr("cakeslicer.src.runner.runner.POOL_MIN_BYTES", 0)
+    main = Main()
+    starter_dir = tmp_path / "starter"
+    starter_dir.mkdir()
+
+    for index in range(100):
+        (starter_dir / f"{index}.txt").write_text("cakeslicer_project_slug")
+
+    async def generate_all():
+        return await asyncio.gather(
+            *(
+                main.run_async(
+                    rules=starter_rules(),
+                    attributes={"project_slug": slug},
+                    root_dir=str(tmp_path),
+                    output_dir=f"./{slug}",
+                    workers=2,
+                    cache_dir=str(tmp_path / "cache"),
+                )
+                for slug in ["first", "second", "third"]
+            )
+        )
+
+    asyncio.run(generate_all())
+
+    for slug in ["first", "second", "third"]:
+        for index in range(100):
+            path = tmp_path / slug / "starter" / f"{index}.txt"
+            assert path.read_text() == slug
+
+
+@pytest.mark.parametrize("with_answers_file", [True, False])
+def test_plan_on_stdout_is_only_the_json_plan(
+    tmp_path, monkeypatch, capsys, with_answers_file
+):
+    create_starter(tmp_path)
+    answers = None
+
+    if with_answers_file:
+        (tmp_path / "answers.json").write_text('{"starter": "y"}')
+        answers = str(tmp_path / "answers.json")
+
+    monkeypatch.setattr("builtins.input", lambda *args: "y" if not args else "")
+
+    Main().run(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+        plan="-",
+        answers=answers,
+    )
+
+    out, err = capsys.readouterr()
+    plan = json.loads(out)
+
+    assert plan["output_dir"] == str(tmp_path / "output")
+    assert plan["files"][0]["destination"] == os.path.join("starter", "name.txt")
+    assert "PROJECT SETTINGS:" in err
+
+
+def test_run_generates_a_project_for_each_answer_set(tmp_path, capsys):
+    create_starter(tmp_path)
+    (tmp_path / "answers.jsonl").write_text(
+        '{"project_slug": "first", "_output_dir": "custom"}\n'
+        '{"project_slug": "second", "starter": "n"}\n'
+    )
+
+    context = Main().run(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+        answers=str(tmp_path / "answers.jsonl"),
+        assignments=["starter=y"],
+    )
+
+    output_dir = tmp_path / "output"
+
+    assert (output_dir / "custom" / "starter" / "name.txt").read_text() == "first"
+    assert (output_dir / "2" / "starter" / "name.txt").read_text() == "second"
+    assert "Generated 2 project(s)" in capsys.readouterr().out
+    assert context.template_compiler is not None
+
+
+def test_run_ignores_the_command_line_of_its_host(tmp_path, monkeypatch):
+    create_starter(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["host.py", "--plan", "--set", "starter=n"])
+
+    Main().run(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    assert (tmp_path / "output" / "starter" / "name.txt").read_text() == "cake"
+
+
+def test_run_cli_takes_the_options_from_the_command_line(tmp_path, monkeypatch):
+    create_starter(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["cakeslicer.py", "--set", "starter=n"])
+
+    context = Main().run_cli(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        workers=1,
+        cache_dir=str(tmp_path / "cache"),
+    )
+
+    assert context.properties["VARIABLES"]["starter"] is False
+    assert not (tmp_path / "output" / "starter").exists()
+
+
+def test_run_cant_plan_a_batch_of_answers(tmp_path):
+    (tmp_path / "answers.jsonl").write_text('{"project_slug": "first"}\n')
+
+    answers = str(tmp_path / "answers.jsonl")
+
+    with pytest.raises(ValueError) as error:
+        Main().run(
+            rules=starter_rules(), root_dir=str(tmp_path), plan="-", answers=answers
+        )
+
+    assert str(error.value) == messages.plan_for_answer_batch(answers)
+
+
+def test_run_compiles_the_bundle_and_returns_no_context(tmp_path):
+    create_starter(tmp_path)
+
+    context = Main().run(
+        rules=starter_rules(),
+        attributes={"project_slug": "cake"},
+        root_dir=str(tmp_path),
+        cache_dir=str(tmp_path / "cache"),
+        command="compile",
+    )
+
+    assert context is None
+    assert (tmp_path / "cakeslicer.bundle").exists()
+    assert not (tmp_path / "output").exists()
@@ -1,11 +1,18 @@
+from cakeslicer.src.core.commands import Command
 from cakeslicer.src.core.enums import Actions, RuleTypes
 from cakeslicer.src.core.errors import (
     SetupErrorMessages as messages,
     KeyError,
     ValueError,
 )
-from cakeslicer.src.main.setup import setup_properties
-from cakeslicer.src.interaction import cli
+from cakeslicer.src.main.setup import (
+    setup_properties,
+    compile_rules,
+    validate_rules,
+    get_all_actions,
+    get_token_names,
+)
+from cakeslicer.src.interaction import cli, Answers
 from mocks.base_parameters import mocked_attributes, mocked_rules, mocked_inputs
 import pytest
 
@@ -37,7 +44,30 @@ def test_setup_properties_successfully_generates_the_properties_structure(monkey
             "git": True,
             "license": 2,
         },
-        "ACTIONS": {Actions.include: ["./somepyproject"], Actions.cmd: ["git init"]},
+        "TOKENS": {
+            "project_slug": "project_name",
+            "version": "1.0.0",
+            "python_project": "True",
+            "node_project": "False",
+            "use_cache": "False",
+            "git": "True",
+            "license": "2",
+            "project_slug__snake": "project_name",
+            "project_slug__camel": "projectName",
+            "project_slug__pascal": "ProjectName",
+            "project_slug__kebab": "project-name",
+            "project_slug__upper": "PROJECT_NAME",
+            "version__snake": "1_0_0",
+            "version__camel": "100",
+            "version__pascal": "100",
+            "version__kebab": "1-0-0",
+            "version__upper": "1_0_0",
+        },
+        "ACTIONS": {
+            Actions.include: ["./somepyproject"],
+            Actions.cmd: ["git init"],
+            Actions.call: [],
+        },
     }
 
 
@@ -242,6 +272,7 @@ def test_setup_properties_runs_an_action_defined_in_a_simple_tuple_if_the_rule_i
     assert properties["ACTIONS"] == {
         Actions.include: ["./somepyproject"],
         Actions.cmd: [],
+        Actions.call: [],
     }
 
 
@@ -273,6 +304,7 @@ def test_setup_properties_doesnt_run_an_action_defined_in_a_simple_tuple_if_the_
     assert properties["ACTIONS"] == {
         Actions.include: [],
         Actions.cmd: [],
+        Actions.call: [],
     }
 
 
@@ -304,6 +336,7 @@ def test_setup_properties_doesnt_run_an_action_defined_in_a_simple_tuple_if_the_
     assert properties["ACTIONS"] == {
         Actions.include: [],
         Actions.cmd: [],
+        Actions.call: [],
     }
 
 
@@ -788,3 +821,315 @@ def test_setup_properties_runs_all_actions_defined_in_a_list_for_the_true_value_
         second_true_action_str,
         third_true_action_str,
     ]
+
+
+@pytest.mark.parametrize(
+    "value, expected_variants",
+    [
+        (
+            "my_project",
+            ["my_project", "myProject", "MyProject", "my-project", "MY_PROJECT"],
+        ),
+        (
+            "HTTPServer2 app",
+            [
+                "http_server_2_app",
+                "httpServer2App",
+                "HttpServer2App",
+                "http-server-2-app",
+                "HTTP_SERVER_2_APP",
+            ],
+        ),
+    ],
+)
+def test_setup_properties_precomputes_the_case_variants_of_the_attributes(
+    monkeypatch, value, expected_variants
+):
+    monkeypatch.setattr("builtins.input", lambda _: value)
+
+    properties = setup_properties({}, cli, attributes={"project_slug": "Default"})
+
+    variants = [
+        properties["TOKENS"][f"project_slug__{variant}"]
+        for variant in ["snake", "camel", "pascal", "kebab", "upper"]
+    ]
+
+    assert variants == expected_variants
+    assert properties["TOKENS"]["project_slug"] == value
+
+
+def test_setup_properties_accepts_custom_case_variants(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "")
+
+    properties = setup_properties(
+        {},
+        cli,
+        attributes={"project_slug": "my_project"},
+        case_variants={"title": lambda words: " ".join(w.title() for w in words)},
+    )
+
+    assert properties["TOKENS"] == {
+        "project_slug": "my_project",
+        "project_slug__title": "My Project",
+    }
+
+
+def test_validate_rules_accepts_the_valid_rules():
+    validate_rules(mocked_rules)
+
+
+def test_validate_rules_fails_on_an_action_that_isnt_taken_by_the_answers():
+    rules = {
+        "use_cache": {
+            "type": RuleTypes.bool,
+            "actions": {True: (Actions.include, "./cache"), False: ("./nothing",)},
+        }
+    }
+
+    with pytest.raises(ValueError) as error:
+        validate_rules(rules)
+
+    assert error.value.message == messages.first_tuple_value_must_be_an_action
+
+
+def test_get_all_actions_collects_the_actions_of_every_branch():
+    assert get_all_actions(mocked_rules) == {
+        Actions.include: ["./somepyproject", "./somenodeproject"],
+        Actions.cmd: ["echo 'fail'", "echo 'fail again'", "cp /home", "git init"],
+        Actions.call: [],
+    }
+
+
+def test_get_token_names_includes_the_case_variants_of_the_attributes():
+    assert get_token_names(
+        {"use_cache": {"type": RuleTypes.bool}},
+        {"project_slug": "x"},
+        {"snake": None, "pascal": None},
+    ) == [
+        "project_slug",
+        "use_cache",
+        "project_slug__snake",
+        "project_slug__pascal",
+    ]
+
+
+def test_compile_rules_builds_immutable_rules_with_indexed_options():
+    compiled_rules = compile_rules(mocked_rules)
+    license_rule = compiled_rules["license"]
+
+    assert compile_rules(compiled_rules) is compiled_rules
+    assert license_rule.options.indexes == {"mit": 0, "cc": 1, "apache": 2}
+    assert [license_rule.parse(value) for value in ["Apache", "cc", "1"]] == [2, 1, 0]
+    assert license_rule.validate("APACHE")
+    assert not license_rule.validate("GPL")
+    assert not license_rule.validate("4")
+
+    with pytest.raises(AttributeError):
+        license_rule.type = RuleTypes.string
+
+
+def test_compile_rules_binds_the_validator_of_each_type():
+    compiled_rules = compile_rules(
+        {
+            "use_cache": {"type": RuleTypes.bool},
+            "port": {"type": RuleTypes.integer},
+            "name": {"type": RuleTypes.string},
+        }
+    )
+
+    assert compiled_rules["use_cache"].parse("Y") is True
+    assert compiled_rules["use_cache"].parse("no") is False
+    assert not compiled_rules["use_cache"].validate("maybe")
+    assert compiled_rules["port"].validate("0")
+    assert not compiled_rules["port"].validate("eighty")
+    assert compiled_rules["name"].validate("anything")
+
+
+def test_compile_rules_maps_each_value_to_the_actions_it_triggers():
+    compiled_rules = compile_rules(mocked_rules)
+
+    assert compiled_rules["python_project"].action_table == {
+        True: ((Actions.include, "./somepyproject"),),
+        False: ((Actions.cmd, "echo 'fail'"), (Actions.cmd, "echo 'fail again'")),
+    }
+    assert compiled_rules["git"].get_actions(True) == ((Actions.cmd, "git init"),)
+    assert compiled_rules["git"].get_actions(False) == ()
+    assert compiled_rules["license"].action_table == {}
+
+
+def test_compile_rules_fails_on_an_invalid_action_of_any_value():
+    rules = {
+        "license": {
+            "type": RuleTypes.choice,
+            "options": ["MIT", "CC"],
+            "actions": {
+                0: (Actions.cmd, "echo MIT"),
+                1: [(Actions.cmd, "echo CC"), "x"],
+            },
+        }
+    }
+
+    with pytest.raises(ValueError) as error:
+        compile_rules(rules)
+
+    assert error.value.message == messages.invalid_type_for_action_definition
+
+
+conditional_rules = {
+    "python_project": {"type": RuleTypes.bool},
+    "use_cache": {
+        "type": RuleTypes.bool,
+        "when": "python_project",
+        "actions": (Actions.include, "./cache"),
+    },
+    "cache_backend": {
+        "type": RuleTypes.choice,
+        "options": ["redis", "memcached"],
+        "when": "python_project and use_cache",
+        "actions": {0: (Actions.include, "./redis")},
+    },
+}
+
+
+def test_setup_properties_skips_the_rules_whose_conditions_are_false():
+    answers = Answers({"python_project": False})
+
+    properties = setup_properties({}, answers, rules=conditional_rules)
+
+    assert properties["VARIABLES"] == {
+        "python_project": False,
+        "use_cache": None,
+        "cache_backend": None,
+    }
+    assert properties["TOKENS"]["use_cache"] == ""
+    assert properties["ACTIONS"] == {
+        Actions.include: [],
+        Actions.cmd: [],
+        Actions.call: [],
+    }
+
+
+def test_setup_properties_asks_for_the_rules_whose_conditions_are_true():
+    answers = Answers(
+        {"python_project": True, "use_cache": True, "cache_backend": "redis"}
+    )
+
+    properties = setup_properties({}, answers, rules=conditional_rules)
+
+    assert properties["VARIABLES"] == {
+        "python_project": True,
+        "use_cache": True,
+        "cache_backend": 0,
+    }
+    assert properties["ACTIONS"][Actions.include] == ["./cache", "./redis"]
+
+
+def test_setup_properties_skips_the_rules_whose_conditions_refer_to_skipped_rules():
+    rules = {
+        "python_project": {"type": RuleTypes.bool},
+        "license": {
+            "type": RuleTypes.choice,
+            "options": ["MIT", "CC"],
+            "when": "python_project",
+        },
+        "extra": {"type": RuleTypes.bool, "when": "license > 0"},
+        "fallback": {"type": RuleTypes.bool, "when": "not license"},
+    }
+
+    properties = setup_properties({}, Answers({"python_project": "n"}), rules=rules)
+
+    assert properties["VARIABLES"] == {
+        "python_project": False,
+        "license": None,
+        "extra": None,
+        "fallback": None,
+    }
+
+
+def test_compile_rules_fails_if_a_condition_is_not_a_string():
+    with pytest.raises(ValueError) as error:
+        compile_rules({"use_cache": {"type": RuleTypes.bool, "when": True}})
+
+    assert str(error.value) == messages.invalid_type_for_condition("use_cache")
+
+
+def test_compile_rules_fails_if_a_condition_refers_to_a_later_rule():
+    rules = {
+        "use_cache": {"type": RuleTypes.bool, "when": "python_project"},
+        "python_project": {"type": RuleTypes.bool},
+    }
+
+    with pytest.raises(ValueError) as error:
+        compile_rules(rules)
+
+    assert str(error.value) == messages.unknown_rule_in_condition(
+        "python_project", "use_cache"
+    )
+
+
+def test_compile_rules_fails_if_a_command_runs_after_an_unknown_command():
+    rules = {
+        "git": {
+            "type": RuleTypes.bool,
+            "actions": (Actions.cmd, Command("git init", name="git", after=[])),
+        },
+        "npm": {
+            "type": RuleTypes.bool,
+            "actions": [
+                (Actions.cmd, Command("npm install", name="npm", after=[])),
+                (Actions.cmd, Command("git add .", after=["git", "npm", "pip"])),
+            ],
+        },
+    }
+
+    with pytest.raises(ValueError) as error:
+        compile_rules(rules)
+
+    assert str(error.value) == messages.unknown_command_dependency("git add .", ["pip"])
+
+
+def test_setup_properties_adds_the_callables_of_call_actions():
+    def patch_package_json(context, variables):
+        pass
+
+    rules = {
+        "node_project": {
+            "type": RuleTypes.bool,
+            "actions": (Actions.call, patch_package_json),
+        }
+    }
+
+    properties = setup_properties({}, Answers({"node_project": True}), rules=rules)
+
+    assert properties["ACTIONS"][Actions.call] == [patch_package_json]
+
+
+def test_compile_rules_fails_if_a_call_action_item_is_not_callable():
+    rules = {
+        "node_project": {"type": RuleTypes.bool, "actions": (Actions.call, "patch")}
+    }
+
+    with pytest.raises(ValueError) as error:
+        compile_rules(rules)
+
+    assert str(error.value) == messages.call_action_must_be_callable
+
+
+def test_setup_properties_reports_each_include_once_its_rule_is_answered():
+    included = []
+    rules = {
+        "python_project": {
+            "type": RuleTypes.bool,
+            "actions": (Actions.include, "./python", "./common"),
+        },
+        "use_cache": {"type": RuleTypes.bool, "actions": (Actions.include, "./cache")},
+    }
+
+    setup_properties(
+        {},
+        Answers({"python_project": True, "use_cache": False}),
+        rules=rules,
+        on_include=included.append,
+    )
+
+    assert included == ["./python", "./common"]
@@ -0,0 +1,30 @@
+import pytest
+from cakeslicer.src.renderer.comment_syntax import (
+    CommentSyntax,
+    get_comment_syntax,
+)
+
+
+default_syntax = CommentSyntax(("//", "#"))
+
+
+@pytest.mark.parametrize(
+    "file_name, content, expected_syntax",
+    [
+        ("src/main.py", "", CommentSyntax(("#",))),
+        ("src/App.TSX", "", CommentSyntax(("//",), (("/*", "*/"),))),
+        ("styles.css", "", CommentSyntax((), (("/*", "*/"),))),
+        ("index.html", "", CommentSyntax((), (("<!--", "-->"),))),
+        ("Dockerfile", "", CommentSyntax(("#",))),
+        ("package.json", "", CommentSyntax()),
+        ("bin/run", "#!/bin/bash\n", CommentSyntax(("#",))),
+        ("bin/run", "#!/usr/bin/env node\n", CommentSyntax(("//",), (("/*", "*/"),))),
+        ("bin/run", "#!/usr/bin/env python3.10\n", CommentSyntax(("#",))),
+        ("notes.txt", "", default_syntax),
+        ("bin/run", "#!/usr/bin/env unknown\n", default_syntax),
+    ],
+)
+def test_get_comment_syntax_dispatches_by_file_name_extension_or_shebang(
+    file_name, content, expected_syntax
+):
+    assert get_comment_syntax(file_name, content, default_syntax) == expected_syntax
@@ -0,0 +1,82 @@
+import os
+import pytest
+from cakeslicer.src.core.errors import TemplateErrorMessages as messages, ValueError
+from cakeslicer.src.renderer import PathRenderer
+
+
+variables = {
+    "project_slug": "my_project",
+    "python_project": True,
+    "use_cache": False,
+}
+
+
+def test_render_segment_replaces_the_prefixed_variables_with_their_values():
+    path_renderer = PathRenderer("cakeslicer", variables)
+
+    assert path_renderer.render_segment("cakeslicer_project_slug") == "my_project"
+    assert path_renderer.render_segment("test_cakeslicer_project_slug.py") == (
+        "test_my_project.py"
+    )
+
+
+def test_render_segment_keeps_literal_names_untouched():
+    path_renderer = PathRenderer("cakeslicer", variables)
+
+    assert path_renderer.render_segment("__init__.py") == "__init__.py"
+    assert path_renderer.render_segment("{not_a_condition}") == "{not_a_condition}"
+
+
+def test_render_segment_strips_a_satisfied_condition_from_the_name():
+    path_renderer = PathRenderer("cakeslicer", variables)
+
+    segment = "{cakeslicer_if python_project and not use_cache}cakeslicer_project_slug"
+
+    assert path_renderer.render_segment(segment) == "my_project"
+
+
+def test_render_segment_returns_none_when_the_condition_is_not_satisfied():
+    path_renderer = PathRenderer("cakeslicer", variables)
+
+    assert path_renderer.render_segment("{cakeslicer_if use_cache}cache") is None
+
+
+def test_render_segment_evaluates_each_unique_segment_only_once():
+    checked_conditions = []
+
+    def check(condition: str) -> bool:
+        checked_conditions.append(condition)
+        return True
+
+    path_renderer = PathRenderer("cakeslicer", variables, check)
+
+    for _ in range(3):
+        path_renderer.render_segment("{cakeslicer_if use_cache}cache")
+
+    assert checked_conditions == ["use_cache"]
+
+
+def test_render_path_returns_none_when_any_of_its_segments_is_pruned():
+    path_renderer = PathRenderer("cakeslicer", variables)
+
+    pruned_path = os.path.join("src", "{cakeslicer_if use_cache}cache", "redis.py")
+    kept_path = os.path.join("src", "cakeslicer_project_slug", "__init__.py")
+
+    assert path_renderer.render_path(pruned_path) is None
+    assert path_renderer.render_path(kept_path) == os.path.join(
+        "src", "my_project", "__init__.py"
+    )
+
+
+@pytest.mark.parametrize(
+    "project_slug", ["../../escaped", "/absolute", "a/b", "..", ".", ""]
+)
+def test_render_segment_fails_when_an_answer_isnt_a_valid_name(project_slug):
+    path_renderer = PathRenderer("cakeslicer", {"project_slug": project_slug})
+
+    with pytest.raises(ValueError) as error:
+        path_renderer.render_segment("cakeslicer_project_slug")
+
+    assert str(error.value) == messages.invalid_rendered_name(
+        "cakeslicer_project_slug", project_slug
+    )
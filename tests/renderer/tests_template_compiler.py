@@ -0,0 +1,233 @@
+import os
+import pytest
+from cakeslicer.src.core.errors import TemplateErrorMessages as messages, TemplateError
+from cakeslicer.src.renderer import TemplateCompiler
+
+
+variables = {
+    "project_slug": "my_project",
+    "version": "1.0.0",
+    "python_project": True,
+    "node_project": False,
+}
+
+
+def create_compiler(cache_dir: str = None) -> TemplateCompiler:
+    return TemplateCompiler("cakeslicer", ["//", "#"], variables.keys(), cache_dir)
+
+
+def test_render_replaces_the_prefixed_variables_with_their_values():
+    compiler = create_compiler()
+
+    content = 'name = "cakeslicer_project_slug"\nversion = "cakeslicer_version"\n'
+
+    rendered = compiler.render(content, variables)
+
+    assert rendered == 'name = "my_project"\nversion = "1.0.0"\n'
+
+
+def test_render_keeps_prefixed_words_that_dont_match_any_variable():
+    compiler = create_compiler()
+
+    content = "cakeslicer_unknown cakeslicer_version"
+
+    rendered = compiler.render(content, variables)
+
+    assert rendered == "cakeslicer_unknown 1.0.0"
+
+
+def test_render_keeps_the_content_of_a_conditional_block_whose_condition_is_satisfied():
+    compiler = create_compiler()
+
+    content = (
+        "start\n"
+        "# cakeslicer_if python_project\n"
+        "python\n"
+        "# cakeslicer_else\n"
+        "not python\n"
+        "# cakeslicer_endif\n"
+        "end\n"
+    )
+
+    rendered = compiler.render(content, variables)
+
+    assert rendered == "start\npython\nend\n"
+
+
+def test_render_uses_the_else_branch_when_no_condition_is_satisfied():
+    compiler = create_compiler()
+
+    content = (
+        "    // cakeslicer_if node_project\n"
+        "    node\n"
+        "    // cakeslicer_elif python_project and node_project\n"
+        "    both\n"
+        "    // cakeslicer_else\n"
+        "    neither\n"
+        "    // cakeslicer_endif\n"
+    )
+
+    rendered = compiler.render(content, variables, lambda condition: False)
+
+    assert rendered == "    neither\n"
+
+
+def test_render_supports_nested_conditional_blocks():
+    compiler = create_compiler()
+
+    content = (
+        "# cakeslicer_if python_project\n"
+        "a\n"
+        "# cakeslicer_if node_project\n"
+        "b\n"
+        "# cakeslicer_endif\n"
+        "c\n"
+        "# cakeslicer_endif\n"
+    )
+
+    rendered = compiler.render(content, variables)
+
+    assert rendered == "a\nc\n"
+
+
+@pytest.mark.parametrize(
+    "content, error_message",
+    [
+        ("# cakeslicer_if\n", messages.missing_condition("cakeslicer_if", 1)),
+        ("a\n# cakeslicer_endif\n", messages.unexpected_marker("cakeslicer_endif", 2)),
+        (
+            "# cakeslicer_if a\n# cakeslicer_else\n# cakeslicer_else\n",
+            messages.unexpected_marker("cakeslicer_else", 3),
+        ),
+        ("a\n# cakeslicer_if a\nb\n", messages.unclosed_conditional(2)),
+    ],
+)
+def test_compile_fails_for_malformed_conditional_blocks(content, error_message):
+    compiler = create_compiler()
+
+    with pytest.raises(TemplateError) as error:
+        compiler.compile(content)
+
+    assert str(error.value) == error_message
+
+
+def test_compile_reuses_the_render_function_for_the_same_content():
+    compiler = create_compiler()
+
+    content = "cakeslicer_project_slug"
+
+    assert compiler.compile(content) is compiler.compile(content)
+
+
+def test_compile_persists_the_compiled_code_in_the_cache_dir(tmp_path):
+    content = (
+        "# cakeslicer_if python_project\ncakeslicer_project_slug\n# cakeslicer_endif\n"
+    )
+
+    compiler = create_compiler(str(tmp_path))
+    compiler.compile(content)
+
+    key = compiler.get_cache_key(content)
+    cache_files = [files for _, _, files in os.walk(tmp_path) if files]
+
+    assert cache_files == [[f"{key}.marshal"]]
+
+    another_compiler = create_compiler(str(tmp_path))
+    another_compiler._parse = lambda _: pytest.fail("The template was parsed again")
+
+    assert another_compiler.render(content, variables) == "my_project\n"
+
+
+def test_compile_uses_a_different_cache_key_when_the_known_variables_change():
+    content = "cakeslicer_project_slug"
+
+    compiler = create_compiler()
+    another_compiler = TemplateCompiler("cakeslicer", ["#"], ["project_slug"])
+
+    assert compiler.get_cache_key(content) != another_compiler.get_cache_key(content)
+
+
+def test_render_uses_the_block_comments_of_the_file_type():
+    compiler = create_compiler()
+
+    content = (
+        "<div>\n"
+        "  <!-- cakeslicer_if node_project -->\n"
+        "  <script src='node.js'></script>\n"
+        "  <!-- cakeslicer_endif -->\n"
+        "</div>\n"
+    )
+
+    rendered = compiler.render(content, variables, file_name="index.html")
+
+    assert rendered == "<div>\n</div>\n"
+
+
+def test_render_ignores_comment_delimiters_that_dont_belong_to_the_file_type():
+    compiler = create_compiler()
+
+    content = (
+        "#cakeslicer_if node_project\n"
+        "a { color: #fff; }\n"
+        "/* cakeslicer_if node_project */\n"
+        "b { color: #000; }\n"
+        "/* cakeslicer_endif */\n"
+    )
+
+    rendered = compiler.render(content, variables, file_name="styles.css")
+
+    assert rendered == "#cakeslicer_if node_project\na { color: #fff; }\n"
+
+
+def test_render_uses_the_shebang_to_find_the_comment_delimiters():
+    compiler = TemplateCompiler("cakeslicer", ["//"], variables.keys())
+
+    content = (
+        "#!/usr/bin/env python3\n"
+        "# cakeslicer_if node_project\n"
+        "node\n"
+        "# cakeslicer_endif\n"
+    )
+
+    rendered = compiler.render(content, variables, file_name="bin/run")
+
+    assert rendered == "#!/usr/bin/env python3\n"
+
+
+def test_compile_uses_a_different_cache_key_for_each_comment_syntax():
+    compiler = create_compiler()
+
+    content = "cakeslicer_project_slug"
+
+    python_syntax = compiler.get_comment_syntax(content, "main.py")
+    css_syntax = compiler.get_comment_syntax(content, "main.css")
+
+    assert compiler.get_cache_key(content, python_syntax) != compiler.get_cache_key(
+        content, css_syntax
+    )
+
+
+def test_get_references_maps_each_variable_to_the_byte_ranges_that_use_it():
+    compiler = create_compiler()
+
+    content = (
+        'name = "ção cakeslicer_project_slug"\n'
+        "# cakeslicer_if python_project and version\n"
+        "cakeslicer_version\n"
+        "# cakeslicer_endif\n"
+    )
+
+    references = compiler.get_references(content)
+    encoded = content.encode("utf-8")
+
+    [(start, end)] = references["project_slug"]
+    assert encoded[start:end] == b"cakeslicer_project_slug"
+
+    [(start, end)] = references["python_project"]
+    assert encoded[start:end] == b"# cakeslicer_if python_project and version\n"
+
+    assert [encoded[start:end] for (start, end) in references["version"]] == [
+        b"# cakeslicer_if python_project and version\n",
+        b"cakeslicer_version",
+    ]
+    assert "node_project" not in references
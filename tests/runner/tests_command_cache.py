@@ -0,0 +1,101 @@
+import os
+import pytest
+from cakeslicer.src.core.commands import Command
+from cakeslicer.src.core.errors import RunnerErrorMessages as messages, ValueError
+from cakeslicer.src.runner.command_cache import clone_file
+from cakeslicer.src.runner.scheduler import CommandScheduler
+
+
+def create_project(tmp_path, lock: str = "v1") -> str:
+    project_dir = tmp_path / "project"
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "package.lock").write_text(lock)
+
+    return str(project_dir)
+
+
+def install_command() -> Command:
+    return Command(
+        "echo run >> ../runs && mkdir -p modules && cp package.lock modules/",
+        inputs=["package.lock"],
+        outputs=["modules"],
+    )
+
+
+def run_install(tmp_path, project_dir: str) -> None:
+    CommandScheduler(
+        [install_command()], project_dir, cache_dir=str(tmp_path / "cache")
+    ).run()
+
+
+def count_runs(tmp_path) -> int:
+    return len((tmp_path / "runs").read_text().split())
+
+
+def test_run_restores_the_outputs_instead_of_running_the_command_again(tmp_path):
+    run_install(tmp_path, create_project(tmp_path))
+
+    project_dir = create_project(tmp_path / "other")
+    run_install(tmp_path, project_dir)
+
+    assert count_runs(tmp_path) == 1
+    assert not os.path.exists(tmp_path / "other" / "runs")
+
+    with open(os.path.join(project_dir, "modules", "package.lock")) as file:
+        assert file.read() == "v1"
+
+
+def test_run_replaces_outputs_left_by_a_previous_run(tmp_path):
+    project_dir = create_project(tmp_path)
+    run_install(tmp_path, project_dir)
+
+    with open(os.path.join(project_dir, "modules", "stale"), "w") as file:
+        file.write("")
+
+    run_install(tmp_path, project_dir)
+
+    assert os.listdir(os.path.join(project_dir, "modules")) == ["package.lock"]
+
+
+def test_run_runs_the_command_again_when_an_input_changes(tmp_path):
+    run_install(tmp_path, create_project(tmp_path, "v1"))
+    run_install(tmp_path, create_project(tmp_path, "v2"))
+
+    assert count_runs(tmp_path) == 2
+
+
+def test_run_doesnt_cache_a_failed_command(tmp_path):
+    project_dir = create_project(tmp_path)
+    command = Command(
+        "echo run >> ../runs && mkdir -p modules && exit 1", outputs=["modules"]
+    )
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            CommandScheduler(
+                [command], project_dir, cache_dir=str(tmp_path / "cache")
+            ).run()
+
+    assert count_runs(tmp_path) == 2
+
+
+def test_run_fails_when_an_output_is_outside_the_output_dir(tmp_path):
+    command = Command("true", outputs=["../elsewhere"])
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(
+            [command], create_project(tmp_path), cache_dir=str(tmp_path / "cache")
+        ).run()
+
+    assert str(error.value) == messages.command_path_outside_output("../elsewhere")
+
+
+def test_clone_file_copies_the_contents_and_the_mode(tmp_path):
+    source_path = tmp_path / "source.sh"
+    source_path.write_bytes(b"echo cloned")
+    os.chmod(source_path, 0o755)
+
+    clone_file(str(source_path), str(tmp_path / "clone.sh"))
+
+    assert (tmp_path / "clone.sh").read_bytes() == b"echo cloned"
+    assert os.stat(tmp_path / "clone.sh").st_mode & 0o777 == 0o755
@@ -0,0 +1,83 @@
+import pytest
+import threading
+from cakeslicer.src.runner import parallel
+from cakeslicer.src.runner.file_renderer import FileRenderer
+from cakeslicer.src.runner.parallel import create_render_pool, render_contents
+
+
+CONTENTS = [(b"name = 'cakeslicer_project_slug'", "name.py")]
+
+
+@pytest.fixture(autouse=True)
+def clear_worker_compilers(monkeypatch):
+    monkeypatch.setattr(parallel, "_worker_compilers", {})
+
+
+def create_file_renderer(project_slug: str, compiled_templates: dict = None):
+    tokens = {"project_slug": project_slug}
+
+    return FileRenderer(
+        "cakeslicer", ["#"], tokens, tokens, compiled_templates=compiled_templates
+    )
+
+
+def test_worker_reuses_its_compiler_across_projects():
+    first = parallel._render_contents(
+        create_file_renderer("first").get_task_state(), CONTENTS
+    )
+    second = parallel._render_contents(
+        create_file_renderer("second").get_task_state(), CONTENTS
+    )
+
+    assert first == [b"name = 'first'"]
+    assert second == [b"name = 'second'"]
+    assert len(parallel._worker_compilers) == 1
+
+
+def test_worker_asks_for_the_compiled_templates_only_once():
+    compiler = create_file_renderer("first").compiler
+    key, code = compiler.compile_code(CONTENTS[0][0].decode(), "name.py")
+    file_renderer = create_file_renderer("first", {key: code})
+
+    assert parallel._render_contents(file_renderer.get_task_state(), CONTENTS) is None
+    assert parallel._render_contents(file_renderer.get_task_state(True), CONTENTS) == [
+        b"name = 'first'"
+    ]
+    assert parallel._render_contents(file_renderer.get_task_state(), CONTENTS) == [
+        b"name = 'first'"
+    ]
+
+
+def test_render_contents_renders_on_the_shared_pool(render_pools):
+    pool = create_render_pool(2)
+
+    assert create_render_pool(2) is pool
+
+    for project_slug in ["first", "second"]:
+        assert render_contents(pool, create_file_renderer(project_slug), CONTENTS) == [
+            f"name = '{project_slug}'".encode()
+        ]
+
+
+def test_create_render_pool_doesnt_fork_while_another_thread_generates(
+    render_pools,
+):
+    (started, finished) = (threading.Event(), threading.Event())
+
+    def generate():
+        with parallel.running_generation():
+            started.set()
+            finished.wait()
+
+    thread = threading.Thread(target=generate)
+    thread.start()
+    started.wait()
+
+    try:
+        with parallel.running_generation():
+            assert create_render_pool(2) is None
+    finally:
+        finished.set()
+        thread.join()
+
+    assert create_render_pool(2) is not None
@@ -0,0 +1,109 @@
+import time
+import threading
+import pytest
+from cakeslicer.src.runner.pipeline import Pipeline, Stage
+
+
+def test_run_passes_the_items_through_every_stage():
+    pipeline = Pipeline(
+        [
+            Stage("double", lambda item: [item, item]),
+            Stage("square", lambda item: [item * item], concurrency=3),
+            Stage("skip_odd", lambda item: [item] if item % 2 == 0 else []),
+        ]
+    )
+
+    results = pipeline.run(range(5))
+
+    assert sorted(results) == [0, 0, 4, 4, 16, 16]
+
+
+def test_run_groups_items_in_batches_closed_once_they_reach_the_size_or_weight():
+    batches = []
+
+    def collect(batch: list):
+        batches.append(list(batch))
+        yield from batch
+
+    pipeline = Pipeline(
+        [
+            Stage("source", lambda item: [item]),
+            Stage(
+                "batch",
+                collect,
+                batch_size=2,
+                batch_weight=lambda item: item,
+                batch_max_weight=4,
+            ),
+        ]
+    )
+
+    results = pipeline.run([1, 1, 1, 5, 1])
+
+    assert sorted(results) == [1, 1, 1, 1, 5]
+    assert all(len(batch) <= 2 for batch in batches)
+    assert all(sum(batch[:-1]) < 4 for batch in batches)
+
+
+def test_run_holds_the_previous_stages_back_when_a_queue_is_full():
+    produced = []
+    released = threading.Event()
+
+    def produce(item: int):
+        produced.append(item)
+        yield item
+
+    def consume(item: int):
+        released.wait(5)
+        yield item
+
+    pipeline = Pipeline(
+        [Stage("produce", produce), Stage("consume", consume)], queue_size=2
+    )
+
+    runner = threading.Thread(target=pipeline.run, args=(range(100),))
+    runner.start()
+    time.sleep(0.2)
+
+    produced_while_blocked = len(produced)
+    released.set()
+    runner.join()
+
+    assert produced_while_blocked < 10
+    assert len(produced) == 100
+
+
+def test_run_reports_the_metrics_of_each_stage():
+    def sleep(item: int):
+        time.sleep(0.01)
+        yield item
+
+    pipeline = Pipeline([Stage("fast", lambda item: [item]), Stage("slow", sleep)])
+
+    pipeline.run(range(10))
+
+    fast_metrics, slow_metrics = pipeline.metrics
+
+    assert [fast_metrics.items, slow_metrics.items] == [10, 10]
+    assert slow_metrics.busy_time >= 0.1
+    assert slow_metrics.busy_time > fast_metrics.busy_time
+    assert slow_metrics.max_queue_depth >= 1
+    assert slow_metrics.as_dict()["stage"] == "slow"
+
+
+def test_run_raises_the_first_error_of_any_stage():
+    def fail_on_three(item: int):
+        if item == 3:
+            raise RuntimeError("three")
+
+        yield item
+
+    pipeline = Pipeline(
+        [Stage("fail", fail_on_three), Stage("pass", lambda item: [item])],
+        queue_size=1,
+    )
+
+    with pytest.raises(RuntimeError) as error:
+        pipeline.run(range(1000))
+
+    assert str(error.value) == "three"
@@ -0,0 +1,120 @@
+import os
+from cakeslicer.src.file_handler import LocalFileHandler
+from cakeslicer.src.runner import TreeIndex, TreePreloader
+from cakeslicer.tests.conftest import create_file
+
+
+def preload(root_dir: str, include_paths: list, **kwargs) -> TreeIndex:
+    tree_index = TreeIndex()
+    preloader = TreePreloader(tree_index, root_dir, **kwargs)
+
+    for include_path in include_paths:
+        preloader.add(include_path)
+
+    preloader.finish()
+
+    return tree_index
+
+
+def test_preloader_reads_the_included_files_into_the_tree_index(tmp_path):
+    file_path = str(tmp_path / "starter" / "src" / "main.py")
+    create_file(file_path, b"print('hi')")
+
+    tree_index = preload(str(tmp_path), ["./starter"])
+    os.remove(file_path)
+
+    assert tree_index.read(file_path) == b"print('hi')"
+
+
+def test_preloader_ignores_missing_includes(tmp_path):
+    file_path = str(tmp_path / "starter" / "main.py")
+    create_file(file_path, b"main")
+
+    tree_index = preload(str(tmp_path), ["./missing", "./starter"])
+    os.remove(file_path)
+
+    assert tree_index.read(file_path) == b"main"
+
+
+def test_preloader_stops_at_the_byte_budget(tmp_path):
+    create_file(str(tmp_path / "starter" / "small.txt"), b"small")
+    create_file(str(tmp_path / "starter" / "large.txt"), b"large" * 100)
+
+    tree_index = preload(str(tmp_path), ["./starter"], max_bytes=100)
+    os.remove(tmp_path / "starter" / "small.txt")
+    os.remove(tmp_path / "starter" / "large.txt")
+
+    assert tree_index.read(str(tmp_path / "starter" / "small.txt")) == b"small"
+    assert not os.path.exists(tmp_path / "starter" / "large.txt")
+
+
+def test_copy_file_writes_the_preloaded_content(tmp_path):
+    source_path = str(tmp_path / "starter" / "run.sh")
+    create_file(source_path, b"echo run")
+    os.chmod(source_path, 0o755)
+
+    tree_index = preload(str(tmp_path), ["./starter"])
+    tree_index.copy_file(source_path, str(tmp_path / "copy.sh"))
+
+    assert (tmp_path / "copy.sh").read_bytes() == b"echo run"
+    assert os.stat(tmp_path / "copy.sh").st_mode & 0o777 == 0o755
+
+
+def test_cancel_discards_the_preloaded_files(tmp_path):
+    file_path = str(tmp_path / "starter" / "main.py")
+    create_file(file_path, b"main")
+
+    tree_index = TreeIndex()
+    preloader = TreePreloader(tree_index, str(tmp_path))
+    preloader.add("./starter")
+    preloader.cancel()
+
+    create_file(file_path, b"changed")
+
+    assert tree_index.read(file_path) == b"changed"
+
+
+def test_prefetch_lists_the_paths_without_keeping_their_files(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "starter" / "main.py")
+    create_file(file_path, b"main")
+
+    tree_index = TreeIndex()
+    preloader = TreePreloader(tree_index, str(tmp_path))
+    preloader.prefetch("./starter")
+    preloader.finish()
+
+    monkeypatch.setattr(os, "scandir", None)
+    create_file(file_path, b"changed")
+
+    assert [entry.name for entry in tree_index.list_dir(str(tmp_path / "starter"))] == [
+        "main.py"
+    ]
+    assert tree_index.read(file_path) == b"changed"
+    assert preloader.prefetched_bytes == 4
+
+
+def test_prefetch_warms_the_files_through_the_file_handler(tmp_path):
+    create_file(str(tmp_path / "starter" / "main.py"), b"main")
+    warmed = []
+
+    class RecordingFileHandler(LocalFileHandler):
+        def warm(self, file_path: str) -> None:
+            warmed.append(os.path.relpath(file_path, tmp_path))
+            super().warm(file_path)
+
+    preloader = TreePreloader(TreeIndex(RecordingFileHandler()), str(tmp_path))
+    preloader.prefetch("./starter")
+    preloader.finish()
+
+    assert warmed == [os.path.join("starter", "main.py")]
+
+
+def test_prefetch_stops_at_its_byte_budget(tmp_path):
+    create_file(str(tmp_path / "starter" / "small.txt"), b"small")
+    create_file(str(tmp_path / "starter" / "large.txt"), b"large" * 100)
+
+    preloader = TreePreloader(TreeIndex(), str(tmp_path), prefetch_max_bytes=100)
+    preloader.prefetch("./starter")
+    preloader.finish()
+
+    assert preloader.prefetched_bytes == 5
@@ -0,0 +1,572 @@
+import os
+import pytest
+from cakeslicer.src.core.enums import Actions
+from cakeslicer.src.core.errors import RunnerErrorMessages as messages, ValueError
+from cakeslicer.src.file_handler import LocalFileHandler
+from cakeslicer.src.runner import Runner, TreeIndex
+from cakeslicer.tests.conftest import create_file
+
+
+def create_properties(includes: list, commands: list = [], calls: list = []) -> dict:
+    variables = {
+        "project_slug": "my_project",
+        "python_project": True,
+        "use_cache": False,
+    }
+
+    return {
+        "COMMENT_DELIMITERS": ["//", "#"],
+        "TOOL_PREFIX": "cakeslicer",
+        "VARIABLES": variables,
+        "TOKENS": {
+            **{name: str(value) for (name, value) in variables.items()},
+            "project_slug__pascal": "MyProject",
+        },
+        "ACTIONS": {
+            Actions.include: includes,
+            Actions.cmd: commands,
+            Actions.call: calls,
+        },
+    }
+
+
+def read_file(path: str) -> str:
+    with open(path) as file:
+        return file.read()
+
+
+def test_run_renders_the_included_directories_into_the_output_dir(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "cakeslicer_project_slug", "__init__.py"),
+        'NAME = "cakeslicer_project_slug"\n'
+        "class cakeslicer_project_slug__pascal: ...\n"
+        "# cakeslicer_if use_cache\n"
+        "import redis\n"
+        "# cakeslicer_endif\n",
+    )
+    create_file(os.path.join(root_dir, "starter", "README.md"), "Static\n")
+
+    Runner(create_properties(["./starter"]), root_dir, "./output").run()
+
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    assert read_file(os.path.join(output_dir, "my_project", "__init__.py")) == (
+        'NAME = "my_project"\nclass MyProject: ...\n'
+    )
+    assert read_file(os.path.join(output_dir, "README.md")) == "Static\n"
+
+
+def test_run_prunes_the_subtrees_whose_condition_is_not_satisfied(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "{cakeslicer_if use_cache}cache", "a")
+    )
+    create_file(
+        os.path.join(root_dir, "starter", "{cakeslicer_if python_project}py", "b")
+    )
+
+    Runner(create_properties(["./starter"]), root_dir, "./output").run()
+
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    assert sorted(os.listdir(output_dir)) == ["py"]
+    assert os.listdir(os.path.join(output_dir, "py")) == ["b"]
+
+
+def test_run_copies_binary_files_untouched(tmp_path):
+    root_dir = str(tmp_path)
+    content = b"\xff\xfecakeslicer_project_slug\x00"
+
+    os.makedirs(os.path.join(root_dir, "starter"))
+
+    with open(os.path.join(root_dir, "starter", "image.bin"), "wb") as file:
+        file.write(content)
+
+    Runner(create_properties(["./starter"]), root_dir, "./output").run()
+
+    with open(os.path.join(root_dir, "output", "starter", "image.bin"), "rb") as file:
+        assert file.read() == content
+
+
+def test_run_executes_the_commands_inside_the_output_dir(tmp_path):
+    root_dir = str(tmp_path)
+
+    Runner(create_properties([], ["touch created.txt"]), root_dir, "./output").run()
+
+    assert os.path.exists(os.path.join(root_dir, "output", "created.txt"))
+
+
+def test_run_fails_when_an_included_path_doesnt_exist(tmp_path):
+    with pytest.raises(ValueError) as error:
+        Runner(create_properties(["./missing"]), str(tmp_path), "./output").run()
+
+    assert str(error.value) == messages.included_path_not_found("./missing")
+
+
+def test_run_fails_when_a_command_fails(tmp_path):
+    with pytest.raises(ValueError) as error:
+        Runner(create_properties([], ["exit 3"]), str(tmp_path), "./output").run()
+
+    assert str(error.value) == messages.command_failed("exit 3", 3)
+
+
+def test_run_renders_the_files_on_worker_processes(tmp_path, monkeypatch, render_pools):
+    root_dir = str(tmp_path)
+    files_count = 150
+    monkeypatch.setattr("cakeslicer.src.runner.runner.POOL_MIN_BYTES", 0)
+
+    for i in range(files_count):
+        create_file(
+            os.path.join(root_dir, "starter", f"module_{i}.py"),
+            f"NAME = 'cakeslicer_project_slug_{i}'\n",
+        )
+
+    runner = Runner(create_properties(["./starter"]), root_dir, "./output", workers=2)
+    runner.run()
+
+    for i in range(files_count):
+        output_path = os.path.join(root_dir, "output", "starter", f"module_{i}.py")
+
+        assert read_file(output_path) == f"NAME = 'my_project_{i}'\n"
+
+    metrics = {stage_metrics.name: stage_metrics for stage_metrics in runner.metrics}
+
+    assert list(metrics) == ["walk", "filter", "classify", "read", "render", "write"]
+    assert metrics["render"].items == files_count + 1  # The starter directory too
+    assert metrics["render"].concurrency == 2
+
+
+def test_run_renders_small_jobs_in_the_current_process(tmp_path, monkeypatch):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "starter", "a.py"), "cakeslicer_project_slug")
+
+    for i in range(150):
+        create_file(os.path.join(root_dir, "starter", f"module_{i}.py"))
+
+    def create_render_pool(*args):
+        raise AssertionError("No pool should be started")
+
+    monkeypatch.setattr(
+        "cakeslicer.src.runner.runner.create_render_pool", create_render_pool
+    )
+
+    Runner(create_properties(["./starter"]), root_dir, "./output", workers=8).run()
+
+    assert read_file(os.path.join(root_dir, "output", "starter", "a.py")) == (
+        "my_project"
+    )
+
+
+def test_run_recreates_the_symlinks_of_the_template(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(os.path.join(root_dir, "starter", "target.txt"), "target")
+    os.symlink("target.txt", os.path.join(root_dir, "starter", "link.txt"))
+
+    Runner(create_properties(["./starter"]), root_dir, "./output").run()
+
+    link_path = os.path.join(root_dir, "output", "starter", "link.txt")
+
+    assert os.path.islink(link_path)
+    assert os.readlink(link_path) == "target.txt"
+
+
+def test_run_never_walks_outside_the_included_subtrees(tmp_path, monkeypatch):
+    root_dir = str(tmp_path)
+
+    create_file(os.path.join(root_dir, "starter", "src", "main.py"))
+    create_file(os.path.join(root_dir, "other_starter", "huge", "file.py"))
+
+    scanned_dirs = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        scanned_dirs.append(os.path.relpath(path, root_dir))
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    properties = create_properties(["./starter/src", "./starter", "./starter/src"])
+    Runner(properties, root_dir, "./output").run()
+
+    assert sorted(scanned_dirs) == ["starter", os.path.join("starter", "src")]
+    assert os.path.exists(os.path.join(root_dir, "output", "starter", "src", "main.py"))
+
+
+def test_plan_lists_the_work_without_writing_anything(tmp_path):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "cakeslicer_project_slug", "main.py"),
+        "cakeslicer_project_slug\n",
+    )
+    create_file(
+        os.path.join(root_dir, "starter", "{cakeslicer_if use_cache}cache", "a")
+    )
+    create_file(os.path.join(root_dir, "starter", "{cakeslicer_if use_cache}b.py"))
+    create_file(os.path.join(root_dir, "starter", "logo.png"), "1234")
+
+    properties = create_properties(["./starter"], ["make install"])
+    plan = Runner(properties, root_dir, "./output").plan()
+
+    assert not os.path.exists(os.path.join(root_dir, "output"))
+    assert sorted(plan["directories"]) == [
+        "starter",
+        os.path.join("starter", "my_project"),
+    ]
+    assert sorted(plan["files"], key=lambda file: file["source"]) == [
+        {
+            "source": os.path.join("starter", "cakeslicer_project_slug", "main.py"),
+            "destination": os.path.join("starter", "my_project", "main.py"),
+            "action": "render",
+            "bytes": 24,
+        },
+        {
+            "source": os.path.join("starter", "logo.png"),
+            "destination": os.path.join("starter", "logo.png"),
+            "action": "copy",
+            "bytes": 4,
+        },
+    ]
+    assert sorted(skipped["source"] for skipped in plan["skipped"]) == [
+        os.path.join("starter", "{cakeslicer_if use_cache}b.py"),
+        os.path.join("starter", "{cakeslicer_if use_cache}cache"),
+    ]
+    assert plan["commands"] == ["make install"]
+    assert plan["totals"]["files"] == 2
+    assert plan["totals"]["bytes"] == 28
+    assert plan["totals"]["render"] == {"files": 1, "bytes": 24}
+    assert plan["totals"]["skipped"] == 2
+
+
+def test_runners_sharing_a_tree_index_scan_each_directory_once(tmp_path, monkeypatch):
+    root_dir = str(tmp_path)
+
+    create_file(
+        os.path.join(root_dir, "starter", "src", "main.py"),
+        "cakeslicer_project_slug\n",
+    )
+
+    scanned_dirs = []
+    original_scandir = os.scandir
+
+    def scandir(path):
+        scanned_dirs.append(os.path.relpath(path, root_dir))
+        return original_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    tree_index = TreeIndex()
+    template_compiler = None
+
+    for output_dir in ["./output/1", "./output/2"]:
+        runner = Runner(
+            create_properties(["./starter"]),
+            root_dir,
+            output_dir,
+            tree_index=tree_index,
+            template_compiler=template_compiler,
+        )
+        runner.run()
+
+        template_compiler = runner.template_compiler
+
+    assert sorted(scanned_dirs) == ["starter", os.path.join("starter", "src")]
+
+    for project in ["1", "2"]:
+        project_dir = os.path.join(root_dir, "output", project)
+
+        assert read_file(os.path.join(project_dir, "starter", "src", "main.py")) == (
+            "my_project\n"
+        )
+
+
+def test_incremental_run_renders_again_only_the_files_using_changed_answers(tmp_path):
+    root_dir = str(tmp_path)
+    cache_dir = os.path.join(root_dir, "cache")
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    create_file(
+        os.path.join(root_dir, "starter", "slug.py"), "cakeslicer_project_slug\n"
+    )
+    create_file(
+        os.path.join(root_dir, "starter", "cache.py"),
+        "# cakeslicer_if use_cache\nimport redis\n# cakeslicer_endif\n",
+    )
+
+    properties = create_properties(["./starter"])
+    Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    create_file(os.path.join(output_dir, "cache.py"), "edited\n")
+
+    properties = create_properties(["./starter"])
+    properties["VARIABLES"]["project_slug"] = "other_project"
+    properties["TOKENS"]["project_slug"] = "other_project"
+    Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    assert read_file(os.path.join(output_dir, "slug.py")) == "other_project\n"
+    assert read_file(os.path.join(output_dir, "cache.py")) == "edited\n"
+
+
+def test_incremental_run_generates_everything_again_when_there_are_calls(tmp_path):
+    root_dir = str(tmp_path)
+    cache_dir = os.path.join(root_dir, "cache")
+    slug_path = os.path.join(root_dir, "output", "starter", "slug.py")
+
+    create_file(
+        os.path.join(root_dir, "starter", "slug.py"), "cakeslicer_project_slug\n"
+    )
+
+    def patch_slug(context, variables):
+        with open(slug_path, "a") as file:
+            file.write("patched\n")
+
+    def run(project_slug: str) -> None:
+        properties = create_properties(["./starter"], ["touch command.txt"])
+        properties["ACTIONS"][Actions.call] = [patch_slug]
+        properties["TOKENS"]["project_slug"] = project_slug
+        Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    run("my_project")
+    os.remove(os.path.join(root_dir, "output", "command.txt"))
+    run("other_project")
+
+    assert read_file(slug_path) == "other_project\npatched\n"
+    assert os.path.exists(os.path.join(root_dir, "output", "command.txt"))
+
+
+def test_incremental_run_generates_everything_when_a_changed_answer_is_in_a_path(
+    tmp_path,
+):
+    root_dir = str(tmp_path)
+    cache_dir = os.path.join(root_dir, "cache")
+
+    create_file(os.path.join(root_dir, "starter", "cakeslicer_project_slug", "a.py"))
+    create_file(os.path.join(root_dir, "starter", "b.py"), "static\n")
+
+    Runner(
+        create_properties(["./starter"]),
+        root_dir,
+        "./output",
+        cache_dir,
+        incremental=True,
+    ).run()
+
+    properties = create_properties(["./starter"])
+    properties["TOKENS"]["project_slug"] = "other_project"
+    Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    assert os.path.exists(
+        os.path.join(root_dir, "output", "starter", "other_project", "a.py")
+    )
+
+
+def test_incremental_run_generates_everything_when_the_starter_changed(tmp_path):
+    root_dir = str(tmp_path)
+    cache_dir = os.path.join(root_dir, "cache")
+    starter_dir = os.path.join(root_dir, "starter")
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    create_file(os.path.join(starter_dir, "slug.py"), "cakeslicer_project_slug\n")
+    create_file(os.path.join(starter_dir, "static.txt"), "static\n")
+
+    def run() -> None:
+        properties = create_properties(["./starter"])
+        Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    run()
+
+    create_file(
+        os.path.join(starter_dir, "slug.py"), "name = cakeslicer_project_slug\n"
+    )
+    create_file(os.path.join(starter_dir, "added.txt"), "added\n")
+    os.utime(starter_dir, ns=(0, 0))
+    run()
+
+    assert read_file(os.path.join(output_dir, "slug.py")) == "name = my_project\n"
+    assert read_file(os.path.join(output_dir, "added.txt")) == "added\n"
+
+
+def test_incremental_run_removes_what_a_new_generation_doesnt_write(tmp_path):
+    root_dir = str(tmp_path)
+    cache_dir = os.path.join(root_dir, "cache")
+    output_dir = os.path.join(root_dir, "output", "starter")
+
+    create_file(os.path.join(root_dir, "starter", "cakeslicer_project_slug", "a.py"))
+    create_file(
+        os.path.join(root_dir, "starter", "{cakeslicer_if use_cache}cache", "c.py")
+    )
+
+    properties = create_properties(["./starter"])
+    properties["VARIABLES"]["use_cache"] = True
+    Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    create_file(os.path.join(output_dir, "notes.txt"), "kept\n")
+
+    properties = create_properties(["./starter"])
+    properties["TOKENS"]["project_slug"] = "other_project"
+    Runner(properties, root_dir, "./output", cache_dir, incremental=True).run()
+
+    assert sorted(os.listdir(output_dir)) == ["notes.txt", "other_project"]
+    assert os.listdir(os.path.join(output_dir, "other_project")) == ["a.py"]
+
+
+def test_run_calls_the_callables_with_the_context_and_the_variables(tmp_path):
+    root_dir = str(tmp_path)
+    received = []
+
+    def write_slug(context, variables):
+        received.append(context)
+        create_file(
+            os.path.join(context.output_dir, "slug.txt"), variables["project_slug"]
+        )
+
+    Runner(create_properties([], calls=[write_slug]), root_dir, "./output").run()
+
+    assert received[0].root_dir == root_dir
+    assert received[0].tokens["project_slug__pascal"] == "MyProject"
+
+    with open(os.path.join(root_dir, "output", "slug.txt")) as file:
+        assert file.read() == "my_project"
+
+
+def test_run_runs_the_calls_before_the_commands(tmp_path):
+    def create_marker(context, variables):
+        create_file(os.path.join(context.output_dir, "marker"))
+
+    properties = create_properties([], ["test -e marker"], [create_marker])
+
+    Runner(properties, str(tmp_path), "./output").run()
+
+
+def test_run_fails_when_a_call_raises(tmp_path):
+    def failing(context, variables):
+        raise RuntimeError("boom")
+
+    with pytest.raises(ValueError) as error:
+        Runner(create_properties([], calls=[failing]), str(tmp_path), "./output").run()
+
+    assert str(error.value) == messages.call_failed(
+        f"{__name__}.test_run_fails_when_a_call_raises.<locals>.failing", "boom"
+    )
+
+
+@pytest.mark.parametrize("project_slug", ["../../escaped", "/tmp/escaped"])
+def test_run_never_writes_outside_the_output_dir(tmp_path, project_slug):
+    root_dir = str(tmp_path / "root")
+    create_file(os.path.join(root_dir, "starter", "cakeslicer_project_slug", "f.txt"))
+    properties = create_properties(["./starter"])
+    properties["TOKENS"]["project_slug"] = project_slug
+
+    with pytest.raises(ValueError):
+        Runner(properties, root_dir, "./output").run()
+
+    assert not os.path.exists(tmp_path / "escaped")
+    assert not os.path.exists(os.path.join(root_dir, "escaped"))
+
+
+def test_walk_fails_when_a_destination_is_outside_the_output_dir(tmp_path, monkeypatch):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "starter", "f.txt"))
+    runner = Runner(create_properties(["./starter"]), root_dir, "./output")
+    monkeypatch.setattr(
+        runner._path_renderer, "render_segment", lambda segment: "../escaped"
+    )
+
+    with pytest.raises(ValueError) as error:
+        list(runner._walk("./starter"))
+
+    assert str(error.value) == messages.destination_outside_output(
+        os.path.join(root_dir, "output", "../escaped")
+    )
+
+
+def test_run_reads_and_writes_through_the_file_handler(tmp_path):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "starter", "a.py"), "cakeslicer_project_slug")
+    calls = []
+
+    class RecordingFileHandler(LocalFileHandler):
+        def read_bytes(self, file_path: str) -> bytes:
+            calls.append(("read", os.path.relpath(file_path, root_dir)))
+            return super().read_bytes(file_path)
+
+        def write_bytes(self, file_path: str, content: bytes) -> None:
+            calls.append(("write", os.path.relpath(file_path, root_dir)))
+            super().write_bytes(file_path, content)
+
+    Runner(
+        create_properties(["./starter"]),
+        root_dir,
+        "./output",
+        file_handler=RecordingFileHandler(),
+    ).run()
+
+    assert calls == [
+        ("read", os.path.join("starter", "a.py")),
+        ("write", os.path.join("output", "starter", "a.py")),
+    ]
+    assert read_file(os.path.join(root_dir, "output", "starter", "a.py")) == (
+        "my_project"
+    )
+
+
+def test_run_fails_when_two_files_are_generated_at_the_same_destination(tmp_path):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "x", "src", "one.txt"), "one")
+    create_file(
+        os.path.join(root_dir, "x", "{cakeslicer_if python_project}src", "one.txt"),
+        "two",
+    )
+    create_file(
+        os.path.join(root_dir, "x", "{cakeslicer_if python_project}src", "two.txt")
+    )
+
+    with pytest.raises(ValueError) as error:
+        Runner(
+            create_properties(["./x/src", "./x/{cakeslicer_if python_project}src"]),
+            root_dir,
+            "./output",
+        ).run()
+
+    assert str(error.value) == messages.conflicting_destination(
+        os.path.join("x", "src", "one.txt"),
+        os.path.join("x", "src", "one.txt"),
+        os.path.join("x", "{cakeslicer_if python_project}src", "one.txt"),
+    )
+
+
+def test_run_merges_directories_generated_at_the_same_destination(tmp_path):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "x", "src", "one.txt"))
+    create_file(
+        os.path.join(root_dir, "x", "{cakeslicer_if python_project}src", "two.txt")
+    )
+
+    Runner(create_properties(["./x"]), root_dir, "./output").run()
+
+    assert sorted(os.listdir(os.path.join(root_dir, "output", "x", "src"))) == [
+        "one.txt",
+        "two.txt",
+    ]
+
+
+def test_run_never_copies_the_output_dir_into_itself(tmp_path):
+    root_dir = str(tmp_path)
+    create_file(os.path.join(root_dir, "a", "f.txt"), "f")
+    create_file(os.path.join(root_dir, "cakeslicer.py"))
+
+    for _ in range(3):
+        Runner(
+            create_properties(["./"]),
+            root_dir,
+            "./output",
+            os.path.join(root_dir, "cache"),
+            excluded_paths=[os.path.join(root_dir, "cakeslicer.py")],
+        ).run()
+
+    assert sorted(os.listdir(os.path.join(root_dir, "output"))) == ["a"]
+    assert read_file(os.path.join(root_dir, "output", "a", "f.txt")) == "f"
@@ -0,0 +1,106 @@
+import os
+import pytest
+from cakeslicer.src.core.commands import Command
+from cakeslicer.src.core.errors import RunnerErrorMessages as messages, ValueError
+from cakeslicer.src.runner.scheduler import CommandScheduler
+
+
+def wait_for(file_name: str) -> str:
+    return f"while [ ! -e {file_name} ]; do sleep 0.01; done"
+
+
+def read_lines(path: str) -> list:
+    with open(path) as file:
+        return file.read().split()
+
+
+def test_run_keeps_the_order_of_plain_commands(tmp_path):
+    commands = [f"sleep 0.0{5 - index}; echo {index} >> log" for index in range(5)]
+
+    CommandScheduler(commands, str(tmp_path), concurrency=4).run()
+
+    assert read_lines(tmp_path / "log") == ["0", "1", "2", "3", "4"]
+
+
+def test_run_executes_independent_commands_at_the_same_time(tmp_path):
+    commands = [
+        Command(f"touch a && {wait_for('b')}", after=[], timeout=5),
+        Command(f"touch b && {wait_for('a')}", after=[], timeout=5),
+    ]
+
+    CommandScheduler(commands, str(tmp_path), concurrency=2).run()
+
+
+def test_run_executes_a_command_after_its_dependencies(tmp_path):
+    commands = [
+        Command("sleep 0.1; echo install >> log", name="install", after=[]),
+        Command("echo init >> log", name="init", after=[]),
+        Command("echo build >> log", after=["install", "init"]),
+    ]
+
+    CommandScheduler(commands, str(tmp_path), concurrency=4).run()
+
+    assert read_lines(tmp_path / "log") == ["init", "install", "build"]
+
+
+def test_run_doesnt_run_commands_sharing_a_resource_at_the_same_time(tmp_path):
+    command = "mkdir lock && sleep 0.05 && rmdir lock"
+    commands = [Command(command, after=[], resources=["lock"]) for _ in range(4)]
+
+    CommandScheduler(commands, str(tmp_path), concurrency=4).run()
+
+
+def test_run_shows_the_output_of_each_command(tmp_path, capsys):
+    CommandScheduler(["echo hello"], str(tmp_path)).run()
+
+    output = capsys.readouterr().out
+
+    assert "$ echo hello" in output
+    assert "hello\n" in output.split("$ echo hello", 1)[1]
+
+
+def test_run_skips_the_dependents_of_a_failed_command(tmp_path):
+    commands = [
+        Command("exit 3", name="failing", after=[]),
+        Command("touch dependent", after=["failing"]),
+        Command("touch independent", after=[]),
+        "touch next",
+    ]
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(commands, str(tmp_path), concurrency=1).run()
+
+    assert str(error.value) == messages.command_failed("exit 3", 3)
+    assert sorted(os.listdir(tmp_path)) == ["independent", "next"]
+
+
+def test_run_fails_when_a_command_times_out(tmp_path):
+    commands = [Command("sleep 5", timeout=0.1)]
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(commands, str(tmp_path)).run()
+
+    assert str(error.value) == messages.command_timed_out("sleep 5", 0.1)
+
+
+def test_scheduler_fails_on_a_dependency_cycle(tmp_path):
+    commands = [
+        Command("echo a", name="a", after=["b"]),
+        Command("echo b", name="b", after=["a"]),
+    ]
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(commands, str(tmp_path))
+
+    assert str(error.value) == messages.command_dependency_cycle(["echo a", "echo b"])
+
+
+def test_run_treats_the_dependencies_not_selected_as_satisfied(tmp_path):
+    commands = [
+        Command("touch git", name="git", after=[]),
+        Command("touch added", after=["git", "npm"]),
+    ]
+
+    CommandScheduler(commands, str(tmp_path), concurrency=4).run()
+
+    assert os.path.exists(tmp_path / "added")
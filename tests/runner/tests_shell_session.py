@@ -0,0 +1,73 @@
+import pytest
+from cakeslicer.src.core.commands import Command
+from cakeslicer.src.core.errors import RunnerErrorMessages as messages, ValueError
+from cakeslicer.src.runner.scheduler import CommandScheduler
+from cakeslicer.src.runner.shell_session import ShellSession
+
+
+@pytest.fixture
+def session(tmp_path):
+    session = ShellSession(str(tmp_path))
+
+    yield session
+
+    session.close()
+
+
+def test_run_returns_the_exit_status_and_the_output(session):
+    assert session.run("echo out; echo err >&2; exit 3") == (3, b"out\nerr\n")
+
+
+def test_run_keeps_an_output_without_a_final_line_break(session):
+    assert session.run("printf done") == (0, b"done")
+
+
+def test_run_doesnt_leak_directory_changes_nor_variables(session, tmp_path):
+    session.run("cd / && NAME=changed")
+
+    assert session.run('pwd; echo "[$NAME]"') == (0, f"{tmp_path}\n[]\n".encode())
+
+
+def test_run_keeps_the_session_after_a_syntax_error(session):
+    (status, _) = session.run('echo "unterminated')
+
+    assert status != 0
+    assert session.run("echo next") == (0, b"next\n")
+
+
+def test_run_fails_when_a_command_ends_the_session(session):
+    (status, _) = session.run("kill -9 $$")
+
+    assert status != 0
+    assert not session.alive
+
+
+def test_scheduler_runs_consecutive_commands_on_a_single_shell(tmp_path):
+    commands = ["echo $$ >> shells"] * 50
+
+    CommandScheduler(commands, str(tmp_path), shell_session=True).run()
+
+    with open(tmp_path / "shells") as file:
+        shells = file.read().split()
+
+    assert len(shells) == 50
+    assert len(set(shells)) == 1
+
+
+def test_scheduler_reports_failures_of_the_session_commands(tmp_path):
+    commands = ["touch first", "exit 3", "touch skipped"]
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(commands, str(tmp_path), shell_session=True).run()
+
+    assert str(error.value) == messages.command_failed("exit 3", 3)
+    assert not (tmp_path / "skipped").exists()
+
+
+def test_scheduler_runs_the_commands_with_a_timeout_on_their_own(tmp_path):
+    commands = [Command("sleep 5", timeout=0.1)]
+
+    with pytest.raises(ValueError) as error:
+        CommandScheduler(commands, str(tmp_path), shell_session=True).run()
+
+    assert str(error.value) == messages.command_timed_out("sleep 5", 0.1)
@@ -0,0 +1,57 @@
+import os
+import pytest
+from cakeslicer.src.core.errors import RunnerErrorMessages as messages, ValueError
+from cakeslicer.src.runner.subtrees import plan_subtrees
+
+
+def test_plan_subtrees_keeps_unrelated_paths_in_their_original_order():
+    include_paths = ["./somepyproject", "./somenodeproject", "./docs/README.md"]
+
+    assert plan_subtrees("/starters", include_paths) == include_paths
+
+
+def test_plan_subtrees_removes_duplicated_paths():
+    include_paths = ["./somepyproject", "somepyproject/", "./somepyproject/./"]
+
+    assert plan_subtrees("/starters", include_paths) == ["./somepyproject"]
+
+
+def test_plan_subtrees_removes_paths_inside_another_included_path():
+    include_paths = [
+        "./somepyproject/src",
+        "./somepyproject-extras",
+        "./somepyproject",
+        "./somepyproject/src/main.py",
+    ]
+
+    assert plan_subtrees("/starters", include_paths) == [
+        "./somepyproject-extras",
+        "./somepyproject",
+    ]
+
+
+def test_plan_subtrees_doesnt_touch_the_file_system(monkeypatch):
+    def fail(*args, **kwargs):
+        assert False, "The file system was accessed"
+
+    for function in ["stat", "lstat", "scandir", "listdir"]:
+        monkeypatch.setattr(os, function, fail)
+
+    assert plan_subtrees("/starters", ["./a", "./a/b"]) == ["./a"]
+
+
+def test_plan_subtrees_normalizes_the_paths_before_comparing_them():
+    include_paths = ["./a/../b", "b/", "./b/./c"]
+
+    assert plan_subtrees("/starters", include_paths) == ["./a/../b"]
+
+
+def test_plan_subtrees_keeps_only_the_root_when_it_is_included():
+    assert plan_subtrees("/starters", ["./a", ".", "./b"]) == ["."]
+
+
+def test_plan_subtrees_fails_on_a_path_outside_the_root_directory():
+    with pytest.raises(ValueError) as error:
+        plan_subtrees("/starters", ["./a", "../other"])
+
+    assert str(error.value) == messages.included_path_outside_root("../other")